@@ -45,6 +45,8 @@ run_mysql_query() {
     $MYSQL_CMD_BASE "$query" 2>/dev/null || echo "ERROR"
   fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
 
 # 1) 최신 컬럼 기반 조회 시도 → 실패 시 구버전 호환 fallback
 ACCOUNT_INFO="$(run_mysql_query "$QUERY_PRIMARY")"
@@ -45,6 +45,8 @@ run_mysql_query() {
     $MYSQL_CMD "$query" 2>/dev/null || echo "ERROR"
   fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
 
 in_csv() {
   local needle="$1"
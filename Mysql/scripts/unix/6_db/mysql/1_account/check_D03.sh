@@ -38,6 +38,8 @@ run_mysql_query() {
     $MYSQL_CMD_BASE "$query" 2>/dev/null || echo "ERROR"
   fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
 
 # 비밀번호 정책 관련 시스템 변수 및 컴포넌트 설정 조회
 QUERY="
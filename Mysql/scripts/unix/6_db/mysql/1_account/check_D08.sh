@@ -33,8 +33,10 @@ QUERY="SELECT user, host, plugin FROM mysql.user;"
 run_mysql_query() {
     timeout 5s $MYSQL_CMD "$QUERY" 2>/dev/null
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
 
-RESULT=$(run_mysql_query)
+RESULT=$(run_mysql_query "$QUERY")
 RET_CODE=$?
 
 REASON_LINE=""
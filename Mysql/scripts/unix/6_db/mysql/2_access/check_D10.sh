@@ -40,6 +40,8 @@ run_mysql() {
         $MYSQL_CMD "$sql" 2>/dev/null
     fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql
 
 # CSV 형식의 리스트에 특정 값이 포함되어 있는지 확인하는 함수
 in_csv() {
@@ -43,7 +43,10 @@ WHERE PRIVILEGE_TYPE <> 'USAGE';
 "
 
 # 쿼리 실행 결과 수집
-LIST=$($MYSQL_CMD "$QUERY" 2>/dev/null || echo "ERROR")
+run_mysql_query() { $MYSQL_CMD "$1" 2>/dev/null || echo "ERROR"; }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
+LIST=$(run_mysql_query "$QUERY")
 
 # 점검에서 제외할 관리자용 허용 계정 목록 설정
 ALLOWED_USERS_CSV="${ALLOWED_USERS_CSV:-root,mysql.sys,mysql.session,mysql.infoschema,mysqlxsys,mariadb.sys}"
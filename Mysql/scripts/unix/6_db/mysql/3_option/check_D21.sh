@@ -71,6 +71,8 @@ run_mysql_query() {
         $MYSQL_CMD "$query" 2>/dev/null || echo "ERROR"
     fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql_query
 
 # 권한 위임(GRANT OPTION) 부여 현황 조회를 위한 쿼리문
 Q_IS_TABLE="SELECT GRANTEE,'TABLE' AS SCOPE, CONCAT(TABLE_SCHEMA,'.',TABLE_NAME) AS OBJ, PRIVILEGE_TYPE, IS_GRANTABLE FROM information_schema.table_privileges WHERE IS_GRANTABLE='YES';"
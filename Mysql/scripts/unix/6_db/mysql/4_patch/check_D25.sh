@@ -46,6 +46,8 @@ run_mysql() {
         $MYSQL_CMD_BASE "$sql" 2>/dev/null
     fi
 }
+# shellcheck disable=SC1090,SC1091
+{ . "$(dirname "$0")/../_mysql_common.sh" || . /var/lib/kisa/_mysql_common.sh; } 2>/dev/null && mysql_snapshot_wrap run_mysql
 
 # 문자열에서 시맨틱 버전(숫자.숫자.숫자)만 추출
 extract_semver() {
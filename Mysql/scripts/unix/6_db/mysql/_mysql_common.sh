@@ -0,0 +1,47 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 함수] MySQL 점검 스크립트(check_D*.sh)와 카탈로그 수집기가 source 하는 스냅샷 공통부
+# @Description : mysql_query_key      - 스냅샷 키 (쿼리 정규화 후 md5, 수집기와 점검이 같은 규칙 사용)
+#                mysql_snapshot_query - 공용 MySQL 카탈로그 스냅샷(collect_mysql_snapshot.sh)이 최신이면
+#                                       같은 쿼리의 결과를 재사용 (없으면 각 점검이 직접 조회)
+#                mysql_snapshot_wrap  - 점검용: 쿼리 함수(<함수> <쿼리>)를 스냅샷 우선으로 감싼다
+#                                       (점검은 ". <공통부> && mysql_snapshot_wrap <함수>" 1줄, 공통부가 없으면 직접 조회)
+# @Output      : $MYSQL_SNAPSHOT_DIR/<md5(쿼리)>.out (결과) / .err (쿼리 실패) / complete
+# ============================================================================
+
+MYSQL_SNAPSHOT_DIR="${MYSQL_SNAPSHOT_DIR:-/var/tmp/kisa_mysql_snapshot}"
+MYSQL_SNAPSHOT_MAX_AGE="${MYSQL_SNAPSHOT_MAX_AGE:-600}"
+
+# 정규화: 공백/줄바꿈을 공백 1개로 접고 앞뒤 공백 제거
+mysql_normalize_query() {
+  printf '%s' "$1" | tr '\t\n' '  ' | tr -s ' ' | sed 's/^ //; s/ $//'
+}
+
+mysql_query_key() {
+  mysql_normalize_query "$1" | md5sum | cut -c1-32
+}
+
+# 반환값: 0=스냅샷 결과 출력, 1=스냅샷에 쿼리 실패로 기록됨, 2=스냅샷 없음(직접 조회)
+mysql_snapshot_query() {
+  local dir="$MYSQL_SNAPSHOT_DIR" mtime key
+  [ -O "$dir" ] && [ -f "$dir/complete" ] || return 2
+  mtime=$(stat -c %Y "$dir/complete" 2>/dev/null) || return 2
+  [ $(( $(date +%s) - mtime )) -le "$MYSQL_SNAPSHOT_MAX_AGE" ] || return 2
+  key=$(mysql_query_key "$1")
+  if [ -f "$dir/$key.out" ]; then cat "$dir/$key.out"; return 0; fi
+  [ -f "$dir/$key.err" ] && return 1
+  return 2
+}
+
+# 스냅샷에 결과가 있으면 그대로 출력하고, 스냅샷이 없거나 실패로 기록된 쿼리는 원래 함수로 직접 조회한다.
+# (쿼리 실패 시 출력/반환값은 점검마다 다르므로 실패 처리는 원래 함수에 그대로 맡김)
+mysql_snapshot_wrap() {
+  local fn="$1"
+  declare -F "$fn" >/dev/null || return 1
+  eval "_mysql_direct_$(declare -f "$fn")"
+  eval "$fn() { mysql_snapshot_query \"\$1\" || _mysql_direct_$fn \"\$@\"; }"
+}
@@ -0,0 +1,165 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 수집기] MySQL 카탈로그 스냅샷 1회 수집
+# @Description : D-01~D-25 가 각자 mysql 클라이언트를 띄워(접속/인증 + 5초 timeout) 조회하던
+#                mysql.user / information_schema 권한 / 변수 / 버전 쿼리를 세션 1개로 일괄 실행한다.
+#                결과는 쿼리 문자열 기준으로 저장되며, 각 점검은 같은 쿼리의 결과를 재사용한다.
+#                (쿼리가 바뀌어 스냅샷에 없으면 점검 스크립트가 기존처럼 직접 조회)
+# @Output      : $MYSQL_SNAPSHOT_DIR/<md5(쿼리)>.out (결과) / .err (쿼리 실패) / complete
+#                비밀번호 해시가 포함되므로 디렉터리는 0700, 파일은 0600
+# ============================================================================
+
+# 스냅샷 경로/쿼리 키 규칙은 점검 스크립트와 같은 공통부 사용 (개별 실행 시 플레이북이 배포한 사본)
+COMMON_FILE="$(cd "$(dirname "$0")" && pwd)/6_db/mysql/_mysql_common.sh"
+[ -f "$COMMON_FILE" ] || COMMON_FILE="/var/lib/kisa/_mysql_common.sh"
+# shellcheck disable=SC1090
+. "$COMMON_FILE" || exit 1
+
+MYSQL_SNAPSHOT_TIMEOUT="${MYSQL_SNAPSHOT_TIMEOUT:-30}"
+MYSQL_USER="${MYSQL_USER:-root}"
+MYSQL_PASSWORD="${MYSQL_PASSWORD:-}"
+export MYSQL_PWD="${MYSQL_PASSWORD}"
+
+# D-02 와 동일한 시스템 계정 목록 (쿼리 문자열이 같아야 결과를 재사용)
+SYSTEM_USERS_CSV="'root','mysql.sys','mysql.session','mysql.infoschema','mysqlxsys','mariadb.sys'"
+
+# 점검 스크립트의 쿼리 (구버전 호환 fallback 쿼리 포함)
+QUERIES=(
+  # D-01
+  "SELECT user, host, COALESCE(authentication_string,''), COALESCE(account_locked,'N') FROM mysql.user WHERE user='root' OR user='';"
+  "SELECT user, host, COALESCE(authentication_string,''), 'N' AS account_locked FROM mysql.user WHERE user='root' OR user='';"
+  "SELECT user, host, COALESCE(password,''), 'N' AS account_locked FROM mysql.user WHERE user='root' OR user='';"
+  # D-02
+  "SELECT user, host, IFNULL(account_locked,'N') AS account_locked FROM mysql.user WHERE user NOT IN (${SYSTEM_USERS_CSV});"
+  "SELECT user, host, 'N' AS account_locked FROM mysql.user WHERE user NOT IN (${SYSTEM_USERS_CSV});"
+  # D-03
+  "SHOW VARIABLES
+WHERE Variable_name IN (
+  'default_password_lifetime',
+  'validate_password.policy',
+  'validate_password.length',
+  'validate_password.mixed_case_count',
+  'validate_password.number_count',
+  'validate_password.special_char_count',
+  'validate_password_policy',
+  'validate_password_length',
+  'validate_password_mixed_case_count',
+  'validate_password_number_count',
+  'validate_password_special_char_count'
+);"
+  # D-04
+  "SELECT grantee,
+       GROUP_CONCAT(DISTINCT privilege_type ORDER BY privilege_type SEPARATOR ',') AS privileges
+FROM information_schema.user_privileges
+WHERE privilege_type IN ('SUPER','SYSTEM_USER','CREATE USER','RELOAD','SHUTDOWN','PROCESS')
+   OR privilege_type LIKE '%_ADMIN'
+GROUP BY grantee;"
+  # D-06
+  "SELECT user,
+       SUM(CASE WHEN host NOT IN ('localhost','127.0.0.1','::1') THEN 1 ELSE 0 END) AS non_local_host_count,
+       SUM(CASE WHEN host='%' THEN 1 ELSE 0 END) AS wildcard_count,
+       GROUP_CONCAT(host ORDER BY host SEPARATOR ',') AS hosts
+FROM mysql.user
+WHERE IFNULL(account_locked,'N') != 'Y'
+GROUP BY user;"
+  # D-08
+  "SELECT user, host, plugin FROM mysql.user;"
+  # D-10
+  "SELECT user,host,COALESCE(account_locked,'N') FROM mysql.user;"
+  "SELECT user,host,'N' FROM mysql.user;"
+  # D-11
+  "SELECT GRANTEE, 'SCHEMA' AS SCOPE, TABLE_SCHEMA AS OBJ, PRIVILEGE_TYPE
+FROM information_schema.schema_privileges
+WHERE TABLE_SCHEMA IN ('mysql','performance_schema','sys','information_schema')
+UNION ALL
+SELECT GRANTEE, 'TABLE' AS SCOPE, CONCAT(TABLE_SCHEMA,'.',TABLE_NAME) AS OBJ, PRIVILEGE_TYPE
+FROM information_schema.table_privileges
+WHERE TABLE_SCHEMA IN ('mysql','performance_schema','sys','information_schema')
+UNION ALL
+SELECT GRANTEE, 'GLOBAL' AS SCOPE, '*.*' AS OBJ, PRIVILEGE_TYPE
+FROM information_schema.user_privileges
+WHERE PRIVILEGE_TYPE <> 'USAGE';"
+  # D-21
+  "SELECT GRANTEE,'TABLE' AS SCOPE, CONCAT(TABLE_SCHEMA,'.',TABLE_NAME) AS OBJ, PRIVILEGE_TYPE, IS_GRANTABLE FROM information_schema.table_privileges WHERE IS_GRANTABLE='YES';"
+  "SELECT GRANTEE,'SCHEMA' AS SCOPE, TABLE_SCHEMA AS OBJ, PRIVILEGE_TYPE, IS_GRANTABLE FROM information_schema.schema_privileges WHERE IS_GRANTABLE='YES';"
+  "SELECT GRANTEE,'GLOBAL' AS SCOPE, '*.*' AS OBJ, PRIVILEGE_TYPE, IS_GRANTABLE FROM information_schema.user_privileges WHERE IS_GRANTABLE='YES' OR PRIVILEGE_TYPE='GRANT OPTION';"
+  # D-25
+  "SELECT VERSION();"
+)
+
+umask 077
+TMP_DIR=$(mktemp -d "${MYSQL_SNAPSHOT_DIR}.XXXXXX") || exit 1
+BATCH_SQL="$TMP_DIR/batch.sql"
+
+# 쿼리마다 구분 표식(SELECT '@@snapshot <key>')을 앞에 두고, 문장 1개 = 1줄로 배치 스크립트 작성
+declare -A LINE_KEY
+LINE_NO=0
+for query in "${QUERIES[@]}"; do
+  normalized="$(mysql_normalize_query "$query")"
+  key=$(mysql_query_key "$query")
+  printf "SELECT '@@snapshot %s';\n%s\n" "$key" "$normalized" >> "$BATCH_SQL"
+  LINE_NO=$((LINE_NO + 2))
+  LINE_KEY[$LINE_NO]="$key"
+  : > "$TMP_DIR/$key.out"
+done
+
+# 세션 1개로 일괄 실행 (--force: 구버전에서 일부 쿼리가 실패해도 나머지는 계속 실행)
+TIMEOUT_BIN="$(command -v timeout 2>/dev/null || true)"
+${TIMEOUT_BIN:+$TIMEOUT_BIN ${MYSQL_SNAPSHOT_TIMEOUT}s} \
+  mysql --protocol=TCP -u"${MYSQL_USER}" -N -s -B --force < "$BATCH_SQL" > "$TMP_DIR/batch.out" 2> "$TMP_DIR/batch.err"
+RC=$?
+
+# 접속 실패/시간 초과는 스냅샷을 만들지 않음 (각 점검이 직접 조회해 기존 방식으로 판정)
+if ! grep -q '^@@snapshot ' "$TMP_DIR/batch.out" || [ "$RC" -eq 124 ]; then
+  rm -rf "$TMP_DIR"
+  echo ""
+  cat << JSON
+{
+    "mysql_snapshot": "$MYSQL_SNAPSHOT_DIR",
+    "status": "skipped",
+    "rc": $RC,
+    "collect_date": "$(date '+%Y-%m-%d %H:%M:%S')"
+}
+JSON
+  exit 0
+fi
+
+# 표식 기준으로 결과를 쿼리별 파일로 분리
+awk -v dir="$TMP_DIR" '
+  /^@@snapshot / { out = dir "/" $2 ".out"; next }
+  out != "" { print > out }
+' "$TMP_DIR/batch.out"
+
+# "ERROR nnnn (xxxxx) at line N: ..." -> 해당 줄의 쿼리를 실패로 기록
+FAILED=0
+while IFS= read -r err_line; do
+  line=$(echo "$err_line" | sed -n 's/^ERROR .* at line \([0-9][0-9]*\).*/\1/p')
+  key="${LINE_KEY[$line]:-}"
+  [ -n "$key" ] || continue
+  rm -f "$TMP_DIR/$key.out"
+  echo "$err_line" > "$TMP_DIR/$key.err"
+  FAILED=$((FAILED + 1))
+done < "$TMP_DIR/batch.err"
+
+rm -f "$BATCH_SQL" "$TMP_DIR/batch.out" "$TMP_DIR/batch.err"
+date '+%Y-%m-%d %H:%M:%S' > "$TMP_DIR/complete"
+
+# 이전 스냅샷과 교체
+rm -rf "${MYSQL_SNAPSHOT_DIR}.old"
+[ -d "$MYSQL_SNAPSHOT_DIR" ] && mv "$MYSQL_SNAPSHOT_DIR" "${MYSQL_SNAPSHOT_DIR}.old"
+mv "$TMP_DIR" "$MYSQL_SNAPSHOT_DIR" && rm -rf "${MYSQL_SNAPSHOT_DIR}.old"
+
+echo ""
+cat << JSON
+{
+    "mysql_snapshot": "$MYSQL_SNAPSHOT_DIR",
+    "status": "collected",
+    "queries": ${#QUERIES[@]},
+    "failed": $FAILED,
+    "collect_date": "$(date '+%Y-%m-%d %H:%M:%S')"
+}
+JSON
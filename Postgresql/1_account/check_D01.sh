@@ -24,19 +24,6 @@ ID="D-01"
 STATUS="FAIL"
 SCAN_DATE="$(date '+%Y-%m-%d %H:%M:%S')"
 
-# psql을 사용하여 데이터베이스 쿼리를 실행하는 함수
-run_psql() {
-  local sql="$1"
-  if PGPASSWORD="${POSTGRES_PASSWORD:-}" psql -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null; then
-    return 0
-  fi
-  if command -v sudo >/dev/null 2>&1; then
-    sudo -u "$PG_SUPERUSER" psql -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null
-    return $?
-  fi
-  return 1
-}
-
 # 파이썬 대시보드 및 DB 연동 시 줄바꿈과 특수문자가 깨지지 않도록 처리하는 함수
 escape_json_str() {
   echo "$1" | sed ':a;N;$!ba;s/\n/\\n/g' | sed 's/\\/\\\\/g; s/"/\\"/g'
@@ -26,19 +26,6 @@ SCAN_DATE="$(date '+%Y-%m-%d %H:%M:%S')"
 TARGET_FILE="pg_hba_file_rules,pg_authid.rolpassword"
 CHECK_COMMAND="(pg_hba_file_rules의 md5 규칙 조회) + (pg_authid 로그인 계정 rolpassword SCRAM 여부 점검)"
 
-# psql 접속 및 쿼리 실행 함수
-run_psql() {
-  local sql="$1"
-  if PGPASSWORD="${POSTGRES_PASSWORD:-}" psql -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null; then
-    return 0
-  fi
-  if command -v sudo >/dev/null 2>&1; then
-    sudo -u "$PG_SUPERUSER" psql -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null
-    return $?
-  fi
-  return 1
-}
-
 # 파이썬 대시보드 호환을 위해 특수문자 및 개행을 처리하는 함수
 escape_json_str() {
   echo "$1" | sed ':a;N;$!ba;s/\n/\\n/g' | sed 's/\\/\\\\/g; s/"/\\"/g'
@@ -0,0 +1,293 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 함수] PostgreSQL 점검 스크립트(check_D*.sh)가 source 하는 접속/조회 공통부
+# @Description : load_pg_env - 접속 정보 기본값 설정 (postgres.env 가 있으면 우선 적용)
+#                run_psql    - 쿼리 실행. 카탈로그 스냅샷에 같은 쿼리가 있으면 그 결과를 사용
+#                스냅샷은 점검 실행 중 처음 run_psql 을 부른 스크립트가 접속 1회로 수집하고
+#                (pg_shadow/pg_roles/pg_authid, pg_settings(SHOW), pg_hba_file_rules, 버전, 권한)
+#                이후 D-01~D-26 은 추가 접속 없이 같은 스냅샷을 재사용한다.
+# @Output      : $PG_SNAPSHOT_DIR/<md5(쿼리)>.out (결과) / .err (쿼리 실패) / complete | unavailable
+#                비밀번호 해시가 포함되므로 root 전용 디렉터리(/var/lib/kisa, 0700) 아래에만 두고 파일은 0600.
+#                $PG_SNAPSHOT_DIR 은 최신 스냅샷 디렉터리를 가리키는 심볼릭 링크 (교체 시 링크만 원자적으로 바꿈)
+# ============================================================================
+
+PG_COMMON_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+load_pg_env() {
+  local env_file="${PG_ENV_FILE:-$PG_COMMON_DIR/postgres.env}"
+  if [ -f "$env_file" ]; then
+    # shellcheck disable=SC1090
+    . "$env_file"
+  fi
+  POSTGRES_HOST="${POSTGRES_HOST:-127.0.0.1}"
+  POSTGRES_PORT="${POSTGRES_PORT:-5432}"
+  POSTGRES_USER="${POSTGRES_USER:-postgres}"
+  POSTGRES_DB="${POSTGRES_DB:-postgres}"
+  PG_SUPERUSER="${PG_SUPERUSER:-postgres}"
+  KISA_STATE_DIR="${KISA_STATE_DIR:-/var/lib/kisa}"
+  PG_SNAPSHOT_DIR="${PG_SNAPSHOT_DIR:-$KISA_STATE_DIR/pg_snapshot}"
+  PG_SNAPSHOT_MAX_AGE="${PG_SNAPSHOT_MAX_AGE:-600}"
+  PG_SNAPSHOT_RETRY_AGE="${PG_SNAPSHOT_RETRY_AGE:-60}"
+  PG_SNAPSHOT_TIMEOUT="${PG_SNAPSHOT_TIMEOUT:-30}"
+}
+
+# 점검 스크립트의 쿼리 (D-20 은 ALLOWED_OBJECT_OWNERS 기본값 기준)
+PG_SNAPSHOT_QUERIES=(
+  # D-01
+  "SELECT s.usename, CASE WHEN (s.passwd IS NULL OR s.passwd = '') THEN 'NO_PASSWORD' ELSE 'ENCRYPTED' END
+FROM pg_shadow s
+JOIN pg_roles r ON r.rolname = s.usename
+WHERE r.rolsuper = true;"
+  # D-02
+  "SELECT rolname
+FROM pg_roles
+WHERE rolcanlogin = true
+ORDER BY rolname;"
+  # D-03 / D-10 / D-14
+  "SHOW hba_file;"
+  "SELECT rolname FROM pg_roles WHERE rolcanlogin = true AND rolname NOT LIKE 'pg_%' AND rolvaliduntil IS NULL;"
+  # D-04
+  "SELECT rolname FROM pg_roles WHERE rolsuper = true ORDER BY rolname;"
+  # D-08
+  "SELECT line_number || '|' || type || '|' ||
+       COALESCE(array_to_string(database, ','), '') || '|' ||
+       COALESCE(array_to_string(user_name, ','), '') || '|' ||
+       COALESCE(address, 'local')
+FROM pg_hba_file_rules
+WHERE error IS NULL
+  AND lower(auth_method) = 'md5'
+ORDER BY line_number;"
+  "SELECT rolname || '|' ||
+         CASE
+           WHEN COALESCE(rolpassword, '') = '' THEN 'NO_PASSWORD'
+           WHEN rolpassword LIKE 'SCRAM-SHA-256\$%' THEN 'SCRAM-SHA-256'
+           WHEN rolpassword LIKE 'md5%' THEN 'MD5'
+           ELSE 'OTHER'
+         END
+  FROM pg_authid
+  WHERE rolcanlogin = true
+    AND rolname NOT LIKE 'pg_%'
+  ORDER BY rolname;"
+  # D-10 / D-14
+  "SHOW config_file;"
+  "SHOW listen_addresses;"
+  "SHOW data_directory;"
+  "SHOW log_directory;"
+  # D-11
+  "WITH risk_role_member AS (
+  SELECT DISTINCT m.rolname AS account
+  FROM pg_auth_members am
+  JOIN pg_roles m ON m.oid = am.member
+  JOIN pg_roles r ON r.oid = am.roleid
+  WHERE m.rolcanlogin = true
+    AND m.rolsuper = false
+    AND m.rolname <> 'admin01'
+    AND m.rolname NOT LIKE 'pg_%'
+    AND r.rolname IN (
+      'pg_read_all_data',
+      'pg_write_all_data',
+      'pg_execute_server_program',
+      'pg_read_server_files',
+      'pg_write_server_files',
+      'pg_signal_backend'
+    )
+),
+risk_table_grant AS (
+  SELECT DISTINCT tp.grantee AS account
+  FROM information_schema.table_privileges tp
+  JOIN pg_roles pr ON pr.rolname = tp.grantee
+  WHERE tp.table_schema IN ('pg_catalog', 'information_schema')
+    AND tp.grantee <> 'PUBLIC'
+    AND pr.rolcanlogin = true
+    AND pr.rolsuper = false
+    AND pr.rolname <> 'admin01'
+    AND pr.rolname NOT LIKE 'pg_%'
+),
+risk_accounts AS (
+  SELECT account FROM risk_role_member
+  UNION
+  SELECT account FROM risk_table_grant
+)
+SELECT account
+FROM risk_accounts
+ORDER BY account;"
+  # D-18
+  "SELECT n.nspname || ':' || e.privilege_type
+FROM pg_namespace n
+JOIN LATERAL aclexplode(COALESCE(n.nspacl, acldefault('n', n.nspowner))) e ON true
+WHERE e.grantee = 0
+  AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+  AND (
+    (n.nspname = 'public' AND e.privilege_type = 'CREATE')
+    OR
+    (n.nspname <> 'public' AND e.privilege_type IN ('CREATE','USAGE'))
+  )
+ORDER BY 1;"
+  # D-20
+  "SELECT n.nspname || '.' || c.relname || ':' || pg_get_userbyid(c.relowner)
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname NOT IN ('pg_catalog','information_schema')
+  AND c.relkind IN ('r','v','m','S','f')
+  AND pg_get_userbyid(c.relowner) NOT IN ('postgres')
+ORDER BY 1;"
+  # D-21
+  "SELECT grantee || ':' || table_schema || '.' || table_name || ':' || privilege_type
+FROM information_schema.role_table_grants rtg
+JOIN pg_roles r ON r.rolname = rtg.grantee
+WHERE rtg.is_grantable = 'YES'
+  AND r.rolsuper = false
+  AND r.rolname NOT LIKE 'pg_%'
+  AND rtg.grantee <> 'PUBLIC'
+ORDER BY 1;"
+  # D-25 / D-26
+  "SHOW server_version;"
+  "SHOW logging_collector;"
+)
+
+# 스냅샷 키: 공백/줄바꿈을 공백 1개로 접고 앞뒤 공백 제거 후 md5
+pg_query_key() {
+  printf '%s' "$1" | tr '\t\n' '  ' | tr -s ' ' | sed 's/^ //; s/ $//' | md5sum | cut -c1-32
+}
+
+# 실행 사용자 소유이고 그룹/기타 쓰기 권한이 없는 경로인지
+pg_snapshot_trusted() {
+  local mode
+  [ -O "$1" ] || return 1
+  mode=$(stat -L -c %a "$1" 2>/dev/null) || return 1
+  [ $(( 0$mode & 022 )) -eq 0 ]
+}
+
+pg_snapshot_fresh() {
+  local dir="$PG_SNAPSHOT_DIR" mark max_age mtime
+  pg_snapshot_trusted "$(dirname "$dir")" && pg_snapshot_trusted "$dir" || return 1
+  # 접속 불가 기록은 짧게만 유지 (DB 기동 후 바로 다시 수집)
+  if [ -f "$dir/complete" ]; then
+    mark="$dir/complete"; max_age="$PG_SNAPSHOT_MAX_AGE"
+  elif [ -f "$dir/unavailable" ]; then
+    mark="$dir/unavailable"; max_age="$PG_SNAPSHOT_RETRY_AGE"
+  else
+    return 1
+  fi
+  mtime=$(stat -c %Y "$mark" 2>/dev/null) || return 1
+  [ $(( $(date +%s) - mtime )) -le "$max_age" ]
+}
+
+# 접속 1회로 모든 쿼리를 실행해 쿼리별 결과 파일로 분리 (TCP 접속 실패 시 sudo -u postgres 로 1회 재시도)
+pg_snapshot_collect() {
+  local tmp batch line_no=0 query normalized key rc line old
+  local timeout_bin
+  declare -A line_key
+  umask 077
+  tmp=$(mktemp -d "${PG_SNAPSHOT_DIR}.XXXXXX") || return 1
+  batch="$tmp/batch.sql"
+
+  for query in "${PG_SNAPSHOT_QUERIES[@]}"; do
+    normalized="$(printf '%s' "$query" | tr '\t\n' '  ' | tr -s ' ' | sed 's/^ //; s/ $//')"
+    key=$(printf '%s' "$normalized" | md5sum | cut -c1-32)
+    printf '\\echo @@snapshot %s\n%s\n' "$key" "$normalized" >> "$batch"
+    line_no=$((line_no + 2))
+    line_key[$line_no]="$key"
+    : > "$tmp/$key.out"
+  done
+
+  timeout_bin="$(command -v timeout 2>/dev/null || true)"
+  PGPASSWORD="${POSTGRES_PASSWORD:-}" ${timeout_bin:+$timeout_bin ${PG_SNAPSHOT_TIMEOUT}s} \
+    psql -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER" -d "$POSTGRES_DB" -X -t -A -q -w \
+    < "$batch" > "$tmp/batch.out" 2> "$tmp/batch.err"
+  rc=$?
+  if ! grep -q '^@@snapshot ' "$tmp/batch.out" && command -v sudo >/dev/null 2>&1; then
+    ${timeout_bin:+$timeout_bin ${PG_SNAPSHOT_TIMEOUT}s} \
+      sudo -u "$PG_SUPERUSER" psql -d "$POSTGRES_DB" -X -t -A -q \
+      < "$batch" > "$tmp/batch.out" 2> "$tmp/batch.err"
+    rc=$?
+  fi
+
+  if ! grep -q '^@@snapshot ' "$tmp/batch.out" || [ "$rc" -eq 124 ]; then
+    # 접속 불가: 이번 실행 동안 각 점검이 접속을 반복 시도하지 않도록 기록
+    rm -f "$tmp"/*
+    date '+%Y-%m-%d %H:%M:%S' > "$tmp/unavailable"
+  else
+    awk -v dir="$tmp" '
+      /^@@snapshot / { out = dir "/" $2 ".out"; next }
+      out != "" { print > out }
+    ' "$tmp/batch.out"
+    # "psql:<stdin>:N: ERROR: ..." -> 해당 줄의 쿼리를 실패로 기록
+    while IFS= read -r line; do
+      line_no=$(echo "$line" | sed -n 's/^psql:[^:]*:\([0-9][0-9]*\): ERROR.*/\1/p')
+      key="${line_key[$line_no]:-}"
+      [ -n "$key" ] || continue
+      rm -f "$tmp/$key.out"
+      echo "$line" > "$tmp/$key.err"
+    done < "$tmp/batch.err"
+    rm -f "$batch" "$tmp/batch.out" "$tmp/batch.err"
+    date '+%Y-%m-%d %H:%M:%S' > "$tmp/complete"
+  fi
+
+  # 링크를 새 디렉터리로 한 번에 바꾸고(rename) 이전 스냅샷은 정리 (읽는 쪽이 스냅샷 없는 순간을 보지 않도록)
+  if ! ln -sfn "$(basename "$tmp")" "$tmp.link" || ! mv -Tf "$tmp.link" "$PG_SNAPSHOT_DIR"; then
+    rm -rf "$tmp" "$tmp.link"
+    return 1
+  fi
+  for old in "${PG_SNAPSHOT_DIR}".??????; do
+    [ "$old" = "$tmp" ] || rm -rf "$old"
+  done
+}
+
+# 스냅샷/잠금 파일을 둘 디렉터리를 root 전용(0700)으로 준비
+pg_snapshot_prepare() {
+  local dir
+  dir="$(dirname "$PG_SNAPSHOT_DIR")"
+  mkdir -p -m 0700 "$dir" 2>/dev/null
+  pg_snapshot_trusted "$dir"
+}
+
+# 스냅샷이 없거나 오래됐으면 1회 수집 (동시에 실행된 점검들은 잠금으로 1개만 수집)
+pg_snapshot_ensure() {
+  pg_snapshot_fresh && return 0
+  # 디렉터리를 신뢰할 수 없으면 스냅샷 없이 각 점검이 직접 조회
+  pg_snapshot_prepare || return 1
+  if command -v flock >/dev/null 2>&1; then
+    (
+      umask 077
+      flock -w "$PG_SNAPSHOT_TIMEOUT" 9 || exit 1
+      pg_snapshot_fresh || pg_snapshot_collect
+    ) 9>"${PG_SNAPSHOT_DIR}.lock"
+  else
+    ( pg_snapshot_collect )
+  fi
+}
+
+# 반환값: 0=스냅샷 결과 출력, 1=쿼리 실패(또는 접속 불가)로 기록됨, 2=스냅샷에 없는 쿼리(직접 조회)
+pg_snapshot_query() {
+  local dir="$PG_SNAPSHOT_DIR" key
+  [ "${PG_SNAPSHOT:-on}" = "off" ] && return 2
+  pg_snapshot_ensure && pg_snapshot_fresh || return 2
+  [ -f "$dir/unavailable" ] && return 1
+  key=$(pg_query_key "$1")
+  if [ -f "$dir/$key.out" ]; then cat "$dir/$key.out"; return 0; fi
+  [ -f "$dir/$key.err" ] && return 1
+  return 2
+}
+
+# psql 쿼리 실행 (스냅샷 우선, 없으면 TCP 접속 후 실패 시 sudo -u postgres 로 재시도)
+run_psql() {
+  local sql="$1" snap
+  snap="$(pg_snapshot_query "$sql")"
+  case $? in
+    0) printf '%s\n' "$snap"; return 0 ;;
+    1) return 1 ;;
+  esac
+  if PGPASSWORD="${POSTGRES_PASSWORD:-}" psql -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER" -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null; then
+    return 0
+  fi
+  if command -v sudo >/dev/null 2>&1; then
+    sudo -u "$PG_SUPERUSER" psql -d "$POSTGRES_DB" -t -A -q -c "$sql" 2>/dev/null
+    return $?
+  fi
+  return 1
+}
@@ -26,8 +26,11 @@ CHECK_COMMAND='find / -xdev \( -nouser -o -nogroup \) -ls 2>/dev/null'
 GUIDE_LINE=$'자동 조치 시 파일/디렉터리 삭제 또는 소유권 변경이 서비스 구성/스크립트 동작에 영향을 주어 예기치 않은 오류나 서비스 중단이 발생할 수 있어 수동 조치가 필요합니다.
 관리자가 직접 확인 후 불필요한 항목은 rm 또는 rm -r로 제거하고, 사용 중인 항목은 적절한 사용자/그룹으로 chown 및 chgrp를 적용해 주시기 바랍니다.'
 
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
 # 고아 파일/디렉터리 목록 수집
-ORPHAN_FILES_RAW=$(find / \
+ORPHAN_FILES_RAW=$(fs_inventory_or_find / \
   -xdev \
   \( -nouser -o -nogroup \) \
   -ls 2>/dev/null)
@@ -39,8 +39,11 @@ first_n_paths_csv() {
   head -n "$n" | paste -sd ', ' -
 }
 
-RESULT_SUID_SGID="$(find / -user root -type f \( -perm -04000 -o -perm -02000 \) -xdev 2>/dev/null)"
-RESULT_STICKY="$(find / -user root -type f -perm -01000 -xdev 2>/dev/null)"
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
+RESULT_SUID_SGID="$(fs_inventory_or_find / -user root -type f \( -perm -04000 -o -perm -02000 \) -xdev 2>/dev/null)"
+RESULT_STICKY="$(fs_inventory_or_find / -user root -type f -perm -01000 -xdev 2>/dev/null)"
 
 # 현재 설정값은 양호/취약과 무관하게 항상 보여줌
 DETAIL_CONTENT=$(cat <<EOF
@@ -29,8 +29,11 @@ TMP_RESULT_VIEW="/tmp/U25_world_writable_files_view.txt"
 DETAIL_CONTENT=""
 REASON_LINE=""
 
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
 # 점검: world writable 파일 탐색(가상/런타임 파일시스템 제외)
-find / \( -path /proc -o -path /sys -o -path /run -o -path /dev \) -prune -o -type f -perm -2 -exec ls -l {} \; 2>/dev/null > "$TMP_RESULT_FULL"
+fs_inventory_or_find / \( -path /proc -o -path /sys -o -path /run -o -path /dev \) -prune -o -type f -perm -2 -exec ls -l {} \; 2>/dev/null > "$TMP_RESULT_FULL"
 
 FILE_COUNT=$(wc -l < "$TMP_RESULT_FULL" 2>/dev/null | tr -d ' ')
 
@@ -77,8 +77,11 @@ if [ -n "$SERVICE_EVIDENCE" ]; then
   SERVICE_LINE="${SERVICE_LINE}(by:${SERVICE_EVIDENCE})"
 fi
 
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
 # 점검 대상 파일 수집
-RHOSTS_FILES=$(find /home -name ".rhosts" -type f 2>/dev/null)
+RHOSTS_FILES=$(fs_inventory_or_find /home -name ".rhosts" -type f 2>/dev/null)
 
 # 현재 설정(DETAIL_CONTENT) 구성: 항상 전체 현황 표시
 DETAIL_CONTENT="${SERVICE_LINE}"
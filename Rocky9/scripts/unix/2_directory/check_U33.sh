@@ -38,6 +38,9 @@ json_escape() {
     | sed ':a;N;$!ba;s/\n/\\n/g'
 }
 
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
 # 숨겨진 파일/디렉터리 수집
 HIDDEN_FILES_RAW=""
 HIDDEN_DIRS_RAW=""
@@ -47,13 +50,13 @@ HIDDEN_DIRS_FLAT=""
 for d in "${TARGET_DIRS[@]}"; do
   [ -d "$d" ] || continue
 
-  f=$(find "$d" -xdev -type f -name ".*" 2>/dev/null | head -n 50)
+  f=$(fs_inventory_or_find "$d" -xdev -type f -name ".*" 2>/dev/null | head -n 50)
   if [ -n "$f" ]; then
     HIDDEN_FILES_RAW+="$d:"$'\n'"$f"$'\n'
     HIDDEN_FILES_FLAT+="$f"$'\n'
   fi
 
-  dd=$(find "$d" -xdev -type d -name ".*" 2>/dev/null | head -n 50)
+  dd=$(fs_inventory_or_find "$d" -xdev -type d -name ".*" 2>/dev/null | head -n 50)
   if [ -n "$dd" ]; then
     HIDDEN_DIRS_RAW+="$d:"$'\n'"$dd"$'\n'
     HIDDEN_DIRS_FLAT+="$dd"$'\n'
@@ -122,8 +122,11 @@ if [ -f "/etc/hosts.equiv" ]; then
 fi
 append_detail_line "hosts_equiv_effective_lines=$HOSTS_EQ_AFTER"
 
+# shellcheck disable=SC1090,SC1091
+. "$(dirname "$0")/../_fs_inventory.sh" 2>/dev/null || . /var/lib/kisa/_fs_inventory.sh 2>/dev/null || fs_inventory_or_find() { find "$@"; }
+
 RHOSTS_AFTER_SUMMARY=""
-RHOSTS_LIST="$(find /home -maxdepth 3 -type f -name .rhosts 2>/dev/null | head -n 50)"
+RHOSTS_LIST="$(fs_inventory_or_find /home -maxdepth 3 -type f -name .rhosts 2>/dev/null | head -n 50)"
 if [ -n "$RHOSTS_LIST" ]; then
   while IFS= read -r rf; do
     [ -z "$rf" ] && continue
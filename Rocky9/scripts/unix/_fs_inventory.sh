@@ -0,0 +1,85 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 함수] 파일시스템 인벤토리 점검(U-15/U-23/U-25/U-27/U-33/U-36)과 수집기가 source 하는 공통부
+# @Description : fs_inventory_or_find - 점검용: find 와 같은 인자/출력. 인벤토리가 최신이면 전체 순회 대신
+#                                       후보 경로에만 같은 조건을 적용하고, 아니면 find 를 그대로 실행
+#                fs_inventory_fresh   - 캐시를 신뢰할 수 있고 최신이면 0
+#                fs_inventory_prepare - 수집기용: 캐시 디렉터리를 root 전용(0700)으로 준비
+#                캐시는 root 만 쓸 수 있는 디렉터리에 두고, 실행 사용자 소유이면서 그룹/기타 쓰기 권한이
+#                없을 때만 사용한다. (누구나 쓸 수 있는 /var/tmp 에 빈 인벤토리를 심어 PASS 를 만드는 것 방지)
+# @Output      : $FS_INVENTORY_FILE ("<장치 번호>\t<경로>" 레코드, NUL 구분 - collect_fs_inventory.sh 참고)
+# ============================================================================
+
+KISA_STATE_DIR="${KISA_STATE_DIR:-/var/lib/kisa}"
+FS_INVENTORY_FILE="${FS_INVENTORY_FILE:-$KISA_STATE_DIR/fs_inventory.tsv}"
+FS_INVENTORY_MAX_AGE="${FS_INVENTORY_MAX_AGE:-3600}"
+
+# 실행 사용자 소유이고 그룹/기타 쓰기 권한이 없는 경로인지
+fs_inventory_trusted() {
+  local mode
+  [ -O "$1" ] || return 1
+  mode=$(stat -c %a "$1" 2>/dev/null) || return 1
+  [ $(( 0$mode & 022 )) -eq 0 ]
+}
+
+fs_inventory_fresh() {
+  local mtime
+  [ -f "$FS_INVENTORY_FILE" ] && [ -s "$FS_INVENTORY_FILE" ] || return 1
+  fs_inventory_trusted "$FS_INVENTORY_FILE" || return 1
+  fs_inventory_trusted "$(dirname "$FS_INVENTORY_FILE")" || return 1
+  mtime=$(stat -c %Y "$FS_INVENTORY_FILE" 2>/dev/null) || return 1
+  [ $(( $(date +%s) - mtime )) -le "$FS_INVENTORY_MAX_AGE" ]
+}
+
+fs_inventory_prepare() {
+  local dir
+  dir="$(dirname "$FS_INVENTORY_FILE")"
+  mkdir -p -m 0700 "$dir" 2>/dev/null
+  fs_inventory_trusted "$dir"
+}
+
+# 후보 경로를 find <후보...> -maxdepth 0 <조건/동작> 으로 다시 평가하므로 소유자/권한은 점검 시점 값이고
+# 출력 형식(-ls, -exec ls -l 등)도 전체 find 와 같다. -xdev 는 시작 경로와 같은 장치 번호로,
+# -maxdepth N 은 시작 경로 기준 깊이로 대신 거른다. (경로는 NUL 구분이라 이름의 개행/탭이 레코드를 나누지 못함)
+fs_inventory_or_find() {
+  local start="$1" prefix="${1%/}/" xdev=0 maxdepth="" dev="" rec path rel slashes
+  local -a expr=() batch=()
+  if ! fs_inventory_fresh; then
+    find "$@"
+    return
+  fi
+  shift
+  while [ $# -gt 0 ]; do
+    case "$1" in
+      -xdev) xdev=1 ;;
+      -maxdepth) maxdepth="$2"; shift ;;
+      *) expr+=("$1") ;;
+    esac
+    shift
+  done
+  [ "$xdev" -eq 1 ] && dev=$(stat -c %d "$start" 2>/dev/null)
+
+  while IFS= read -r -d '' rec; do
+    path="${rec#*$'\t'}"
+    case "$path" in
+      "$start"|"$prefix"*) ;;
+      *) continue ;;
+    esac
+    [ -n "$dev" ] && [ "${rec%%$'\t'*}" != "$dev" ] && continue
+    if [ -n "$maxdepth" ]; then
+      rel="${path#"${start%/}"}"
+      slashes="${rel//[^\/]/}"
+      [ "${#slashes}" -le "$maxdepth" ] || continue
+    fi
+    batch+=("$path")
+    if [ "${#batch[@]}" -ge 500 ]; then
+      find "${batch[@]}" -maxdepth 0 "${expr[@]}"
+      batch=()
+    fi
+  done < "$FS_INVENTORY_FILE"
+  [ "${#batch[@]}" -eq 0 ] || find "${batch[@]}" -maxdepth 0 "${expr[@]}"
+}
@@ -0,0 +1,44 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 수집기] 파일시스템 인벤토리 1회 수집
+# @Description : U-15/U-23/U-25/U-27/U-33/U-36 이 각자 수행하던 전체 find 순회를
+#                1회로 합쳐, 점검에 필요한 inode 만 캐시 파일에 기록한다.
+#                (소유자/그룹 없음, SUID/SGID/Sticky, world writable, 숨김 이름)
+# @Output      : 후보 inode 1개당 "<장치 번호>\t<경로>\0" (NUL 구분 - 이름에 개행/탭이 있어도 레코드가 나뉘지 않음)
+#                소유자/권한은 기록하지 않고 점검 시점에 fs_inventory_or_find 가 find 로 다시 평가한다.
+# ============================================================================
+
+# 캐시 경로/신뢰 조건은 점검 스크립트와 같은 공통부 사용 (개별 실행 시 플레이북이 배포한 사본)
+FS_COMMON_FILE="$(cd "$(dirname "$0")" && pwd)/_fs_inventory.sh"
+[ -f "$FS_COMMON_FILE" ] || FS_COMMON_FILE="/var/lib/kisa/_fs_inventory.sh"
+# shellcheck disable=SC1090
+. "$FS_COMMON_FILE" || exit 1
+
+umask 077
+
+# 캐시 디렉터리가 root 전용이 아니면 기록하지 않음 (점검은 전체 find 로 동작)
+if ! fs_inventory_prepare; then
+  echo "[ERROR] 인벤토리 디렉터리를 신뢰할 수 없음: $(dirname "$FS_INVENTORY_FILE")" >&2
+  exit 1
+fi
+TMP_FILE="${FS_INVENTORY_FILE}.$$"
+
+# 가상/런타임 파일시스템은 기존 U-25 와 동일하게 제외하고 나머지는 한 번만 순회
+find / \( -path /proc -o -path /sys -o -path /run -o -path /dev \) -prune -o \
+  \( -nouser -o -nogroup -o -perm -4000 -o -perm -2000 -o -perm -1000 -o \( ! -type l -perm -0002 \) -o -name '.*' \) \
+  -printf '%D\t%p\0' 2>/dev/null > "$TMP_FILE" && mv -f "$TMP_FILE" "$FS_INVENTORY_FILE"
+
+ENTRY_COUNT=$(tr -cd '\0' < "$FS_INVENTORY_FILE" 2>/dev/null | wc -c)
+
+echo ""
+cat << JSON
+{
+    "fs_inventory": "$FS_INVENTORY_FILE",
+    "entries": $ENTRY_COUNT,
+    "collect_date": "$(date '+%Y-%m-%d %H:%M:%S')"
+}
+JSON
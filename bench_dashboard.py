@@ -0,0 +1,367 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from metrics import compute_host_metrics, get_metrics, group_by_category
+from report_writer import to_excel, to_fleet_excel
+from result_loader import ResultLoader
+from result_store import ResultStore
+
+# --- 대시보드 데이터 경로 벤치마크 ---
+# 가상 서버군(N 서버 x M 항목 x K 이력) 결과 폴더를 만들어 대시보드가 거치는 단계별
+# 소요 시간과 최대 메모리(tracemalloc)를 재고, 저장된 기준값(bench_baseline.json)과 비교한다.
+#   python3 bench_dashboard.py run --profile medium            # 측정 + 기준값 비교
+#   python3 bench_dashboard.py run --profile medium --save      # 기준값 갱신
+#   python3 bench_dashboard.py generate ./fixtures --hosts 50   # 결과 폴더만 생성
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# (서버 수, 서버당 항목 수, 항목당 이력 수)
+PROFILES = {
+    'small': (5, 67, 3),
+    'medium': (50, 80, 5),
+    'large': (300, 93, 10),
+}
+
+# 시간/메모리가 기준값보다 이 비율 이상 늘면 회귀로 표시
+DEFAULT_TOLERANCE = 0.25
+# 짧은 단계는 비율 잡음이 커서, 늘어난 절대량도 이 값을 넘을 때만 회귀로 본다
+MIN_DELTA = {'seconds': 0.05, 'peak_kb': 256}
+
+OS_CATEGORIES = ["계정관리", "파일 및 디렉터리 관리", "서비스관리", "패치 관리", "로그관리"]
+DB_CATEGORIES = ["계정 관리", "접근 관리", "옵션 관리", "패치 관리"]
+IMPORTANCE = ["상", "상", "중", "중", "하"]
+OS_ITEMS = 67
+
+
+def check_ids(count):
+    # U-01 ~ U-67 다음은 D-01 ~ (DB 항목)
+    ids = [f"U-{n:02d}" for n in range(1, min(count, OS_ITEMS) + 1)]
+    ids += [f"D-{n:02d}" for n in range(1, count - len(ids) + 1)]
+    return ids
+
+
+def host_names(count):
+    # 호스트 이름은 결과 파일명 규칙(<host>_<key>.json)상 '_' 를 포함하지 않는다.
+    # DB 분류 규칙(Rocky9=MySQL, 그 외=PostgreSQL)이 둘 다 나오도록 번갈아 이름을 붙인다.
+    return [f"Rocky{9 if i % 2 == 0 else 10}-bench{i:04d}" for i in range(count)]
+
+
+def make_result(check_id, status, when, rng, new_schema):
+    """점검 스크립트 출력 1건 (구 형식 / 신 형식)."""
+    is_db = check_id.startswith("D")
+    category = rng.choice(DB_CATEGORIES if is_db else OS_CATEGORIES)
+    target_file = f"/etc/bench/{check_id.lower()}.conf"
+    detail = f"{check_id} 설정값 점검 결과 " + ("기준 충족" if status == "PASS" else "기준 미달 " * rng.randint(1, 8))
+    guide = f"{target_file} 의 설정을 기준값으로 변경하세요."
+    scan_date = when.strftime("%Y-%m-%d %H:%M:%S")
+    common = {
+        'category': category,
+        'title': f"벤치마크 항목 {check_id}",
+        'importance': rng.choice(IMPORTANCE),
+        'status': status,
+    }
+    if new_schema:
+        evidence = {'command': f"grep -E '^Option' {target_file}", 'detail': detail,
+                    'guide': guide, 'target_file': target_file}
+        # 실제 스크립트처럼 raw_evidence 를 JSON 문자열로 싣는다
+        return {'item_code': check_id, **common, 'scan_date': scan_date,
+                'raw_evidence': json.dumps(evidence, ensure_ascii=False)}
+    return {'check_id': check_id, **common, 'evidence': detail, 'guide': guide,
+            'target_file': target_file, 'file_hash': f"{rng.getrandbits(256):064x}",
+            'action_type': "manual", 'check_date': scan_date}
+
+
+def generate_fleet(path, hosts, checks, versions, seed=0, fail_rate=0.3):
+    """결과 폴더 생성. 최신 결과는 <host>_check_<ID>.json, 이전 이력은 <host>_check_<ID>_r<k>.json.
+    항목마다 구/신 스키마를 번갈아 쓴다. 생성한 파일 수를 반환."""
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    base = datetime(2026, 1, 1)
+    written = 0
+    for h, host in enumerate(host_names(hosts)):
+        for c, check_id in enumerate(check_ids(checks)):
+            code = check_id.replace('-', '')
+            for k in range(versions):
+                when = base + timedelta(days=k, minutes=h)
+                status = "FAIL" if rng.random() < fail_rate else "PASS"
+                data = make_result(check_id, status, when, rng, new_schema=(h + c + k) % 2 == 1)
+                suffix = "" if k == versions - 1 else f"_r{k}"
+                with open(os.path.join(path, f"{host}_check_{code}{suffix}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
+                written += 1
+    return written
+
+
+def touch_fraction(path, fraction, seed=1):
+    """결과 파일 일부를 다시 써서 증분 갱신 경로를 재현한다. 다시 쓴 파일 수를 반환."""
+    rng = random.Random(seed)
+    names = sorted(n for n in os.listdir(path) if n.endswith(".json") and "_r" not in n)
+    picked = rng.sample(names, max(1, int(len(names) * fraction))) if names else []
+    for name in picked:
+        full = os.path.join(path, name)
+        with open(full, encoding='utf-8') as f:
+            data = json.load(f)
+        data['status'] = "PASS" if data.get('status') == "FAIL" else "FAIL"
+        with open(full, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    return len(picked)
+
+
+class Stage:
+    """with 블록 1개의 소요 시간(초)과 tracemalloc 최대 메모리(KB)."""
+
+    def __init__(self, results, name):
+        self.results, self.name = results, name
+
+    def __enter__(self):
+        gc.collect()
+        tracemalloc.reset_peak()
+        self._start_mem = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self._start
+        peak_kb = (tracemalloc.get_traced_memory()[1] - self._start_mem) / 1024
+        best = self.results.get(self.name)
+        # 반복 실행 중 가장 빠른 시간과 가장 큰 메모리를 남긴다
+        if best is None:
+            self.results[self.name] = {'seconds': seconds, 'peak_kb': peak_kb}
+        else:
+            best['seconds'] = min(best['seconds'], seconds)
+            best['peak_kb'] = max(best['peak_kb'], peak_kb)
+        return False
+
+
+def run_stages(results_path, work_dir, results):
+    """대시보드가 한 화면을 그리기까지 거치는 단계를 순서대로 측정한다."""
+    loader = ResultLoader(results_path)
+    with Stage(results, 'loader_cold'):
+        df = loader.load()
+    with Stage(results, 'loader_warm'):
+        loader.load()
+
+    db_path = os.path.join(work_dir, "bench.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    store = ResultStore(db_path)
+    try:
+        with Stage(results, 'store_ingest'):
+            store.ingest_dir(results_path)
+        with Stage(results, 'store_latest_cold'):
+            store_df = store.latest_frame()
+        with Stage(results, 'store_latest_warm'):
+            store.latest_frame()
+    finally:
+        store.close()
+    if len(store_df) != len(df):
+        print(f"warning: loader rows {len(df)} != store rows {len(store_df)}", file=sys.stderr)
+
+    host = sorted(df['target'].unique())[0]
+    with Stage(results, 'host_filter'):
+        target_df = df[df['target'] == host].reset_index(drop=True)
+    with Stage(results, 'metrics_host'):
+        get_metrics(target_df)
+    with Stage(results, 'metrics_fleet'):
+        for _, host_df in df.groupby('target', sort=False):
+            compute_host_metrics(host_df)
+    with Stage(results, 'cards_host'):
+        for data in (target_df[target_df['db_type'] == "OS"],
+                     target_df[target_df['db_type'].isin(["MySQL", "PostgreSQL"])]):
+            if not data.empty:
+                for _, cat_items, _ in group_by_category(data):
+                    cat_items[['check_id', 'title', 'importance', 'status']].copy()
+    with Stage(results, 'excel_host'):
+        to_excel(target_df)
+    with Stage(results, 'excel_fleet'):
+        to_fleet_excel(df)
+
+    touch_fraction(results_path, 0.01)
+    with Stage(results, 'loader_incremental'):
+        loader.load()
+    return len(df)
+
+
+def run_app(results_path, work_dir, results, timeout):
+    """streamlit 이 설치된 경우에만: dashboard_v2.py 전체 1회 실행 (카드 렌더링 포함)."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit not installed: app_run skipped", file=sys.stderr)
+        return
+    app_dir = os.path.join(work_dir, "app")
+    os.makedirs(app_dir, exist_ok=True)
+    link = os.path.join(app_dir, "results")
+    if not os.path.exists(link):
+        os.symlink(os.path.abspath(results_path), link)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dashboard_v2.py")
+    cwd = os.getcwd()
+    os.chdir(app_dir)
+    try:
+        with Stage(results, 'app_run'):
+            AppTest.from_file(script, default_timeout=timeout).run()
+    finally:
+        os.chdir(cwd)
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(stages, baseline, tolerance):
+    """[(단계, 항목, 현재, 기준, 비율)] 중 허용치를 넘은 것."""
+    regressions = []
+    for name, current in stages.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for field, min_delta in MIN_DELTA.items():
+            if current[field] - base[field] <= min_delta:
+                continue
+            ratio = current[field] / base[field] if base[field] else float('inf')
+            if ratio > 1 + tolerance:
+                regressions.append((name, field, current[field], base[field], ratio))
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'profiles': {}}
+
+
+def save_baseline(path, profile, entry):
+    baseline = load_baseline(path)
+    baseline.setdefault('profiles', {})[profile] = entry
+    tmp = f"{path}.{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def print_report(stages, baseline_stages):
+    print(f"{'stage':<20}{'seconds':>10}{'peak MB':>10}{'base s':>10}{'base MB':>10}")
+    for name, m in stages.items():
+        base = baseline_stages.get(name, {})
+        base_s = f"{base['seconds']:.3f}" if base else "-"
+        base_mb = f"{base['peak_kb'] / 1024:.1f}" if base else "-"
+        print(f"{name:<20}{m['seconds']:>10.3f}{m['peak_kb'] / 1024:>10.1f}{base_s:>10}{base_mb:>10}")
+
+
+def cmd_run(args):
+    hosts, checks, versions = PROFILES[args.profile]
+    hosts, checks, versions = args.hosts or hosts, args.checks or checks, args.versions or versions
+    work_dir = tempfile.mkdtemp(prefix="kisa_bench_")
+    try:
+        results_path = os.path.join(work_dir, "results")
+        stages = {}
+        for n in range(args.repeat):
+            # 반복마다 같은 결과 폴더에서 시작 (증분 단계가 바꾼 파일도 되돌림)
+            shutil.rmtree(results_path, ignore_errors=True)
+            started = time.perf_counter()
+            files = generate_fleet(results_path, hosts, checks, versions, seed=args.seed)
+            if n == 0:
+                print(f"generated {files} files ({hosts} hosts x {checks} checks x {versions} versions) "
+                      f"in {time.perf_counter() - started:.1f}s")
+            tracemalloc.start()
+            try:
+                rows = run_stages(results_path, work_dir, stages)
+            finally:
+                tracemalloc.stop()
+        if args.app:
+            tracemalloc.start()
+            try:
+                run_app(results_path, work_dir, stages, args.app_timeout)
+            finally:
+                tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    entry = {
+        'params': {'hosts': hosts, 'checks': checks, 'versions': versions, 'rows': rows},
+        'machine': machine_info(),
+        'recorded': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'stages': {k: {'seconds': round(v['seconds'], 4), 'peak_kb': round(v['peak_kb'], 1)}
+                   for k, v in stages.items()},
+    }
+    base_entry = load_baseline(args.baseline).get('profiles', {}).get(args.profile, {})
+    comparable = base_entry.get('params') == entry['params']
+    print_report(entry['stages'], base_entry.get('stages', {}) if comparable else {})
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+    if args.save:
+        save_baseline(args.baseline, args.profile, entry)
+        print(f"baseline saved: {args.baseline} [{args.profile}]")
+        return 0
+    if not base_entry:
+        print(f"no baseline for profile '{args.profile}' (use --save)")
+        return 0
+    if not comparable:
+        print(f"baseline params differ ({base_entry.get('params')}): not compared")
+        return 0
+    if base_entry.get('machine') != entry['machine']:
+        print(f"note: baseline recorded on {base_entry.get('machine')}")
+
+    regressions = compare(entry['stages'], base_entry['stages'], args.tolerance)
+    for name, field, current, base, ratio in regressions:
+        print(f"REGRESSION {name} {field}: {current:.3f} vs {base:.3f} (x{ratio:.2f})")
+    if not regressions:
+        print(f"no regression over {args.tolerance:.0%} against baseline {base_entry.get('recorded')}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드 데이터 경로 벤치마크")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="가상 서버군으로 단계별 시간/메모리 측정")
+    run.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    run.add_argument("--hosts", type=int)
+    run.add_argument("--checks", type=int)
+    run.add_argument("--versions", type=int)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3, help="반복 횟수 (시간은 최솟값, 메모리는 최댓값)")
+    run.add_argument("--baseline", default=DEFAULT_BASELINE)
+    run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    run.add_argument("--save", action="store_true", help="이번 측정값을 기준값으로 저장")
+    run.add_argument("--app", action="store_true", help="dashboard_v2.py 전체 실행도 측정 (streamlit 필요)")
+    run.add_argument("--app-timeout", type=float, default=120)
+    run.add_argument("-o", "--output", help="측정 결과 JSON 저장 경로")
+
+    gen = sub.add_parser("generate", help="가상 결과 폴더만 생성")
+    gen.add_argument("path")
+    gen.add_argument("--hosts", type=int, default=PROFILES['small'][0])
+    gen.add_argument("--checks", type=int, default=PROFILES['small'][1])
+    gen.add_argument("--versions", type=int, default=PROFILES['small'][2])
+    gen.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "generate":
+        files = generate_fleet(args.path, args.hosts, args.checks, args.versions, seed=args.seed)
+        print(f"{files} files -> {args.path}")
+        return 0
+    return cmd_run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
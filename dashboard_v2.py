@@ -1,11 +1,18 @@
 import streamlit as st
 import pandas as pd
-import json
 import os
-import io
-import subprocess
-import time
-from datetime import datetime
+import math
+import numpy as np
+
+from fleet_matrix import FAIL_HIGH, FAIL_LOW, FAIL_MID, MISSING, PASS, UNKNOWN
+from job_runner import JobRunner
+from metrics import get_metrics, group_by_category, order_categories
+from report_writer import to_excel, to_fleet_excel
+from result_loader import ResultLoader
+from result_store import DEFAULT_DB_PATH, ResultStore
+from result_snapshot import SharedResults
+from scan_delta import CHANGE_KINDS, CHANGE_LABELS
+from result_watcher import ResultWatcher, WatchedSource
 
 # --- 1. 페이지 설정 및 UI 디자인  ---
 st.set_page_config(page_title="Security Ops Master v6.1", layout="wide", initial_sidebar_state="expanded")
@@ -109,120 +116,184 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 2. 데이터 로드 로직 ---
-def load_all_data():
-    results_path = "./results"
-    all_data = []
-    if not os.path.exists(results_path): return pd.DataFrame()
-
-    for file in os.listdir(results_path):
-        if file.endswith(".json"):
-            try:
-                with open(os.path.join(results_path, file), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # 파일명에서 타겟 정보 추출
-                    data['target'] = file.split('_')[0]
-                    # check_id 시작 문자로 시스템/DB 분류
-                    check_id = str(data.get('check_id', data.get('item_id', '')))
-                    if 'D' in check_id.upper():
-                        if "Rocky9" in data['target']:
-                            data['db_type'] = "MySQL"
-                        else:
-                            data['db_type'] = "PostgreSQL"
-                    else:
-                        data['db_type'] = "OS"
-                    
-                    all_data.append(data)
-            except:
-                continue
-
-    df = pd.DataFrame(all_data)
-    if not df.empty:
-        df = df.fillna("")
-        df = df.replace([float('inf'), float('-inf')], 0)
-        
-        df['check_date'] = pd.to_datetime(df['check_date'], errors='coerce')
-        df = df.sort_values(by=['target', 'check_id', 'check_date'], ascending=[True, True, False])
-        df = df.drop_duplicates(subset=['target', 'check_id'], keep='first')
-        df = df.sort_values(by='check_id')
-        
-    return df
-# --- 3. 엑셀 출력 로직  ---
-def to_excel(df):
-    output = io.BytesIO()
-    
-    # 1. 데이터 클렌징 (보고서용 컬럼 추출 및 정리)
-    # 필요한 컬럼이 없을 경우를 대비해 reindex 사용
-    cols = ['category', 'check_id', 'title', 'importance', 'status', 'evidence', 'guide']
-    report_df = df.reindex(columns=cols).fillna("N/A").copy()
-    
-    report_df.loc[report_df['status'] == 'PASS', 'guide'] = "조치가 필요 없습니다."
-    report_df['status_label'] = report_df['status'].map({'FAIL': '취약', 'PASS': '양호'}).fillna('미점검')
-    
-    report_df.columns = ['분류', '항목ID', '점검항목', '중요도', '상태_원문', '점검결과', '조치 가이드', '상태']
-    report_df = report_df[['분류', '항목ID', '점검항목', '중요도', '상태', '점검결과', '조치 가이드']]
-
-    # 2. 요약 지표 계산 (분모 0 체크)
-    total_val = len(report_df)
-    fail_val = len(report_df[report_df['상태'] == '취약'])
-    if total_val > 0:
-        pass_rate = f"{round(((total_val - fail_val) / total_val) * 100, 1)} %"
-    else:
-        pass_rate = "0.0 %"
+# 세션/리런 간 공유되는 증분 로더: 변경된 결과 파일만 다시 파싱
+@st.cache_resource
+def get_result_loader(results_path="./results"):
+    return ResultLoader(results_path)
+
+# 결과 DB(results.db)가 있으면 "호스트/항목별 최신" 을 인덱스 조회로 읽음
+@st.cache_resource
+def get_result_store(db_path=DEFAULT_DB_PATH):
+    return ResultStore(db_path)
+
+def get_result_source():
+    if os.path.exists(DEFAULT_DB_PATH):
+        return get_result_store()
+    return get_result_loader()
+
+# 결과 폴더 감시(inotify, 안 되면 폴링): 변경 일지에 적힌 파일만 다시 읽고, 변경이 없으면 폴더도 훑지 않음
+@st.cache_resource
+def get_result_watcher():
+    return ResultWatcher(["./results", "./fix_logs"]).start()
+
+@st.cache_resource
+def get_watched_source(source_name):
+    source = get_result_store() if source_name == "ResultStore" else get_result_loader()
+    return WatchedSource(source, get_result_watcher(), "./results")
+
+# 모든 세션이 공유하는 읽기 전용 결과 스냅샷 (결과가 바뀔 때 1회만 생성 후 교체)
+@st.cache_resource
+def get_shared_results(source_name):
+    return SharedResults(get_watched_source(source_name))
+
+def load_snapshot():
+    return get_shared_results(type(get_result_source()).__name__).snapshot()
+
+# 서버 보고서는 결과 지문(fingerprint)이 같으면 다시 만들지 않음 (최근 16개까지 보관)
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_host_report(host, fingerprint, _df):
+    return to_excel(_df)
+
+# 결과 집합이 바뀔 때만 새로 만들도록 버전을 키로 캐시 (_df 는 해시 대상에서 제외)
+@st.cache_data(max_entries=2, show_spinner=False)
+def build_fleet_report(result_version, _df):
+    return to_fleet_excel(_df)
+# --- 3. 엑셀 출력 로직: report_writer.to_excel ---
 
-    # 3. 엑셀 파일 생성 (에러 방지 옵션 추가)
-    # nan_inf_to_errors 옵션은 에러 대신 빈 값을 넣어줌
-    with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs={'options': {'nan_inf_to_errors': True}}) as writer:
-        report_df.to_excel(writer, index=False, sheet_name='보안점검_리포트', startrow=7)
-        
-        workbook = writer.book
-        worksheet = writer.sheets['보안점검_리포트']
-        
-        # 스타일 정의
-        header_fmt = workbook.add_format({'bold': True, 'bg_color': '#4472C4', 'font_color': 'white', 'border': 1, 'align': 'center'})
-        pass_cell_fmt = workbook.add_format({'bg_color': '#C6EFCE', 'font_color': '#006100', 'border': 1, 'align': 'center'})
-        fail_cell_fmt = workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006', 'border': 1, 'align': 'center'})
-        default_fmt = workbook.add_format({'border': 1})
-        title_fmt = workbook.add_format({'bold': True, 'font_size': 18})
-
-        # 상단 요약 정보 작성
-        worksheet.write(0, 0, f"◐ 서버 보안 취약점 점검 요약 보고서", title_fmt)
-        worksheet.write(2, 0, "전체 점검 건수"); worksheet.write(2, 1, f"{total_val} 건")
-        worksheet.write(2, 2, "점검 이행률"); worksheet.write(2, 3, pass_rate)
-        worksheet.write(3, 0, "취약 항목(FAIL)"); worksheet.write(3, 1, f"{fail_val} 건")
-        worksheet.write(3, 2, "점검 일시"); worksheet.write(3, 3, datetime.now().strftime('%Y-%m-%d %H:%M'))
-
-        # 데이터 본문 작성
-        for col_num, value in enumerate(report_df.columns.values):
-            worksheet.write(7, col_num, value, header_fmt)
-            
-        for row_num in range(len(report_df)):
-            current_row = row_num + 8
-            for col_num in range(len(report_df.columns)):
-                cell_value = report_df.iloc[row_num, col_num]
-                
-                # [수정] 엑셀 쓰기 전 값이 숫자인지 체크하여 NaN이면 빈 문자열 처리
-                if pd.isna(cell_value): cell_value = ""
-                
-                fmt = default_fmt
-                if col_num == 4: # '상태' 컬럼 서식
-                    fmt = pass_cell_fmt if cell_value == '양호' else fail_cell_fmt
-                
-                worksheet.write(current_row, col_num, cell_value, fmt)
+# --- 4. 메인 데이터 로드 및 사이드바 ---
+# 플레이북은 백그라운드 작업 큐에서 실행 (세션 멈춤/중복 실행 방지)
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(max_workers=2)
+
+job_runner = get_job_runner()
+JOB_STATUS_LABEL = {"queued": "⏳ 대기", "running": "🔄 실행 중", "done": "✔️ 완료", "failed": "❌ 실패"}
+
+@st.fragment(run_every=2 if job_runner.has_active() else None)
+def draw_job_status():
+    jobs = job_runner.jobs(limit=5)
+    if jobs:
+        st.markdown("#### 📋 작업 현황")
+    for job in jobs:
+        title = f"{JOB_STATUS_LABEL.get(job['status'], job['status'])} · {job['playbook']} · {job['limit']}"
+        if job['target_id']:
+            title += f" · {job['target_id']}"
+        st.caption(f"{title} ({job['elapsed']}s)")
+        if job['status'] == "running" and job['current_task']:
+            st.caption(f"　└ {job['current_task']}")
+        for host, c in job['hosts'].items():
+            st.caption(f"　└ {host}: 완료 {c['ok'] + c['changed']} / 실패 {c['failed']} / 건너뜀 {c['skipped']}")
+
+    # 작업이 끝나면 결과를 다시 읽도록 전체 화면 갱신
+    if st.session_state.get("seen_finished_jobs", job_runner.finished_count) != job_runner.finished_count:
+        st.session_state["seen_finished_jobs"] = job_runner.finished_count
+        st.rerun()
+    st.session_state["seen_finished_jobs"] = job_runner.finished_count
+
+# 플레이북이 결과 파일을 쓰면 버튼 없이도 화면 갱신 (일지 순번만 비교하므로 가벼움)
+@st.fragment(run_every=2)
+def draw_live_refresh():
+    watcher = get_result_watcher()
+    st.caption(f"🟢 결과 실시간 반영 ({watcher.mode})")
+    if st.session_state.setdefault("seen_result_seq", watcher.seq) != watcher.seq:
+        st.session_state["seen_result_seq"] = watcher.seq
+        st.rerun()
 
-        worksheet.set_column('A:G', 22)
-        
-    return output.getvalue()
+# --- 4-1. 전체 서버 현황: 서버 x 항목 상태 행렬 (결과 반영 시 바뀐 서버 행만 갱신된 행렬을 그대로 사용) ---
+# 셀 코드 -> 표시 기호 (취약은 중요도별 색상)
+CELL_SYMBOLS = {MISSING: "", UNKNOWN: "⚪", PASS: "🟢", FAIL_LOW: "🟡", FAIL_MID: "🟠", FAIL_HIGH: "🔴"}
+SYMBOL_TABLE = np.array([CELL_SYMBOLS[code] for code in sorted(CELL_SYMBOLS)], dtype=object)
 
-# --- 4. 메인 데이터 로드 및 사이드바 ---
-df = load_all_data()
+def draw_fleet_matrix(matrix):
+    pivot = matrix.pivot()
+    st.markdown("### 🗺️ 전체 서버 현황")
+    if pivot.empty or pivot.shape[1] == 0:
+        st.info("💡 표시할 점검 결과가 없습니다.")
+        return
+
+    categories = list(dict.fromkeys(pivot.columns.get_level_values('category')))
+    col_cat, col_checks = st.columns([1, 2])
+    with col_cat:
+        category = st.selectbox("분류", ["전체"] + categories, key="fleet_category")
+    view = pivot if category == "전체" else pivot.loc[:, [c == category for c in pivot.columns.get_level_values('category')]]
+    check_ids = list(view.columns.get_level_values('check_id'))
+    with col_checks:
+        picked = st.multiselect("항목 (선택한 항목이 모두 취약한 서버만 표시)", check_ids, key="fleet_checks")
+    only_vuln = st.checkbox("취약 항목이 있는 서버만", key="fleet_only_vuln")
+
+    codes = view.to_numpy()
+    rows = np.ones(len(view), dtype=bool)
+    if picked:
+        picked_cols = [check_ids.index(c) for c in picked]
+        rows &= (codes[:, picked_cols] >= FAIL_LOW).all(axis=1)
+    fail_counts = (codes >= FAIL_LOW).sum(axis=1)
+    if only_vuln:
+        rows &= fail_counts > 0
+    codes = codes[rows]
+
+    grid = pd.DataFrame(SYMBOL_TABLE[codes - MISSING], index=view.index[rows], columns=check_ids)
+    grid.insert(0, "취약", fail_counts[rows])
+    st.caption(f"서버 {int(rows.sum())} / {len(view)}대 · 항목 {len(check_ids)}개 — "
+               "🔴 취약(상) 🟠 취약(중) 🟡 취약(하) 🟢 양호 ⚪ 미점검 · 빈칸: 결과 없음")
+    cat_of = dict(zip(view.columns.get_level_values('check_id'), view.columns.get_level_values('category')))
+    st.dataframe(
+        grid, use_container_width=True, height=min(38 + 35 * len(grid), 720),
+        column_config={c: st.column_config.TextColumn(c, help=cat_of[c], width="small") for c in check_ids},
+    )
+
+# --- 4-2. 지난 점검 대비 변경 (결과 DB 수집 시 만들어 둔 변경 기록만 읽음) ---
+def draw_changes(changes, view_key, show_host):
+    if changes.empty:
+        st.info("💡 지난 점검 대비 바뀐 항목이 없습니다.")
+        return
+    counts = changes['change'].value_counts()
+    kinds = [k for k in CHANGE_KINDS if k in counts]
+    picked = st.multiselect(
+        "변경 유형", kinds, default=kinds, format_func=lambda k: f"{CHANGE_LABELS[k]} ({counts[k]})",
+        key=f"{view_key}_change_kinds"
+    )
+    shown = changes[changes['change'].isin(picked)].copy()
+    shown['change'] = shown['change'].map(CHANGE_LABELS)
+    status_label = {'PASS': '양호', 'FAIL': '취약'}
+    shown['prev_status'] = shown['prev_status'].map(status_label).fillna('미점검')
+    shown['status'] = shown['status'].map(status_label).fillna('미점검')
+    columns = ['host'] if show_host else []
+    columns += ['check_id', 'title', 'importance', 'change', 'prev_status', 'status', 'prev_date', 'check_date']
+    headers = ['서버'] if show_host else []
+    headers += ['항목ID', '점검항목', '중요도', '변경', '이전 상태', '현재 상태', '이전 점검', '현재 점검']
+    table = shown[columns]
+    table.columns = headers
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    # 점검 결과/파일 해시가 바뀐 항목은 고른 1건만 이전 값과 나란히 표시 (expander 안에서도 쓰므로 중첩 없이)
+    detail = shown[(shown['evidence_changed'] == 1) | (shown['hash_changed'] == 1)]
+    if detail.empty:
+        return
+    labels = {i: f"{row['host'] + ' · ' if show_host else ''}{row['check_id']} {row['title']} — {row['change']}"
+              for i, row in detail.iterrows()}
+    choice = st.selectbox("이전 값과 비교", list(labels), format_func=labels.get, key=f"{view_key}_change_detail")
+    row = detail.loc[choice]
+    for col, label, date, file_hash, evidence in zip(
+        st.columns(2), ["이전", "현재"], [row['prev_date'], row['check_date']],
+        [row['prev_hash'], row['file_hash']], [row['prev_evidence'], row['evidence']],
+    ):
+        with col:
+            st.caption(f"{label} ({date})")
+            if row['hash_changed']:
+                st.code(file_hash or "-", language=None)
+            if row['evidence_changed']:
+                st.code(evidence or "-", language=None)
+
+# 이번 실행 동안은 처음 받은 스냅샷만 사용 (도중에 교체되어도 화면이 섞이지 않음)
+snapshot = load_snapshot()
+df = snapshot.frame
 
 with st.sidebar:
     st.markdown("## 🛡️ 제어 센터")
+    page = st.radio("화면", ["🖥️ 서버 상세", "🗺️ 전체 서버 현황"], key="page_mode", label_visibility="collapsed")
     
     # 전 서버 점검 버튼
     if st.button("🔍 전 서버 점검", key="sidebar_scan", use_container_width=True):
-        with st.spinner("🚀 전체 서버 보안 점검 중..."):
-            subprocess.run(["ansible-playbook", "-i", "hosts", "run_audit.yml"])
+        job_runner.submit("run_audit.yml")
         st.rerun()
 
     st.divider()
@@ -230,7 +301,7 @@ with st.sidebar:
     # 기본 서버 리스트 설정
     base_servers = ["Rocky9", "Rocky10"]
     # 실제 ./results 폴더에 있는 서버 이름들 추출 (없으면 빈 리스트)
-    existing_servers = df['target'].unique().tolist() if not df.empty else []
+    existing_servers = snapshot.hosts()
     # 기본 리스트와 실제 리스트를 합친 후 중복 제거 + 역순 정렬 (Rocky9 우선)
     server_list = sorted(list(set(base_servers + existing_servers)), reverse=True)
     # 이제 항상 Rocky9, Rocky10이 모두 들어있는 리스트가 보입니다.
@@ -238,62 +309,75 @@ with st.sidebar:
 
     
     if st.button(f"⚡ {selected_target} 서버만 점검", key="single_server_scan", use_container_width=True):
-        with st.spinner(f"🔍 {selected_target} 보안 점검 중..."):
-            subprocess.run(["ansible-playbook", "-i", "hosts", "run_audit.yml", "--limit", selected_target])
-        st.success(f"✔️ {selected_target} 점검이 완료되었습니다!")
-        time.sleep(1) 
+        job_runner.submit("run_audit.yml", limit=selected_target)
         st.rerun()
+
+    # 여러 서버/항목을 골라 플레이북 1회로 조치 (서버 간 병렬, 서버 안에서는 의존 순서대로)
+    fail_options = snapshot.fail_items()
+    if fail_options:
+        with st.expander(f"🧰 일괄 조치 (취약 {len(fail_options)}건)"):
+            # 위젯 값은 생성 전에만 바꿀 수 있으므로 제출 후 초기화는 다음 실행에서 처리
+            if st.session_state.pop("batch_fix_reset", False):
+                st.session_state["batch_fix_items"] = []
+                st.session_state["batch_fix_approved"] = False
+            batch_items = st.multiselect(
+                "조치할 항목", fail_options, format_func=lambda item: f"{item[0]} · {item[1]}", key="batch_fix_items"
+            )
+            batch_approved = st.checkbox("운영 영향도 검토 및 보안 담당자의 최종 승인 완료", key="batch_fix_approved")
+            if st.button(f"✅ {len(batch_items)}건 일괄 조치", key="batch_fix_run", type="primary",
+                         use_container_width=True, disabled=not (batch_items and batch_approved)):
+                job, missing = job_runner.submit_fix_batch(batch_items)
+                st.session_state["batch_fix_missing"] = missing
+                st.session_state["batch_fix_reset"] = True
+                st.rerun()
+            for host, check_id in st.session_state.get("batch_fix_missing", []):
+                st.caption(f"⚠️ {host} · {check_id}: 조치 스크립트 없음 (제외)")
+
+    draw_job_status()
+    draw_live_refresh()
+
+    # 해석하지 못한 결과 파일은 건너뛰되 건수와 사유를 표시
+    parse_errors = get_result_source().parse_errors()
+    if parse_errors:
+        with st.expander(f"⚠️ 결과 파일 해석 실패 {len(parse_errors)}건"):
+            for path, reason in parse_errors:
+                st.caption(f"{os.path.basename(path)}: {reason}")
     
     st.divider()
 
     # 보고서 다운로드와 메인 화면 중단 로직
     if not df.empty:
-        target_df = df[df['target'] == selected_target].reset_index(drop=True)
-        st.download_button("📊 보고서 다운로드", to_excel(target_df), f"Report_{selected_target}.xlsx", use_container_width=True)
+        target_df = snapshot.host_view(selected_target)
+        host_report = build_host_report(selected_target, snapshot.fingerprint(selected_target), target_df)
+        st.download_button("📊 보고서 다운로드", host_report, f"Report_{selected_target}.xlsx", use_container_width=True)
+
+        # 전 서버 통합 보고서는 요청한 경우에만 생성
+        if st.button("🌐 전 서버 통합 보고서 준비", key="fleet_report_prepare", use_container_width=True):
+            st.session_state["fleet_report_requested"] = True
+        if st.session_state.get("fleet_report_requested"):
+            with st.spinner("📦 통합 보고서 생성 중..."):
+                fleet_report = build_fleet_report((type(get_result_source()).__name__, snapshot.version), df)
+            st.download_button("📥 통합 보고서 다운로드", fleet_report, "Report_Fleet.xlsx", use_container_width=True)
     else:
         
         st.stop()
 
-# --- 5. 보안 지표 계산 ---
-
-def get_metrics(data):
-
-    # 1. 가중치 설정 (상:5, 중:3, 하:1)
-    weights = {'상': 5, '중': 3, '하': 1}
-    data['weight'] = data['importance'].map(lambda x: weights.get(x, 1))
-    
-    # 2. 점수 계산 (가중치 적용 비율)
-    total_w = data['weight'].sum()
-    pass_w = data[data['status'] == 'PASS']['weight'].sum()
-    score = (pass_w / total_w * 100) if total_w > 0 else 0
-    
-    # 3. [수정] 보안 양호도 등급 판별 로직
-    if score >= 90:
-        grade = "우수"
-    elif score >= 80:
-        grade = "양호"
-    elif score >= 70:
-        grade = "보통"
-    elif score >= 60:
-        grade = "미흡"
-    else:
-        grade = "취약"
-        
-    # 4. 취약 항목 수 및 무결성 점수 계산
-    vuln_count = len(data[data['status'] != 'PASS'])
-    
-    # file_hash가 비어있지 않은 항목들로 무결성 체크
-    integrity_items = data[data.get('file_hash', 'N/A') != "N/A"]
-    if not integrity_items.empty:
-        integrity = (len(integrity_items[integrity_items['status'] == 'PASS']) / len(integrity_items) * 100)
-    else:
-        integrity = score # 데이터가 없으면 전체 점수와 동기화
-        
-    return score, grade, vuln_count, integrity
+if page == "🗺️ 전체 서버 현황":
+    draw_fleet_matrix(get_result_source().status_matrix())
+    if hasattr(get_result_source(), "changes"):
+        st.markdown("### 🔀 지난 점검 대비 변경")
+        draw_changes(get_result_source().changes(), "fleet", show_host=True)
+    st.stop()
 
-# ---------------------------------------------------------
+# --- 5. 보안 지표 계산 (metrics.get_metrics) ---
 
-score, grade, vuln_count, integrity = get_metrics(target_df)
+# 결과 수집 시 계산해 둔 서버 지표를 그대로 읽음 (없을 때만 즉석 계산)
+host_metrics = get_result_source().host_metrics(selected_target)
+if host_metrics is not None:
+    score, grade = host_metrics['score'], host_metrics['grade']
+    vuln_count, integrity = host_metrics['vuln_count'], host_metrics['integrity']
+else:
+    score, grade, vuln_count, integrity = get_metrics(target_df)
 
 # 2. 계산된 grade에 맞춰 색상을 결정합니다.
 color_map = {
@@ -325,57 +409,210 @@ st.markdown(f"""
     </div>
 """, unsafe_allow_html=True)
 
+# --- 6-1. 보안 점수 추이 (결과 DB 의 점수 이력: 최근 30일은 점검 단위, 그 이전은 일 요약) ---
+TREND_PERIODS = {"최근 30일": 30, "최근 90일": 90, "최근 1년": 365, "전체": None}
+
+result_source = get_result_source()
+if hasattr(result_source, "score_trend"):
+    with st.expander("📈 보안 점수 추이"):
+        period = st.radio("기간", list(TREND_PERIODS), horizontal=True, key="trend_period", label_visibility="collapsed")
+        trend = result_source.score_trend(selected_target, TREND_PERIODS[period])
+        if trend.empty:
+            st.info("💡 아직 쌓인 점수 이력이 없습니다.")
+        else:
+            score_chart = trend.set_index('date')[['score', 'score_min', 'score_max']]
+            score_chart.columns = ['점수', '최저', '최고']
+            st.line_chart(score_chart)
+            cat_trend = result_source.category_trend(selected_target, days=TREND_PERIODS[period])
+            if not cat_trend.empty:
+                st.markdown("##### 카테고리별 취약 건수")
+                fails = cat_trend.pivot_table(index='date', columns='category', values='fail', aggfunc='last')
+                st.line_chart(fails[order_categories(fails.columns)])
+
+# --- 6-2. 지난 점검 대비 변경 (결과 DB 사용 시) ---
+if hasattr(result_source, "changes"):
+    host_changes = result_source.changes(selected_target)
+    with st.expander(f"🔀 지난 점검 대비 변경 ({len(host_changes)}건)", expanded=not host_changes.empty):
+        draw_changes(host_changes, "host", show_host=False)
+
 tab_os, tab_db = st.tabs(["💻 리눅스 서버 보안", "🗄️ 데이터베이스 보안"])
 
 # --- 7. 카드 렌더링 함수 ---
-def draw_security_cards(data):
+CARDS_PER_PAGE = 10
+
+# 카테고리 헤더에 겹치는 expander 스타일은 카테고리마다가 아니라 페이지당 1회만 주입
+st.markdown("""
+    <style>
+    div[data-testid="stExpander"] {
+        border: none !important;
+        background: transparent !important;
+        box-shadow: none !important;
+        margin-top: -72px !important; 
+        padding: 0 !important;
+    }
+    div[data-testid="stExpander"] > details {
+        border: none !important;
+        box-shadow: none !important;
+    }
+    div[data-testid="stExpander"] details[open] > div {
+        border: none !important;
+        padding-top: 20px !important;
+    }
+    div[data-testid="stExpander"] summary {
+        height: 72px !important;
+        color: transparent !important;
+        list-style: none !important;
+        padding: 0 !important;
+    }
+    div[data-testid="stExpander"] summary::-webkit-details-marker {
+        display: none !important;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+def draw_item_card(row):
+    # 변수 가져오기 및 display_text 결정
+    action_result = row.get('action_result', '')
+    action_log = row.get('action_log', '')
+    evidence = row.get('evidence', '')
+    is_pass = row['status'] == 'PASS'
+
+    if is_pass:
+        card_cls = "border-pass"
+    else:
+        card_cls = "border-vulnerable"
+
+    # 3. 디스플레이 텍스트 결정 (우선순위: 조치로그 > 점검증거)
+    if action_result == 'SUCCESS' and action_log:
+        display_text = action_log
+    elif evidence:
+        display_text = evidence
+    else:
+        display_text = "상세 데이터가 없습니다."
+
+    # [수정] 점검 결과 포맷팅: 단순 정직하게 ". " 기준으로 분리
+    if display_text and display_text != "상세 데이터가 없습니다.":
+        sentences = display_text.split(". ")
+        formatted_text = ""
+        count = 1
+        for s in sentences:
+            s = s.strip()
+            if not s: continue 
+
+            # 마침표가 없다면 복구
+            if not s.endswith("."):
+                s += "."
+
+            if count == 1:
+                formatted_text += f"{count}.&nbsp; {s}<br>"
+            else:
+                formatted_text += f"{count}. {s}<br>"
+            count += 1
+
+        if formatted_text:
+            display_text = formatted_text
+
+
+    # 가이드/알림 박스
+    guide_html = ""
+
+    # 일반 취약 상태인 경우 (빨간색)
+    if not is_pass:
+        formatted_guide = row["guide"].replace("2. ", "<br>2. ").replace("3. ", "<br>3. ")
+        guide_html = f'<div style="background:#FFF5F5; padding:18px; border-radius:12px; border:1px solid #FED7D7; margin-top:15px; color:#C53030;">💡 <b>조치 가이드:</b> <br>{formatted_guide}</div>'
+
+    # 조치 완료 상태인 경우 (초록색)
+    elif row.get('action_result') == 'SUCCESS':
+        guide_html = f'<div style="background:#F0FDF4; padding:18px; border-radius:12px; border:1px solid #BBF7D0; margin-top:15px; color:#15803D;">✅ <b>조치 완료:</b> {row["guide"]}</div>'
+
+
+    # 메인 카드 출력 
+    st.markdown(f"""
+        <div class="item-card {card_cls}">
+            <div style="display: flex; justify-content: space-between; align-items: flex-start;">
+                <div>
+                    <span class="badge">중요도: {row['importance']}</span>
+                    <span class="badge">ISMS-P 2.1.2</span>
+                    <h2 style="margin: 15px 0; font-size: 1.6rem; letter-spacing:-0.5px;">
+                        {row['check_id']} {row['title']}
+                    </h2>
+                    <p style="font-size: 1.1rem; color: #475569; line-height: 1.6;">
+                        🔍 <b>점검 결과:</b><br>
+                        <span style="display: block; margin-top: 5px;">{display_text}</span>
+                    </p>
+                </div>
+                <div class="{'status-secure' if is_pass else 'status-vulnerable'}">
+                    ● {'양호' if is_pass else '취약'}
+                </div>
+            </div>
+            {guide_html}
+        </div>
+    """, unsafe_allow_html=True)
+
+    if not is_pass:
+        # 현재 항목이 조치 모드인지 확인
+        is_fixing = st.session_state.get(f"confirm_{row['check_id']}", False)
+
+        if not is_fixing:
+            if st.button(f"⚡ {row['check_id']} 조치 프로세스 시작", key=f"pre_fix_{row['check_id']}", use_container_width=True):
+                st.session_state[f"confirm_{row['check_id']}"] = True
+                st.rerun()
+
+        else:
+            impact_text = row.get('action_impact', '일반적인 경우 영향이 없습니다.')
+            impact_level = row.get('impact_level', 'LOW')
+
+            # 영향도 안내 UI (사용자가 안심할 수 있게 시각화)
+            if impact_level == "LOW":
+                st.markdown(f"""
+                    <div style="background-color: #F0FDF4; padding: 16px; border-radius: 8px; border: 1px solid #BBF7D0; margin-bottom: 20px;">
+                        <div style="display: flex; align-items: center; margin-bottom: 8px;">
+                            <span style="background-color: #22C55E; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: bold; margin-right: 10px;">SAFE</span>
+                            <b style="color: #166534; font-size: 1.05rem;">🛡️ 안전한 조치 안내</b>
+                        </div>
+                        <p style="margin: 0; color: #166534; line-height: 1.6;">{impact_text}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                    <div style="background-color: #FFFBEB; padding: 16px; border-radius: 8px; border: 1px solid #FDE68A; margin-bottom: 20px;">
+                        <div style="display: flex; align-items: center; margin-bottom: 8px;">
+                            <span style="background-color: #F59E0B; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: bold; margin-right: 10px;">CAUTION</span>
+                            <b style="color: #92400E; font-size: 1.05rem;">⚠️ 조치 시 주의사항</b>
+                        </div>
+                        <p style="margin: 0; color: #92400E; line-height: 1.6;">{impact_text}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+
+            # 3. 승인 안내 문구 (버튼 바로 위로 이동)
+            st.info("💡 **운영 영향도 검토 및 보안 담당자의 최종 승인**을 완료하셨습니까?")
+
+            c1, c2 = st.columns(2)
+            with c1:
+                if st.button("✅ 승인 완료 (실행)", key=f"final_fix_{row['check_id']}", type="primary", use_container_width=True):
+                    # 앤서블 실행은 작업 큐로 넘기고 진행 상황은 사이드바 작업 현황에서 확인
+                    job_runner.submit("run_fix.yml", limit=selected_target, target_id=row['check_id'].replace('-',''))
+                    st.session_state[f"confirm_{row['check_id']}"] = False
+                    st.rerun()
+            with c2:
+                if st.button("❌ 취소", key=f"cancel_{row['check_id']}", use_container_width=True):
+                    st.session_state[f"confirm_{row['check_id']}"] = False
+                    st.rerun()
+        st.markdown('</div>', unsafe_allow_html=True)
+
+def draw_security_cards(data, view_key):
     if data.empty:
         st.info("💡 해당하는 점검 항목이 없습니다.")
         return
 
-    category_order = [
-        "계정 관리",           # 1_account
-        "파일 및 디렉터리 관리", # 2_directory
-        "서비스 관리",         # 3_service
-        "패치 관리",           # 4_patch
-        "로그 관리"            # 5_log
-    ]
-
-    # 2. 카테고리 표기를 정규화해 동일한 그룹으로 처리
-    alias_map = {
-        "계정관리": "계정 관리",
-        "파일및디렉토리관리": "파일 및 디렉터리 관리",
-        "파일및디렉터리관리": "파일 및 디렉터리 관리",
-        "서비스관리": "서비스 관리",
-        "패치관리": "패치 관리",
-        "로그관리": "로그 관리"
-    }
+    # 기본은 가벼운 요약 표, 상세 카드는 선택 시 페이지 단위로만 렌더링
+    view_mode = st.radio(
+        "표시 방식", ["📋 요약 표", "🗂️ 상세 카드"], horizontal=True,
+        key=f"{view_key}_view_mode", label_visibility="collapsed"
+    )
 
-    def normalize_category(category_value):
-        raw = str(category_value).strip()
-        compact = raw.replace(" ", "")
-        return alias_map.get(compact, raw)
-
-    data = data.copy()
-    data["category_display"] = data["category"].map(normalize_category)
-
-    # 3. 실제 데이터의 카테고리를 기준 리스트 순서에 맞게 정렬
-    unique_cats = data["category_display"].unique()
-    existing_cats = [cat for cat in category_order if cat in unique_cats]
-    other_cats = sorted([cat for cat in unique_cats if cat not in category_order])
-    final_cats = existing_cats + other_cats
-
-    # 4. sorted(...) 대신 위에서 만든 final_cats로 루프 돌리기
-    for cat in final_cats:
-        # [수정] 항목 정렬 로직: U-숫자 형식에서 숫자만 추출하여 정렬
-        # 예: U-1 -> 1, U-10 -> 10 (문자열 정렬 시 U-1, U-10, U-2 순서 되는 문제 해결)
-        cat_items = data[data['category_display'] == cat].sort_values(
-            by='check_id',
-            key=lambda x: pd.to_numeric(x.astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(9999)
-        ).reset_index(drop=True)
-
-        fail_count = len(cat_items[cat_items['status'] == 'FAIL'])
-        
+    # 카테고리는 기준 리스트 순서, 항목은 U-숫자 번호 순 (metrics.group_by_category)
+    for cat, cat_items, fail_count in group_by_category(data):
         border_color = "#EF4444" if fail_count > 0 else "#10B981"
         bg_color = "#FFF5F5" if fail_count > 0 else "#F0FDF4"
         text_color = "#C53030" if fail_count > 0 else "#15803D"
@@ -383,33 +620,6 @@ def draw_security_cards(data):
         status_label = f"취약 {fail_count}건" if fail_count > 0 else "보안 양호"
 
         st.markdown(f"""
-            <style>
-            div[data-testid="stExpander"] {{
-                border: none !important;
-                background: transparent !important;
-                box-shadow: none !important;
-                margin-top: -72px !important; 
-                padding: 0 !important;
-            }}
-            div[data-testid="stExpander"] > details {{
-                border: none !important;
-                box-shadow: none !important;
-            }}
-            div[data-testid="stExpander"] details[open] > div {{
-                border: none !important;
-                padding-top: 20px !important;
-            }}
-            div[data-testid="stExpander"] summary {{
-                height: 72px !important;
-                color: transparent !important;
-                list-style: none !important;
-                padding: 0 !important;
-            }}
-            div[data-testid="stExpander"] summary::-webkit-details-marker {{
-                display: none !important;
-            }}
-            </style>
-            
             <div style="
                 background-color: white; 
                 padding: 18px 25px; 
@@ -436,143 +646,29 @@ def draw_security_cards(data):
         with st.expander("", expanded=False):
             # 카드가 닫혀있을 땐 아무것도 안 보이고, 열릴 때만 아래 패딩 추가
             st.markdown("<div style='height: 15px;'></div>", unsafe_allow_html=True)
-            for i, row in cat_items.iterrows():
-                # 변수 가져오기 및 display_text 결정
-                action_result = row.get('action_result', '')
-                action_log = row.get('action_log', '')
-                evidence = row.get('evidence', '')
-                is_pass = row['status'] == 'PASS'
-
-                if is_pass:
-                    card_cls = "border-pass"
-                else:
-                    card_cls = "border-vulnerable"
-                
-                # 3. 디스플레이 텍스트 결정 (우선순위: 조치로그 > 점검증거)
-                if action_result == 'SUCCESS' and action_log:
-                    display_text = action_log
-                elif evidence:
-                    display_text = evidence
-                else:
-                    display_text = "상세 데이터가 없습니다."
-
-                # [수정] 점검 결과 포맷팅: 단순 정직하게 ". " 기준으로 분리
-                if display_text and display_text != "상세 데이터가 없습니다.":
-                    sentences = display_text.split(". ")
-                    formatted_text = ""
-                    count = 1
-                    for s in sentences:
-                        s = s.strip()
-                        if not s: continue 
-                            
-                        # 마침표가 없다면 복구
-                        if not s.endswith("."):
-                            s += "."
-                        
-                        if count == 1:
-                            formatted_text += f"{count}.&nbsp; {s}<br>"
-                        else:
-                            formatted_text += f"{count}. {s}<br>"
-                        count += 1
-                        
-                    if formatted_text:
-                        display_text = formatted_text
-                        
+            if view_mode == "📋 요약 표":
+                summary = cat_items[['check_id', 'title', 'importance', 'status']].copy()
+                summary['status'] = summary['status'].map({'PASS': '양호', 'FAIL': '취약'}).fillna('미점검')
+                summary.columns = ['항목ID', '점검항목', '중요도', '상태']
+                st.dataframe(summary, hide_index=True, use_container_width=True)
+            else:
+                # 상세 카드는 현재 페이지 항목만 그림
+                total_pages = max(1, math.ceil(len(cat_items) / CARDS_PER_PAGE))
+                page = 1
+                if total_pages > 1:
+                    page = st.selectbox(
+                        f"페이지 (총 {total_pages})", list(range(1, total_pages + 1)),
+                        key=f"{view_key}_page_{cat}"
+                    )
+                page_items = cat_items.iloc[(page - 1) * CARDS_PER_PAGE: page * CARDS_PER_PAGE]
+                for _, row in page_items.iterrows():
+                    draw_item_card(row)
 
-                # 가이드/알림 박스
-                guide_html = ""
-                
-                # 일반 취약 상태인 경우 (빨간색)
-                if not is_pass:
-                    formatted_guide = row["guide"].replace("2. ", "<br>2. ").replace("3. ", "<br>3. ")
-                    guide_html = f'<div style="background:#FFF5F5; padding:18px; border-radius:12px; border:1px solid #FED7D7; margin-top:15px; color:#C53030;">💡 <b>조치 가이드:</b> <br>{formatted_guide}</div>'
-                
-                # 조치 완료 상태인 경우 (초록색)
-                elif row.get('action_result') == 'SUCCESS':
-                    guide_html = f'<div style="background:#F0FDF4; padding:18px; border-radius:12px; border:1px solid #BBF7D0; margin-top:15px; color:#15803D;">✅ <b>조치 완료:</b> {row["guide"]}</div>'
-               
-
-                # 메인 카드 출력 
-                st.markdown(f"""
-                    <div class="item-card {card_cls}">
-                        <div style="display: flex; justify-content: space-between; align-items: flex-start;">
-                            <div>
-                                <span class="badge">중요도: {row['importance']}</span>
-                                <span class="badge">ISMS-P 2.1.2</span>
-                                <h2 style="margin: 15px 0; font-size: 1.6rem; letter-spacing:-0.5px;">
-                                    {row['check_id']} {row['title']}
-                                </h2>
-                                <p style="font-size: 1.1rem; color: #475569; line-height: 1.6;">
-                                    🔍 <b>점검 결과:</b><br>
-                                    <span style="display: block; margin-top: 5px;">{display_text}</span>
-                                </p>
-                            </div>
-                            <div class="{'status-secure' if is_pass else 'status-vulnerable'}">
-                                ● {'양호' if is_pass else '취약'}
-                            </div>
-                        </div>
-                        {guide_html}
-                    </div>
-                """, unsafe_allow_html=True)
-                
-                if not is_pass:
-                    # 현재 항목이 조치 모드인지 확인
-                    is_fixing = st.session_state.get(f"confirm_{row['check_id']}", False)
-
-                    if not is_fixing:
-                        if st.button(f"⚡ {row['check_id']} 조치 프로세스 시작", key=f"pre_fix_{row['check_id']}", use_container_width=True):
-                            st.session_state[f"confirm_{row['check_id']}"] = True
-                            st.rerun()
-
-                    else:
-                        impact_text = row.get('action_impact', '일반적인 경우 영향이 없습니다.')
-                        impact_level = row.get('impact_level', 'LOW')
-      
-                        # 영향도 안내 UI (사용자가 안심할 수 있게 시각화)
-                        if impact_level == "LOW":
-                            st.markdown(f"""
-                                <div style="background-color: #F0FDF4; padding: 16px; border-radius: 8px; border: 1px solid #BBF7D0; margin-bottom: 20px;">
-                                    <div style="display: flex; align-items: center; margin-bottom: 8px;">
-                                        <span style="background-color: #22C55E; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: bold; margin-right: 10px;">SAFE</span>
-                                        <b style="color: #166534; font-size: 1.05rem;">🛡️ 안전한 조치 안내</b>
-                                    </div>
-                                    <p style="margin: 0; color: #166534; line-height: 1.6;">{impact_text}</p>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        else:
-                            st.markdown(f"""
-                                <div style="background-color: #FFFBEB; padding: 16px; border-radius: 8px; border: 1px solid #FDE68A; margin-bottom: 20px;">
-                                    <div style="display: flex; align-items: center; margin-bottom: 8px;">
-                                        <span style="background-color: #F59E0B; color: white; padding: 2px 8px; border-radius: 4px; font-size: 0.75rem; font-weight: bold; margin-right: 10px;">CAUTION</span>
-                                        <b style="color: #92400E; font-size: 1.05rem;">⚠️ 조치 시 주의사항</b>
-                                    </div>
-                                    <p style="margin: 0; color: #92400E; line-height: 1.6;">{impact_text}</p>
-                                </div>
-                            """, unsafe_allow_html=True)
-
-                        # 3. 승인 안내 문구 (버튼 바로 위로 이동)
-                        st.info("💡 **운영 영향도 검토 및 보안 담당자의 최종 승인**을 완료하셨습니까?")
-                        
-                        c1, c2 = st.columns(2)
-                        with c1:
-                            if st.button("✅ 승인 완료 (실행)", key=f"final_fix_{row['check_id']}", type="primary", use_container_width=True):
-                                with st.spinner(f"🛠️ {row['check_id']} 조치 중..."):
-                                    # 앤서블 실행
-                                    subprocess.run(["ansible-playbook", "-i", "hosts", "run_fix.yml", "-e", f"target_id={row['check_id'].replace('-','')}", "--limit", selected_target])
-                                    time.sleep(1)
-                                st.success(f"✔️ {row['check_id']} 조치 완료!")
-                                st.session_state[f"confirm_{row['check_id']}"] = False
-                                st.rerun()
-                        with c2:
-                            if st.button("❌ 취소", key=f"cancel_{row['check_id']}", use_container_width=True):
-                                st.session_state[f"confirm_{row['check_id']}"] = False
-                                st.rerun()
-                    st.markdown('</div>', unsafe_allow_html=True)
 
 with tab_os:
     # selected_target 변수를 사용하여 현재 선택된 서버 이름(Rocky9 등)이 제목에 표시됩니다.
     st.markdown(f"### 💻 {selected_target} 보안 점검 결과")
-    draw_security_cards(target_df[target_df['db_type'] == "OS"])
+    draw_security_cards(snapshot.host_view(selected_target, ("OS",)), "os")
 
 with tab_db:
     if "Rocky9" in selected_target:
@@ -585,9 +681,9 @@ with tab_db:
     st.markdown(f"### 🗄️ {db_label} 보안 점검 결과")
     
     # DB 관련 데이터(D-로 시작하는 항목) 필터링해서 출력
-    db_items = target_df[target_df['db_type'].isin(["MySQL", "PostgreSQL"])]
+    db_items = snapshot.host_view(selected_target, ("MySQL", "PostgreSQL"))
     
     if db_items.empty:
         st.info("💡 해당하는 점검 항목이 없습니다.")
     else:
-        draw_security_cards(db_items)
+        draw_security_cards(db_items, "db")
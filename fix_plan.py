@@ -0,0 +1,143 @@
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+
+# --- 일괄 조치 계획 ---
+# 대시보드에서 고른 (서버, 항목) 목록을 run_fix_batch.yml 이 그대로 실행할 계획으로 만든다.
+#   {"fix_plan": {"<host>": [{"id": "U-05", "fix": "<fix 스크립트>", "check": "<check 스크립트>"}, ...]}}
+# 조치 스크립트 탐색(find)은 플레이북이 항목마다 하지 않고 여기서 1회만 하며,
+# 같은 서버 안의 실행 순서는 FIX_DEPENDENCIES 를 지키고 나머지는 분류 폴더 -> 항목 번호 순이다.
+
+DEFAULT_SCRIPT_ROOTS = ("./scripts/unix",)
+
+# 조치 선후 관계: 키 항목은 값 항목들이 (같이 선택된 경우) 끝난 뒤 실행
+FIX_DEPENDENCIES = {
+    # 불필요 계정 삭제(U-07) 후 남은 계정 기준으로 UID/쉘/그룹 정리
+    "U-05": ("U-07",),
+    "U-08": ("U-07",),
+    "U-09": ("U-07",),
+    "U-10": ("U-07",),
+    "U-11": ("U-07",),
+    # 계정 조치(usermod/userdel)가 passwd/shadow 를 다시 쓰므로 파일 소유자·권한 조치는 그 뒤
+    "U-16": ("U-05", "U-07", "U-10", "U-11"),
+    "U-18": ("U-05", "U-07", "U-10", "U-11"),
+    # 같은 PAM 파일(system-auth/password-auth)을 고치는 항목은 복잡성 -> 잠금 -> 해시 알고리즘 순
+    "U-03": ("U-02",),
+    "U-13": ("U-02", "U-03"),
+    # 홈 디렉터리 생성(U-32) 후 소유자/권한(U-31)
+    "U-31": ("U-32",),
+    # Telnet 비활성화(U-52) 후 root 원격 접속 제한(U-01)
+    "U-01": ("U-52",),
+}
+
+SCRIPT_NAME = re.compile(r'^(fix|check)_([A-Za-z]+)-?(\d+)\.sh$')
+
+
+class PlanError(ValueError):
+    """계획을 만들 수 없는 입력 (순환 의존 등)."""
+
+
+def normalize_id(check_id):
+    # U05 / U-05 / u-5 -> U-05
+    m = re.match(r'^\s*([A-Za-z]+)-?(\d+)\s*$', str(check_id))
+    if not m:
+        raise PlanError(f"invalid check_id: {check_id!r}")
+    return f"{m.group(1).upper()}-{int(m.group(2)):02d}"
+
+
+def index_scripts(roots=DEFAULT_SCRIPT_ROOTS):
+    """{check_id: {'fix': path, 'check': path, 'order': (분류 폴더, 번호)}} — 트리를 1회만 순회."""
+    index = {}
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in filenames:
+                m = SCRIPT_NAME.match(name)
+                if not m:
+                    continue
+                check_id = f"{m.group(2).upper()}-{int(m.group(3)):02d}"
+                entry = index.setdefault(check_id, {'order': (os.path.basename(dirpath), int(m.group(3)))})
+                # 플레이북 실행 위치와 무관하도록 절대 경로로 기록
+                entry.setdefault(m.group(1), os.path.abspath(os.path.join(dirpath, name)))
+    return index
+
+
+def order_items(check_ids, index):
+    """선택된 항목만 대상으로 FIX_DEPENDENCIES 위상 정렬 (동순위는 분류 폴더 -> 번호)."""
+    selected = set(check_ids)
+    after = {cid: {dep for dep in FIX_DEPENDENCIES.get(cid, ()) if dep in selected} for cid in selected}
+    waiting = {cid: len(deps) for cid, deps in after.items()}
+    ready = [(index[cid]['order'], cid) for cid, n in waiting.items() if n == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        _, cid = heapq.heappop(ready)
+        ordered.append(cid)
+        for other, deps in after.items():
+            if cid in deps:
+                waiting[other] -= 1
+                if waiting[other] == 0:
+                    heapq.heappush(ready, (index[other]['order'], other))
+    if len(ordered) != len(selected):
+        raise PlanError(f"circular fix dependency: {sorted(selected - set(ordered))}")
+    return ordered
+
+
+def build_plan(items, roots=DEFAULT_SCRIPT_ROOTS):
+    """items: [(host, check_id)] -> (plan, missing). missing 은 조치 스크립트가 없는 (host, check_id)."""
+    index = index_scripts(roots)
+    by_host, missing = {}, []
+    for host, check_id in items:
+        check_id = normalize_id(check_id)
+        if 'fix' not in index.get(check_id, {}):
+            missing.append((host, check_id))
+            continue
+        by_host.setdefault(host, set()).add(check_id)
+
+    plan = {}
+    for host in sorted(by_host):
+        plan[host] = [
+            {'id': cid, 'fix': index[cid]['fix'], 'check': index[cid].get('check', "")}
+            for cid in order_items(by_host[host], index)
+        ]
+    return plan, missing
+
+
+def write_plan(plan, path):
+    # ansible-playbook -e @<path> 로 넘길 변수 파일
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'fix_plan': plan}, f, ensure_ascii=False, indent=2)
+
+
+def parse_item(text):
+    host, sep, check_id = text.rpartition(':')
+    if not sep or not host:
+        raise argparse.ArgumentTypeError(f"expected <host>:<check_id>, got {text!r}")
+    return host, check_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="일괄 조치 계획(run_fix_batch.yml 변수 파일) 생성")
+    parser.add_argument("items", nargs="+", type=parse_item, help="<host>:<check_id> (예: Rocky9:U-05)")
+    parser.add_argument("--root", action="append", dest="roots", help="스크립트 폴더 (기본 ./scripts/unix)")
+    parser.add_argument("-o", "--output", default="./fix_plan.json")
+    args = parser.parse_args(argv)
+
+    try:
+        plan, missing = build_plan(args.items, args.roots or DEFAULT_SCRIPT_ROOTS)
+    except PlanError as e:
+        print(e, file=sys.stderr)
+        return 1
+    write_plan(plan, args.output)
+    for host, entries in plan.items():
+        print(f"{host}: {' -> '.join(entry['id'] for entry in entries)}")
+    for host, check_id in missing:
+        print(f"{host}:{check_id}: fix script not found", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
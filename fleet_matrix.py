@@ -0,0 +1,161 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from metrics import check_number_key, normalize_category, order_categories
+
+# --- 전체 서버 현황 (서버 x 항목 상태 행렬) ---
+# 서버를 하나씩 골라 보지 않고 "U-01 과 D-10 이 취약한 서버" 를 한 화면에서 보도록
+# 서버 x check_id 상태 코드를 행렬로 유지한다. 결과가 바뀐 서버의 행만 교체하므로
+# 1,000대 x 90항목이어도 화면은 만들어 둔 행렬을 그대로 쓴다.
+#   ResultLoader: 결과 반영 시 바뀐 서버 행만 갱신
+#   ResultStore : 수집 시 서버별 셀(host_status 테이블)을 저장, 대시보드는 revision 이 바뀐 서버만 다시 읽음
+
+# 셀 코드 (색상: 취약은 중요도별, 결과 없음은 빈칸)
+MISSING = -1
+UNKNOWN = 0         # 미점검/기타 상태
+PASS = 1
+FAIL_LOW = 2
+FAIL_MID = 3
+FAIL_HIGH = 4
+FAIL_CODES = {'하': FAIL_LOW, '중': FAIL_MID, '상': FAIL_HIGH}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS host_status (
+    host        TEXT PRIMARY KEY,
+    revision    INTEGER NOT NULL,
+    cells       TEXT NOT NULL
+);
+"""
+
+
+def cell_code(status, importance):
+    if status == 'PASS':
+        return PASS
+    if status == 'FAIL':
+        # 중요도가 없으면 가중치(metrics.IMPORTANCE_WEIGHTS)와 같이 '하' 로 취급
+        return FAIL_CODES.get(importance, FAIL_LOW)
+    return UNKNOWN
+
+
+def host_cells(frame):
+    """서버 1대의 최신 결과 -> {check_id: [셀 코드, 카테고리]}."""
+    if frame.empty:
+        return {}
+    importance = frame['importance'] if 'importance' in frame else pd.Series("", index=frame.index)
+    return {
+        check_id: [cell_code(status, imp), normalize_category(cat)]
+        for check_id, status, imp, cat in zip(frame['check_id'], frame['status'], importance, frame['category'])
+    }
+
+
+class StatusMatrix:
+    """서버 x 항목 셀 코드 행렬. 서버 단위로 행을 교체/삭제하고, pivot() 은 변경이 있을 때만 다시 만든다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}             # host -> 행 번호
+        self._cols = {}             # check_id -> 열 번호
+        self._categories = {}       # check_id -> 카테고리 (마지막으로 본 값)
+        self._codes = np.full((16, 16), MISSING, dtype=np.int8)
+        self._pivot = None
+        self.revision = 0           # 행렬이 바뀔 때마다 증가 (화면 캐시 키)
+
+    def _grow(self, rows, cols):
+        # 용량이 모자랄 때만 2배로 늘림 (서버/항목 추가 때마다 복사하지 않도록)
+        cap_rows, cap_cols = self._codes.shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+        grown = np.full((cap_rows if rows <= cap_rows else max(rows, cap_rows * 2),
+                         cap_cols if cols <= cap_cols else max(cols, cap_cols * 2)), MISSING, dtype=np.int8)
+        grown[:cap_rows, :cap_cols] = self._codes
+        self._codes = grown
+
+    def set_host(self, host, cells):
+        """서버 행을 cells({check_id: [코드, 카테고리]}) 로 교체한다."""
+        with self._lock:
+            for check_id, (_, category) in cells.items():
+                if check_id not in self._cols:
+                    self._cols[check_id] = len(self._cols)
+                self._categories[check_id] = category
+            row = self._rows.setdefault(host, len(self._rows))
+            self._grow(len(self._rows), len(self._cols))
+            self._codes[row, :] = MISSING
+            if cells:
+                cols = [self._cols[c] for c in cells]
+                self._codes[row, cols] = [code for code, _ in cells.values()]
+            self._pivot = None
+            self.revision += 1
+
+    def drop_host(self, host):
+        with self._lock:
+            row = self._rows.pop(host, None)
+            if row is None:
+                return
+            # 마지막 행을 빈 자리로 옮겨 행 번호를 연속으로 유지
+            last = len(self._rows)
+            if row != last:
+                moved = next(h for h, r in self._rows.items() if r == last)
+                self._codes[row, :] = self._codes[last, :]
+                self._rows[moved] = row
+            self._codes[last, :] = MISSING
+            self._pivot = None
+            self.revision += 1
+
+    def hosts(self):
+        with self._lock:
+            return sorted(self._rows)
+
+    def pivot(self):
+        """서버(이름 순) x (카테고리, check_id) 셀 코드 DataFrame. 카테고리는 기준 순서, 항목은 번호 순."""
+        with self._lock:
+            if self._pivot is not None:
+                return self._pivot
+            hosts = sorted(self._rows)
+            checks = pd.Series(list(self._cols))
+            if checks.empty:
+                self._pivot = pd.DataFrame(index=pd.Index(hosts, name='host'))
+                return self._pivot
+            categories = checks.map(self._categories)
+            numbers = check_number_key(checks)
+            rank = {cat: i for i, cat in enumerate(order_categories(categories))}
+            order = sorted(range(len(checks)), key=lambda i: (rank[categories[i]], numbers[i], checks[i]))
+            codes = self._codes[[self._rows[h] for h in hosts]][:, [self._cols[checks[i]] for i in order]]
+            # 모든 서버에서 결과가 사라진 항목은 열에서 뺀다
+            present = (codes != MISSING).any(axis=0)
+            codes, order = codes[:, present], [i for i, keep in zip(order, present) if keep]
+            columns = pd.MultiIndex.from_arrays(
+                [[categories[i] for i in order], [checks[i] for i in order]], names=['category', 'check_id']
+            )
+            self._pivot = pd.DataFrame(codes, index=pd.Index(hosts, name='host'), columns=columns)
+            return self._pivot
+
+
+# --- ResultStore 용: 수집 시 셀 저장, 조회 시 바뀐 서버만 반영 ---
+
+def record(conn, host, frame):
+    """서버 셀을 host_status 에 저장하고 revision 을 올린다 (호출자가 트랜잭션 관리)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO host_status (host, revision, cells) "
+        "VALUES (?, (SELECT COALESCE(MAX(revision), 0) + 1 FROM host_status), ?)",
+        (host, json.dumps(host_cells(frame), ensure_ascii=False)),
+    )
+
+
+def sync(conn, matrix, seen):
+    """host_status 에서 revision 이 바뀐 서버만 행렬에 반영한다. seen: {host: revision} (갱신됨)."""
+    revisions = dict(conn.execute("SELECT host, revision FROM host_status"))
+    changed = [host for host, revision in revisions.items() if seen.get(host) != revision]
+    for i in range(0, len(changed), 500):
+        chunk = changed[i:i + 500]
+        for host, cells in conn.execute(
+            f"SELECT host, cells FROM host_status WHERE host IN ({','.join('?' * len(chunk))})", chunk
+        ):
+            matrix.set_host(host, json.loads(cells))
+    for host in seen.keys() - revisions.keys():
+        matrix.drop_host(host)
+    seen.clear()
+    seen.update(revisions)
+    return len(changed)
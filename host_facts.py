@@ -0,0 +1,172 @@
+import os
+import tarfile
+
+# --- 호스트 팩트 번들 ---
+# scripts/collect_host_facts.sh 가 대상 서버에서 만든 tar.gz 를 읽어,
+# 규칙(host_rules.py)이 파일 내용/명령 출력/소유자·권한을 조회할 수 있게 한다.
+#   files/<원본 경로>  설정 파일 사본
+#   cmd/<이름>        명령 출력 (stat.tsv, commands, sshd_T, unit_files, units, listen, meta ...)
+
+# 번들 1개 크기 상한 (설정 파일과 명령 출력만 담으므로 수 MB 를 넘지 않는다)
+MAX_MEMBER_BYTES = 16 * 1024 * 1024
+
+
+def _unit_name(unit):
+    # systemctl 과 같이 접미어가 없으면 .service 로 취급
+    return unit if '.' in unit else unit + '.service'
+
+
+class HostFacts:
+    """호스트 1대의 팩트 번들. 번들에 없는 파일은 대상 서버에 없던 파일로 취급한다."""
+
+    def __init__(self, host, members):
+        self.host = host
+        self._members = members
+        self._stats = None
+        self._meta = None
+
+    @classmethod
+    def from_bundle(cls, path, host=None):
+        members = {}
+        with tarfile.open(path, 'r:gz') as tar:
+            for info in tar:
+                if not info.isfile() or info.size > MAX_MEMBER_BYTES:
+                    continue
+                name = os.path.normpath(info.name).lstrip('./')
+                members[name] = tar.extractfile(info).read().decode('utf-8', errors='replace')
+        facts = cls(host or '', members)
+        if not facts.host:
+            # 파일명 규칙 facts/<host>.tar.gz, 없으면 수집 시 hostname
+            base = os.path.basename(path)
+            facts.host = base[:-len('.tar.gz')] if base.endswith('.tar.gz') else facts.meta('hostname')
+        return facts
+
+    # --- 원본 조회 ---
+    def file(self, path):
+        """설정 파일 내용. 수집되지 않았으면 None."""
+        return self._members.get('files/' + path.lstrip('/'))
+
+    def command(self, name):
+        """명령 출력. 실행되지 않았으면 None."""
+        return self._members.get('cmd/' + name)
+
+    def meta(self, key, default=''):
+        if self._meta is None:
+            self._meta = dict(
+                line.split('=', 1) for line in (self.command('meta') or '').splitlines() if '=' in line
+            )
+        return self._meta.get(key, default).strip('"')
+
+    def has_command(self, name):
+        return name in (self.command('commands') or '').split()
+
+    def stat(self, path):
+        """{'type', 'owner', 'group', 'mode'} (mode 는 stat %a 문자열). 없으면 None."""
+        if self._stats is None:
+            self._stats = {}
+            for line in (self.command('stat.tsv') or '').splitlines():
+                parts = line.split('\t')
+                if len(parts) == 5:
+                    self._stats[parts[0]] = dict(zip(('type', 'owner', 'group', 'mode'), parts[1:]))
+        return self._stats.get(path)
+
+    def is_file(self, path):
+        entry = self.stat(path)
+        if entry is not None:
+            return entry['type'].startswith('regular')
+        return self.file(path) is not None
+
+    def is_dir(self, path):
+        entry = self.stat(path)
+        if entry is not None:
+            return entry['type'] == 'directory'
+        # stat 을 수집하지 않은 경로: 그 아래 파일이 수집됐으면 있던 디렉터리
+        return bool(self.files_in(path))
+
+    def files_in(self, directory):
+        """디렉터리 바로 아래에서 수집된 설정 파일 경로 (이름 순)."""
+        prefix = 'files/' + directory.strip('/') + '/'
+        return sorted('/' + name[len('files/'):] for name in self._members
+                      if name.startswith(prefix) and '/' not in name[len(prefix):])
+
+    # --- 파싱 도우미 ---
+    def passwd(self, source='files'):
+        """passwd 항목 목록. source='getent' 면 NSS 기준(getent passwd) 출력 사용."""
+        text = self.command('getent_passwd') if source == 'getent' else self.file('/etc/passwd')
+        entries = []
+        for line in (text or '').splitlines():
+            fields = line.rstrip().split(':')
+            if len(fields) >= 7:
+                entries.append({'name': fields[0], 'uid': fields[2], 'gid': fields[3],
+                                'home': fields[5], 'shell': fields[6], 'line': line.rstrip()})
+        return entries
+
+    def shadow(self):
+        """[(계정, 해시 접두어)] — 수집기가 해시 본문은 지우고 접두어만 남긴다."""
+        rows = []
+        for line in (self.file('/etc/shadow') or '').splitlines():
+            fields = line.split(':')
+            if len(fields) >= 2:
+                rows.append((fields[0], fields[1]))
+        return rows
+
+    def sshd_option(self, name):
+        """sshd -T 기준 실제 적용 값 (마지막 값, 소문자). sshd -T 출력이 없으면 None."""
+        text = self.command('sshd_T')
+        if text is None:
+            return None
+        value = ''
+        for line in text.splitlines():
+            parts = line.split(None, 1)
+            if parts and parts[0].lower() == name.lower():
+                value = parts[1].strip().lower() if len(parts) > 1 else ''
+        return value
+
+    def unit_enabled(self, unit):
+        """systemctl is-enabled 와 같은 값. 유닛이 없으면 'not_found'."""
+        unit = _unit_name(unit)
+        for line in (self.command('unit_files') or '').splitlines():
+            parts = line.split('\t')
+            if parts[0] == unit and len(parts) > 1:
+                return parts[1]
+        return 'not_found'
+
+    def has_unit(self, unit):
+        """systemctl list-unit-files 에 있는 유닛인지."""
+        return self.unit_enabled(unit) != 'not_found'
+
+    def unit_files(self):
+        """[(유닛 파일, 상태)] — systemctl list-unit-files 기준."""
+        rows = []
+        for line in (self.command('unit_files') or '').splitlines():
+            parts = line.split('\t')
+            if len(parts) > 1:
+                rows.append((parts[0], parts[1]))
+        return rows
+
+    def units(self):
+        """[(유닛, active 상태)] — systemctl list-units --all 기준."""
+        rows = []
+        for line in (self.command('units') or '').splitlines():
+            parts = line.split('\t')
+            if len(parts) > 1:
+                rows.append((parts[0], parts[1]))
+        return rows
+
+    def unit_active(self, unit):
+        """systemctl is-active 와 같은 값. 목록에 없으면 'inactive'."""
+        unit = _unit_name(unit)
+        for line in (self.command('units') or '').splitlines():
+            parts = line.split('\t')
+            if parts[0] == unit and len(parts) > 1:
+                return parts[1]
+        return 'inactive'
+
+    def listening(self, port, proto='tcp'):
+        """로컬 주소가 :<port> 로 끝나는 리슨 소켓이 있는지."""
+        suffixes = (':' + str(port), '.' + str(port))
+        for line in (self.command('listen') or '').splitlines():
+            parts = line.split('\t')
+            if len(parts) == 2 and parts[0].startswith(proto) and parts[1].endswith(suffixes):
+                return True
+        return False
@@ -0,0 +1,1109 @@
+import argparse
+import json
+import os
+import re
+import sys
+import tarfile
+
+from host_facts import HostFacts
+
+# --- 메인 서버 규칙 엔진 (U- 점검) ---
+# 대상 서버에서 점검 스크립트를 돌리는 대신, collect_host_facts.sh 가 1회 수집한 팩트 번들을
+# 메인 서버에서 평가한다. 판정 기준과 detail/guide 문구는 같은 번호의 check_U*.sh 를 그대로 옮겼다.
+# 규칙이 없는 항목은 기존처럼 대상 서버에서 스크립트로 점검한다 (run_check_bundle.py --skip-ids).
+# 결과는 점검 스크립트와 같은 신 형식(item_code / raw_evidence / scan_date) 레코드다.
+
+RULES = {}
+
+
+def rule(check_id, category, title, importance):
+    """규칙 등록. 함수는 HostFacts 를 받아 (status, reason, detail, guide, target_file, command) 를 반환."""
+    def register(func):
+        RULES[check_id] = {'func': func, 'category': category, 'title': title, 'importance': importance}
+        return func
+    return register
+
+
+def rule_key(check_id):
+    # 스트림/결과 파일 키 (check_U01.sh -> check_U01) — 스크립트 결과와 같은 파일을 갱신
+    return "check_" + check_id.replace('-', '')
+
+
+def evaluate(facts, check_ids=None):
+    """팩트 번들 1개에 규칙을 적용한 레코드 목록. scan_date 는 팩트 수집 시각."""
+    records = []
+    for check_id in sorted(RULES):
+        if check_ids and check_id not in check_ids:
+            continue
+        spec = RULES[check_id]
+        status, reason, detail, guide, target_file, command = spec['func'](facts)
+        records.append({
+            'item_code': check_id,
+            'category': spec['category'],
+            'title': spec['title'],
+            'importance': spec['importance'],
+            'status': status,
+            'raw_evidence': {
+                'command': command,
+                'detail': reason + "\n" + detail,
+                'guide': guide,
+                'target_file': target_file,
+            },
+            'scan_date': facts.meta('collect_date'),
+        })
+    return records
+
+
+# --- 공통 도우미 ---
+def _perm_int(mode):
+    return int(mode, 8) if re.fullmatch(r'[0-7]{3,4}', mode or '') else None
+
+
+def _pam_lines(text, pattern):
+    return [line for line in (text or '').splitlines() if re.search(pattern, line, re.IGNORECASE)]
+
+
+def _active_lines(text):
+    # 주석/빈 줄 제외
+    return [line for line in (text or '').splitlines() if line.strip() and not line.lstrip().startswith('#')]
+
+
+def _grep_active(text, pattern, flags=0):
+    # grep -nEv '^[[:space:]]*#' | grep -E <패턴> 과 같이 주석 제외 줄 중 일치하는 줄 ("줄번호:내용")
+    return [f"{n}:{line}" for n, line in enumerate((text or '').splitlines(), 1)
+            if not line.lstrip().startswith('#') and re.search(pattern, line, flags)]
+
+
+def _unit_state(facts, unit):
+    # (systemctl is-enabled, is-active) — 유닛 파일이 없으면 스크립트의 "|| echo unknown" 과 같이 unknown
+    enabled = facts.unit_enabled(unit)
+    return ('unknown' if enabled == 'not_found' else enabled), facts.unit_active(unit)
+
+
+# --- 1_account ---
+@rule("U-01", "계정관리", "root 계정 원격 접속 제한", "상")
+def check_root_remote_login(facts):
+    sshd_config, pam_login, securetty = "/etc/ssh/sshd_config", "/etc/pam.d/login", "/etc/securetty"
+
+    # 1) SSH: sshd -T 기준 PermitRootLogin
+    ssh_ok, ssh_cmd, ssh_val = True, "unknown", "sshd_config_not_found"
+    if facts.is_file(sshd_config):
+        if facts.has_command('sshd'):
+            ssh_cmd, ssh_val = "available", facts.sshd_option('permitrootlogin') or "unknown"
+        else:
+            ssh_cmd, ssh_val = "missing", "unknown"
+        ssh_ok = ssh_val == "no"
+
+    # 2) Telnet 활성 탐지
+    active, detection, xinetd_disable = False, "none", "unknown"
+    for tool in ('ss', 'netstat'):
+        if facts.has_command(tool):
+            if facts.listening(23):
+                active, detection = True, f"port23_listening({tool})"
+            break
+    if not active and facts.has_command('systemctl'):
+        for unit in ('telnet.socket', 'telnet.service'):
+            if facts.unit_active(unit) == 'active':
+                active, detection = True, f"systemd:{unit}(active)"
+                break
+    xinetd_telnet = facts.file('/etc/xinetd.d/telnet')
+    if not active and xinetd_telnet is not None:
+        values = [line.split('=', 1)[1].strip().lower() for line in xinetd_telnet.splitlines()
+                  if re.match(r'^\s*disable\s*=', line, re.IGNORECASE)]
+        xinetd_disable = (values[-1].replace(' ', '').replace('\t', '') if values else "") or "unknown"
+        if xinetd_disable == "no":
+            active, detection = True, "xinetd:/etc/xinetd.d/telnet(disable=no)"
+            if facts.has_command('systemctl') and facts.unit_active('xinetd') == 'active':
+                detection = "xinetd:/etc/xinetd.d/telnet(disable=no), xinetd(active)"
+    inetd = facts.file('/etc/inetd.conf')
+    if not active and inetd is not None:
+        if any(re.match(r'^\s*telnet\s', line) for line in _active_lines(inetd)):
+            active, detection = True, "/etc/inetd.conf:telnet_entry"
+
+    pam_status = "pam_login_not_found"
+    if facts.file(pam_login) is not None:
+        pam_status = "present" if _pam_lines(facts.file(pam_login), r'^\s*auth\s+required\s+.*pam_securetty\.so') else "absent"
+    pts_status, pts_csv = "securetty_not_found", "securetty_not_found"
+    if facts.file(securetty) is not None:
+        pts = [re.sub(r'[ \t]', '', line) for line in facts.file(securetty).splitlines()
+               if not re.match(r'^\s*#', line)]
+        pts = [entry for entry in pts if entry.startswith('pts/')]
+        pts_status, pts_csv = ("present", ",".join(pts)) if pts else ("absent", "none")
+
+    telnet_ok, telnet_reason = True, ""
+    if active and not (pam_status == "present" and pts_status == "absent"):
+        telnet_ok = False
+        parts = []
+        if pam_status != "present":
+            parts.append(f"pam_securetty={pam_status}")
+        if pts_status != "absent":
+            parts.append(f"securetty_pts={pts_csv}")
+        telnet_reason = ", ".join(parts) or f"Telnet_active=yes({detection})"
+
+    status = "PASS" if ssh_ok and telnet_ok else "FAIL"
+    telnet_active = "yes" if active else "no"
+    detail = "\n".join([
+        f"ssh_sshd_config_exists={'yes' if facts.is_file(sshd_config) else 'no'}",
+        f"ssh_sshd_command={ssh_cmd}",
+        f"ssh_permitrootlogin={ssh_val}",
+        f"telnet_active={telnet_active}",
+        f"telnet_detection={detection}",
+        f"xinetd_telnet_disable={xinetd_disable}",
+        f"pam_securetty_in_{pam_login}={pam_status}",
+        f"securetty_pts_entries_in_{securetty}={pts_csv}",
+    ])
+    if status == "PASS":
+        if not active:
+            reason = f"PermitRootLogin={ssh_val}, Telnet=inactive({detection})로 설정되어 있어 이 항목에 대해 양호합니다."
+        else:
+            reason = (f"PermitRootLogin={ssh_val}, Telnet=active({detection}), pam_securetty={pam_status}, "
+                      f"securetty_pts={pts_csv}로 설정되어 있어 이 항목에 대해 양호합니다.")
+    else:
+        weak = [part for part in ("" if ssh_ok else f"PermitRootLogin={ssh_val}", telnet_reason) if part]
+        reason = f"{', '.join(weak) or '설정 확인 결과 일부 조건이 충족되지 않았습니다'}로 설정되어 있어 이 항목에 대해 취약합니다."
+    guide = (
+        "이 항목에 대해서 원격 접속 설정을 자동으로 변경할 경우 관리자 접속 차단(락아웃) 및 운영 중 서비스 영향이 발생할 위험이 존재하여 수동 조치가 필요합니다.\n"
+        "관리자가 직접 확인 후 SSH는 /etc/ssh/sshd_config(또는 include된 설정)에서 PermitRootLogin을 no로 설정하고 sshd 설정을 재적용(예: systemctl reload sshd 또는 재시작)해 주시기 바랍니다.\n"
+        "Telnet을 사용 중이라면 Telnet 서비스를 비활성화하거나, /etc/pam.d/login에 pam_securetty.so를 적용하고 /etc/securetty에서 pts/ 항목을 제거해 주시기 바랍니다."
+    )
+    command = (
+        "[SSH] /etc/ssh/sshd_config 존재 시: sshd -T | grep ^permitrootlogin\n"
+        "[Telnet] 활성 탐지: ss/netstat 23포트 LISTEN 또는 systemctl telnet.* active 또는 xinetd telnet(disable=no) 또는 inetd.conf telnet 엔트리\n"
+        "[Telnet] 활성 시 설정 확인: /etc/pam.d/login에 pam_securetty.so 적용 및 /etc/securetty에 pts/x 미존재"
+    )
+    return status, reason, detail, guide, "\n".join([sshd_config, pam_login, securetty]), command
+
+
+@rule("U-05", "계정관리", "UID가 0인 일반 계정 존재", "상")
+def check_uid0_accounts(facts):
+    if facts.has_command('getent') and facts.command('getent_passwd') is not None:
+        source, entries = "getent passwd", facts.passwd('getent')
+    elif facts.is_file('/etc/passwd'):
+        source, entries = "/etc/passwd", facts.passwd()
+    else:
+        source, entries = "passwd_not_found", []
+
+    others = [entry for entry in entries if entry['uid'] == '0' and entry['name'] != 'root']
+    root_line = next((entry['line'] for entry in entries if entry['name'] == 'root'), "")
+    if source == "passwd_not_found":
+        status = "FAIL"
+        reason = "계정 정보 소스를 확인할 수 없어 uid0_except_root_entries=unavailable 상태이므로 이 항목에 대해 취약합니다."
+        detail = "evidence_source=unavailable\nuid0_root_entry=unavailable\nuid0_except_root_entries=unavailable"
+    else:
+        detail = (f"evidence_source={source}\nuid0_root_entry={root_line or 'not_found'}\nuid0_except_root_entries:\n"
+                  + ("\n".join(entry['line'] for entry in others) or "none"))
+        if not others:
+            status, reason = "PASS", "uid0_except_root_entries=none 으로 설정되어 있어 이 항목에 대해 양호합니다."
+        else:
+            status = "FAIL"
+            reason = (f"uid0_except_root_accounts={','.join(entry['name'] for entry in others)} "
+                      "으로 설정되어 있어 이 항목에 대해 취약합니다.")
+    guide = (
+        "자동 조치:\n"
+        "root 이외 uid=0 계정을 중복되지 않는 일반 UID로 변경합니다.\n"
+        "계정이 사용 중이거나 PID 1 사용자 매핑에 영향이 있으면 자동 조치를 중단하고 수동 조치를 안내합니다.\n"
+        "UID 변경 후 기존 숫자 UID 소유 파일이 남지 않도록 소유권을 새 사용자로 정리합니다.\n"
+        "주의사항:\n"
+        "UID 변경은 해당 계정으로 실행 중인 프로세스/서비스에 영향을 줄 수 있어 서비스 장애가 발생할 수 있습니다.\n"
+        "주의사항으로 소유권 정리는 파일 수가 많은 환경에서 시간이 오래 걸리거나 권한 문제로 일부 변경이 누락될 수 있습니다."
+    )
+    command = "getent passwd | awk -F: '$3 == 0 && $1 != \"root\"' (없으면 /etc/passwd)"
+    return status, reason, detail, guide, "/etc/passwd", command
+
+
+@rule("U-10", "계정관리", "동일한 UID 금지", "중")
+def check_duplicate_uid(facts):
+    entries = facts.passwd()
+    if not facts.is_file('/etc/passwd'):
+        status, reason, detail = "FAIL", "/etc/passwd 파일이 없어 점검할 수 있어 이 항목에 대해 취약합니다.", "passwd_not_found"
+    elif not entries:
+        status = "FAIL"
+        reason = "/etc/passwd에서 사용자:UID 값을 추출하지 못해 점검할 수 있어 이 항목에 대해 취약합니다."
+        detail = "passwd_uid_extract_failed"
+    else:
+        detail = "\n".join(f"{entry['name']}:{entry['uid']}" for entry in entries)
+        by_uid = {}
+        for entry in entries:
+            by_uid.setdefault(entry['uid'], []).append(entry['name'])
+        dups = sorted((uid for uid, names in by_uid.items() if len(names) > 1), key=lambda u: int(u) if u.isdigit() else -1)
+        if not dups:
+            status, reason = "PASS", "/etc/passwd에 중복 UID가 존재하지 않아 이 항목에 대해 양호합니다."
+        else:
+            status = "FAIL"
+            lines = "\n".join(f"uid={uid} accounts={' '.join(by_uid[uid])}" for uid in dups)
+            reason = f"{lines} 이 설정으로 UID가 중복되어 있어 이 항목에 대해 취약합니다."
+    guide = (
+        "자동 조치 시 UID 변경으로 인해 파일/디렉터리 소유권 불일치, 서비스 계정 권한 문제, 로그인/프로세스 권한 오동작이 발생할 수 있어 수동 조치가 필요합니다.\n"
+        "관리자가 직접 중복 UID 계정을 확인한 뒤, 중복 계정 중 하나의 UID를 변경하고 해당 UID로 소유된 파일/디렉터리의 소유권을 올바른 계정으로 재설정해 주시기 바랍니다."
+    )
+    command = 'cut -d: -f1,3 /etc/passwd | sort -t: -k2,2n'
+    return status, reason, detail, guide, "/etc/passwd", command
+
+
+SYSTEM_ACCOUNTS = ("daemon", "bin", "sys", "adm", "listen", "nobody", "nobody4", "noaccess",
+                   "diag", "operator", "games", "gopher")
+NOLOGIN_SHELLS = ("/bin/false", "/sbin/nologin", "/usr/sbin/nologin")
+
+
+@rule("U-11", "계정관리", "사용자 shell 점검", "하")
+def check_system_account_shell(facts):
+    if not facts.is_file('/etc/passwd'):
+        status = "FAIL"
+        reason = "/etc/passwd 파일이 존재하지 않아 설정 값을 확인할 수 있어 이 항목에 대해 취약합니다."
+        detail = "passwd_not_found"
+    else:
+        shells = {}
+        for entry in facts.passwd():
+            shells.setdefault(entry['name'], entry['shell'])
+        current = [f"{name}:{shells[name]}" for name in SYSTEM_ACCOUNTS if name in shells]
+        vulnerable = [f"{name}:{shells[name]}" for name in SYSTEM_ACCOUNTS
+                      if name in shells and shells[name] not in NOLOGIN_SHELLS]
+        detail = "\n".join(current) or "no_target_accounts_found_in_passwd"
+        if vulnerable:
+            status, reason = "FAIL", f"{', '.join(vulnerable)}로 설정되어 있어 이 항목에 대해 취약합니다."
+        else:
+            status = "PASS"
+            reason = f"대상 시스템 계정의 쉘이 {', '.join(NOLOGIN_SHELLS)} 중 하나로 설정되어 있어 이 항목에 대해 양호합니다."
+    guide = (
+        "자동 조치: \n"
+        "로그인이 불필요한 시스템 계정의 로그인 쉘을 시스템에 존재하는 nologin 경로(/sbin/nologin 또는 /usr/sbin/nologin, 미존재 시 /bin/false)로 변경합니다.\n"
+        "주의사항: \n"
+        "일부 환경에서는 서비스 계정이 운영/점검 목적으로 쉘을 사용하도록 구성될 수 있어, 쉘 변경 시 계정 기반 작업 흐름에 영향을 줄 수 있으므로 변경 전 계정 사용 여부를 확인해야 합니다."
+    )
+    command = 'egrep "^(daemon|bin|sys|adm|listen|nobody|nobody4|noaccess|diag|operator|games|gopher):" /etc/passwd'
+    return status, reason, detail, guide, "/etc/passwd", command
+
+
+@rule("U-13", "계정관리", "안전한 비밀번호 암호화 알고리즘 사용", "중")
+def check_password_hash_algorithm(facts):
+    defs, shadow = "/etc/login.defs", "/etc/shadow"
+    system_auth, password_auth = "/etc/pam.d/system-auth", "/etc/pam.d/password-auth"
+    caution = (
+        "PAM 설정 오타나 비정상 편집은 인증 실패를 유발할 수 있어 적용 전 백업과 점검이 필요합니다.\n"
+        "ENCRYPT_METHOD 변경은 신규 비밀번호부터 적용되며 기존 계정은 비밀번호 재설정이 없으면 해시가 유지될 수 있습니다."
+    )
+    pam_action = "/etc/pam.d/system-auth(및 존재 시 password-auth)의 pam_unix.so password 라인에 sha512 옵션을 적용합니다.\n"
+    command = ("grep -Ei '^[[:space:]]*ENCRYPT_METHOD' /etc/login.defs; awk -F: '$2 ~ /^\\$/' /etc/shadow; "
+               "grep -E '^[[:space:]]*password[[:space:]]+.*pam_unix\\.so' /etc/pam.d/system-auth /etc/pam.d/password-auth")
+    target_file = f"{defs} {shadow} {system_auth} {password_auth}"
+
+    missing = [name for path, name in ((defs, "login.defs_not_found"), (shadow, "shadow_not_found"),
+                                       (system_auth, "system-auth_not_found")) if facts.file(path) is None]
+    if missing:
+        reason = f"missing_files={','.join(missing)}로 이 항목에 대해 취약합니다."
+        guide = ("자동 조치:\n/etc/login.defs에 ENCRYPT_METHOD를 SHA512로 설정합니다.\n"
+                 + pam_action + "주의사항: \n" + caution)
+        return "FAIL", reason, "\n".join(missing), guide, target_file, command
+
+    methods = [line.split()[1] for line in facts.file(defs).splitlines()
+               if re.match(r'^\s*ENCRYPT_METHOD\s+', line, re.IGNORECASE) and len(line.split()) > 1]
+    method = methods[-1] if methods else ""
+    weak_accounts = [name for name, prefix in facts.shadow()
+                     if prefix.startswith('$') and not prefix.startswith(('$5$', '$6$', '$y$'))]
+
+    def pam_result(path):
+        text = facts.file(path)
+        if text is None:
+            return "NOT_FOUND"
+        lines = _pam_lines(text, r'^\s*password\s+.*pam_unix\.so')
+        if not lines:
+            return "NO_PAM_UNIX"
+        safe = any(re.search(r'(^|\s)(sha512|sha256|yescrypt)($|\s)', line, re.IGNORECASE) for line in lines)
+        return "OK" if safe else "WEAK"
+
+    sys_pam, pass_pam = pam_result(system_auth), pam_result(password_auth)
+    has_password_auth = facts.file(password_auth) is not None
+    detail_lines = [f"ENCRYPT_METHOD={method or 'not_set'}"]
+    if weak_accounts:
+        detail_lines += ["shadow_weak_accounts="] + weak_accounts
+    else:
+        detail_lines.append("shadow_hash_prefix=only_$5$_$6$_$y$")
+    detail_lines.append(f"pam_system-auth={sys_pam}")
+    detail_lines.append(f"pam_password-auth={pass_pam}" if has_password_auth else "pam_password-auth=not_found(skip)")
+
+    defs_ok = method.upper() in ("SHA256", "SHA512", "YESCRYPT")
+    pam_ok = sys_pam == "OK" and (not has_password_auth or pass_pam == "OK")
+    if defs_ok and pam_ok and not weak_accounts:
+        reason = (f"ENCRYPT_METHOD={method}, pam_system-auth={sys_pam}, shadow_prefix=only_$5$_$6$_$y$"
+                  "로 이 항목에 대해 양호합니다.")
+        return "PASS", reason, "\n".join(detail_lines), "", target_file, command
+
+    parts = []
+    if not defs_ok:
+        parts.append(f"ENCRYPT_METHOD={method or 'not_set'}")
+    if not pam_ok:
+        parts.append(f"pam_system-auth={sys_pam}" + (f", pam_password-auth={pass_pam}" if has_password_auth else ""))
+    if weak_accounts:
+        parts.append(f"shadow_weak_accounts={','.join(weak_accounts)}")
+    reason = f"{', '.join(parts)}로 이 항목에 대해 취약합니다."
+    guide = ("자동 조치 시 /etc/login.defs에 ENCRYPT_METHOD를 SHA512로 설정합니다.\n자동 조치:\n"
+             + pam_action + "주의사항:\n" + caution)
+    return "FAIL", reason, "\n".join(detail_lines), guide, target_file, command
+
+
+# --- 2_directory ---
+@rule("U-16", "파일 및 디렉토리 관리", "/etc/passwd 파일 소유자 및 권한 설정", "상")
+def check_passwd_permission(facts):
+    path = "/etc/passwd"
+    guide = (
+        "자동 조치:\n"
+        "/etc/passwd에 대해 chown root:root /etc/passwd로 소유자/그룹을 root로 통일하고 chmod 644 /etc/passwd로 권한을 표준화합니다.\n"
+        "주의사항: \n"
+        "/etc/passwd가 심볼릭 링크이거나 파일시스템이 읽기 전용/immutable 속성인 경우 변경이 실패할 수 있으니 조치 전 파일 유형과 속성(lsattr 등) 확인 및 백업을 권장합니다."
+    )
+    command = 'stat -c "%U %a" /etc/passwd'
+    entry = facts.stat(path)
+    if entry is None or not facts.is_file(path):
+        reason = "/etc/passwd 파일이 존재하지 않아 file_not_found 상태이므로 이 항목에 대해 취약합니다."
+        guide = (
+            "자동 조치:\n"
+            "/etc/passwd 파일을 정상 상태로 복구한 뒤 소유자(root:root)와 권한(644)으로 설정합니다.\n"
+            "주의사항: \n"
+            "파일 복구/대체는 인증/계정 체계에 영향을 줄 수 있으므로 반드시 신뢰 가능한 백업/이미지에서 복구해야 합니다."
+        )
+        return "FAIL", reason, "current_status=file_not_found", guide, path, command
+
+    owner, mode = entry['owner'], entry['mode']
+    perm = _perm_int(mode)
+    if perm is None:
+        reason = f"권한=({mode}) 값이 정상 형식이 아니어서 perm={mode} 상태이므로 이 항목에 대해 취약합니다."
+        detail = f"owner={owner}\nperm={mode}\nwrite_bits=unknown\nspecial_bits=unknown"
+        guide = (
+            "자동 조치:\n"
+            "chown root:root /etc/passwd 및 chmod 644 /etc/passwd를 수행해 기준 설정으로 맞춥니다.\n"
+            "주의사항: \n"
+            "권한 값이 비정상으로 수집될 경우 파일시스템/권한/속성(immutable 등) 문제일 수 있으니 강제 변경 전 원인을 확인하고 백업을 권장합니다."
+        )
+        return "FAIL", reason, detail, guide, path, command
+
+    write_ok, special_ok = not perm & 0o022, not perm & 0o7000
+    detail = (f"owner={owner}\nperm={mode}\ngroup_or_other_write={'no' if write_ok else 'yes'}\n"
+              f"special_bits={'no' if special_ok else 'yes'}")
+    # 스크립트와 같이 권한 문자열을 10진수로 비교 (644 이하)
+    if owner == "root" and write_ok and special_ok and int(mode) <= 644:
+        reason = f"소유자=root, 권한={mode}(그룹/기타 쓰기 없음, 특수권한 없음)으로 설정되어 있어 이 항목에 대해 양호합니다."
+        return "PASS", reason, detail, guide, path, command
+
+    parts = []
+    if owner != "root":
+        parts.append(f"소유자={owner}")
+    if int(mode) > 644:
+        parts.append(f"권한={mode}")
+    if not write_ok:
+        parts.append("그룹/기타 쓰기 허용")
+    if not special_ok:
+        parts.append("특수권한 존재")
+    reason = f"{', '.join(parts) or '설정값 확인 필요'} 상태로 설정되어 있어 이 항목에 대해 취약합니다."
+    return "FAIL", reason, detail, guide, path, command
+
+
+@rule("U-18", "파일 및 디렉토리 관리", "/etc/shadow 파일 소유자 및 권한 설정", "상")
+def check_shadow_permission(facts):
+    path = "/etc/shadow"
+    guide = (
+        "자동 조치:\n"
+        "/etc/shadow 파일의 소유자를 root로 변경(chown root /etc/shadow)하고 권한을 400으로 설정(chmod 400 /etc/shadow)합니다.\n"
+        "주의사항: \n"
+        "권한/소유자 설정이 잘못되면 인증 관련 서비스에서 로그인 오류가 발생할 수 있으므로 조치 후 즉시 owner/perm 값을 재검증해야 합니다."
+    )
+    command = 'stat -c "%U %a" /etc/shadow'
+    entry = facts.stat(path)
+    if entry is None or not facts.is_file(path):
+        guide = (
+            "자동 조치:\n"
+            "/etc/shadow 파일을 복구한 뒤 소유자를 root로 변경(chown root /etc/shadow)하고 권한을 400으로 설정(chmod 400 /etc/shadow)합니다.\n"
+            "주의사항: \n"
+            "권한/소유자 설정이 잘못되면 인증 관련 서비스에서 로그인 오류가 발생할 수 있으므로 조치 후 즉시 상태를 재확인해야 합니다."
+        )
+        return "FAIL", "파일이 존재하지 않아 이 항목에 대해 취약합니다.", "file_not_found", guide, path, command
+    owner, mode = entry['owner'], entry['mode']
+    if not owner or not mode:
+        guide = (
+            "자동 조치:\n"
+            "/etc/shadow 파일의 소유자를 root로 변경(chown root /etc/shadow)하고 권한을 400으로 설정(chmod 400 /etc/shadow)합니다.\n"
+            "주의사항: \n"
+            "권한/소유자 설정이 잘못되면 인증 관련 서비스에서 로그인 오류가 발생할 수 있으므로 조치 전후로 상태 수집(stat)이 가능한지부터 확인해야 합니다."
+        )
+        return "FAIL", "소유자/권한 값을 확인하지 못해 이 항목에 대해 취약합니다.", "stat_failed", guide, path, command
+
+    perm3 = mode.zfill(3)
+    # 400 이하: u 는 4 또는 0, g/o 는 0
+    perm_ok = len(perm3) == 3 and perm3[0] in "40" and perm3[1:] == "00"
+    detail = f"owner={owner}\nperm={perm3}"
+    if owner == "root" and perm_ok:
+        return "PASS", f"owner={owner}, perm={perm3}로 설정되어 있어 이 항목에 대해 양호합니다.", detail, "", path, command
+    parts = ([f"owner={owner}"] if owner != "root" else []) + ([f"perm={perm3}"] if not perm_ok else [])
+    return "FAIL", f"{', '.join(parts)}로 설정되어 있어 이 항목에 대해 취약합니다.", detail, guide, path, command
+
+
+@rule("U-19", "파일 및 디렉토리 관리", "/etc/hosts 파일 소유자 및 권한 설정", "상")
+def check_hosts_permission(facts):
+    path = "/etc/hosts"
+    guide = (
+        "자동 조치: \n"
+        "chown root:root /etc/hosts 수행 후 chmod 644 /etc/hosts를 적용합니다.\n"
+        "주의사항: \n"
+        "/etc/hosts 를 참조하는 서비스가 있는 경우 권한 변경 자체는 영향이 거의 없지만, 운영 중 비root 계정이 파일을 직접 수정하는 절차가 있었다면 해당 작업이 차단될 수 있으니 변경 주체/절차를 확인한 뒤 적용해야 합니다."
+    )
+    command = 'stat -c "%U %a" /etc/hosts'
+    entry = facts.stat(path)
+    if entry is None or not facts.is_file(path):
+        reason = f"target_file={path} state=not_found 으로 확인되어 이 항목에 대해 취약합니다."
+        guide = (
+            "자동 조치: \n"
+            "/etc/hosts 복구 후 chown root:root /etc/hosts 및 chmod 644 /etc/hosts를 적용합니다.\n"
+            "주의사항: \n"
+            "파일 생성/복구 과정에서 잘못된 호스트 매핑이 들어가면 이름해석 및 서비스 연결에 영향을 줄 수 있으니, 내용은 백업/검증된 값으로만 복구해야 합니다."
+        )
+        return "FAIL", reason, "owner=unknown\nperm=unknown\nexists=no", guide, path, command
+    owner, mode = entry['owner'], entry['mode']
+    perm = _perm_int(mode)
+    if not owner or perm is None:
+        reason = f"owner={owner or 'unknown'} perm={mode or 'unknown'} 으로 확인되어 이 항목에 대해 취약합니다."
+        detail = f"owner={owner or 'unknown'}\nperm={mode or 'unknown'}\nexists=yes\nnote=stat_failed_or_empty"
+        guide = (
+            "자동 조치: \n"
+            "chown root:root /etc/hosts 수행 후 chmod 644 /etc/hosts를 적용합니다.\n"
+            "주의사항: \n"
+            "/etc/hosts 내용이 서비스 접근/이름해석에 사용되는 환경에서는 잘못된 항목이 존재할 경우 연결 영향이 있을 수 있으니 내용은 변경하지 않고 권한/소유자만 조치해야 합니다."
+        )
+        return "FAIL", reason, detail, guide, path, command
+
+    detail = f"owner={owner}\nperm={mode}\nexists=yes"
+    perm_ok = perm <= 0o644 and not perm & 0o022
+    if owner == "root" and perm_ok:
+        return "PASS", f"owner={owner} perm={mode} 으로 설정되어 이 항목에 대해 양호합니다.", detail, "", path, command
+    parts = ([f"owner={owner}"] if owner != "root" else []) + ([f"perm={mode}"] if not perm_ok else [])
+    return "FAIL", f"{', '.join(parts)} 으로 설정되어 이 항목에 대해 취약합니다.", detail, guide, path, command
+
+
+@rule("U-22", "파일 및 디렉토리 관리", "/etc/services 파일 소유자 및 권한 설정", "상")
+def check_services_permission(facts):
+    path = "/etc/services"
+    guide = (
+        "자동 조치: \n"
+        "1) 파일 존재 여부 확인 후, 필요 시 백업을 생성합니다.\n"
+        "2) 소유자가 root/bin/sys가 아니면 root로 변경합니다. (예: chown root /etc/services)\n"
+        "3) 권한이 644를 초과하면 644로 변경합니다. (예: chmod 644 /etc/services)\n"
+        "4) 조치 후 소유자/권한을 재확인하여 기준 충족 여부를 검증합니다.\n"
+        "주의사항: \n"
+        "/etc/services는 포트 매핑 정보가 포함된 파일이므로, 운영 환경에서 파일이 비정상적으로 변경되었거나 서비스가 특정 커스텀 매핑에 의존하는 경우 예기치 않은 서비스 연동 문제가 발생할 수 있어 조치 전 백업 및 변경 이력 확인이 권장됩니다."
+    )
+    command = '[ -f /etc/services ] && stat -c "%U %a %n" /etc/services 2>/dev/null || echo "services_not_found_or_stat_failed"'
+    entry = facts.stat(path)
+    if entry is None or not facts.is_file(path):
+        reason = "file_not_found로 확인되어 이 항목에 대해 취약합니다."
+        return "FAIL", reason, f"file_exists=no\nowner=N/A\nperm=N/A\ntarget_file={path}", guide, path, command
+    owner, mode = entry['owner'], entry['mode']
+    if not owner or not mode.isdigit():
+        reason = "stat_failed_or_no_output로 확인되어 이 항목에 대해 취약합니다."
+        return "FAIL", reason, f"file_exists=yes\nowner=unknown\nperm=unknown\ntarget_file={path}", guide, path, command
+
+    detail = f"file_exists=yes\nowner={owner}\nperm={mode}\ntarget_file={path}"
+    owner_ok = owner in ("root", "bin", "sys")
+    # 스크립트와 같이 권한 문자열을 10진수로 비교 (644 이하)
+    if owner_ok and int(mode) <= 644:
+        return "PASS", f"owner={owner} perm={mode}로 설정되어 이 항목에 대해 양호합니다.", detail, guide, path, command
+    parts = ([f"owner={owner}"] if not owner_ok else []) + ([f"perm={mode}"] if int(mode) > 644 else [])
+    return "FAIL", f"{', '.join(parts)}로 설정되어 이 항목에 대해 취약합니다.", detail, guide, path, command
+
+
+# --- 3_service ---
+@rule("U-34", "서비스 관리", "Finger 서비스 비활성화", "상")
+def check_finger_disabled(facts):
+    inetd_conf, xinetd_finger = "/etc/inetd.conf", "/etc/xinetd.d/finger"
+    details, bad, good = [], [], []
+
+    inetd = facts.file(inetd_conf)
+    if inetd is None:
+        details.append(f"{inetd_conf}: 파일 없음")
+        good.append(f"{inetd_conf}: 파일 없음")
+    else:
+        lines = _grep_active(inetd, r'^\s*finger(\s|$)')
+        if lines:
+            details += [f"{inetd_conf}: finger 활성 라인 확인"] + lines
+            bad += [f"{inetd_conf}: finger 활성 라인"] + lines
+        else:
+            details.append(f"{inetd_conf}: finger 활성 라인 없음(없음 또는 주석)")
+            good.append(f"{inetd_conf}: finger 활성 라인 없음(없음 또는 주석)")
+
+    xinetd = facts.file(xinetd_finger)
+    if xinetd is None:
+        details.append(f"{xinetd_finger}: 파일 없음")
+        good.append(f"{xinetd_finger}: 파일 없음")
+    else:
+        # CRLF 제거 후 마지막 disable 라인, disable = yes 가 명시되지 않으면 취약
+        lines = _grep_active(xinetd.replace('\r', ''), r'^\s*disable\s*=', re.IGNORECASE)
+        if not lines:
+            details.append(f"{xinetd_finger}: disable 라인 없음")
+            bad.append(f"{xinetd_finger}: disable 라인 없음")
+        else:
+            details.append(f"{xinetd_finger}: {lines[-1]}")
+            value = re.sub(r'\s', '', lines[-1].split('=', 1)[1]).lower()
+            (good if value == "yes" else bad).append(f"{xinetd_finger}: {lines[-1]}")
+
+    if not facts.has_command('systemctl'):
+        details.append("systemctl: 사용 불가")
+        good.append("systemctl: 사용 불가")
+    else:
+        units = [unit for unit in ('finger.socket', 'finger.service') if facts.has_unit(unit)]
+        if not units:
+            details.append("systemd: finger 유닛 없음")
+            good.append("systemd: finger 유닛 없음")
+        for unit in units:
+            enabled, active = _unit_state(facts, unit)
+            details += [f"systemd: {unit}", f"is-enabled={enabled}", f"is-active={active}"]
+            state = f"systemd: {unit} (is-enabled={enabled}, is-active={active})"
+            (bad if enabled == "enabled" or active == "active" else good).append(state)
+
+    # 사유는 양호/취약 근거만 한 문장으로
+    if bad:
+        status, head = "FAIL", " ".join(" ".join(bad).split()) or "취약 설정이 확인됨"
+        reason = f"{head} 때문에 이 항목에 대해 취약합니다."
+    else:
+        status, head = "PASS", " ".join(" ".join(good).split()) or "양호 설정이 확인됨"
+        reason = f"{head} 때문에 이 항목에 대해 양호합니다."
+    guide = (
+        "자동 조치:\n"
+        f"{inetd_conf} 에서 finger 활성 라인을 주석 처리하고 {xinetd_finger} 에 disable = yes 를 표준화하며 "
+        "finger.socket/finger.service 가 있으면 stop/disable/mask 합니다.\n"
+        "주의사항: \n"
+        "서비스 관리 정책에 따라 설정 변경 및 재시작이 다른 서비스에 미약한 영향을 줄 수 있으므로 적용 전 백업과 변경 이력 관리가 필요합니다."
+    )
+    command = ("grep finger /etc/inetd.conf; grep disable /etc/xinetd.d/finger; "
+               "systemctl list-unit-files | grep finger; systemctl is-enabled/is-active finger.socket finger.service")
+    target_file = f"{inetd_conf} {xinetd_finger} finger.socket finger.service"
+    return status, reason, "\n".join(details), guide, target_file, command
+
+
+DOS_SERVICES = ("echo", "discard", "daytime", "chargen")
+
+
+@rule("U-38", "서비스 관리", "DoS 공격에 취약한 서비스 비활성화", "상")
+def check_dos_services_disabled(facts):
+    details, found = [], []
+    service_re = r'^\s*(echo|discard|daytime|chargen)(\s|$)'
+
+    inetd = facts.file('/etc/inetd.conf')
+    if inetd is None:
+        details.append("inetd(after/current)=inetd_conf_not_found")
+    else:
+        lines = _grep_active(inetd, service_re)[:10]
+        details.append("inetd(after/current)=" + ("\n" + "\n".join(lines) if lines else "no_active_dos_services"))
+        found += [f"/etc/inetd.conf:{svc}" for svc in DOS_SERVICES
+                  if _grep_active(inetd, rf'^\s*{svc}(\s|$)')]
+
+    xinetd_bad = []
+    if facts.is_dir('/etc/xinetd.d'):
+        for svc in DOS_SERVICES:
+            path = f"/etc/xinetd.d/{svc}"
+            text = facts.file(path)
+            if text is None:
+                details.append(f"xinetd_{svc}(after/current)=file_not_found")
+                continue
+            lines = _grep_active(text, r'^\s*disable(\s*=)?\s*', re.IGNORECASE)
+            details.append(f"xinetd_{svc}(after/current)={lines[0] if lines else 'disable_setting_not_found'}")
+            if _grep_active(text, r'^\s*disable(\s*=)?\s*no(\s|$)', re.IGNORECASE):
+                xinetd_bad.append(f"{path}:disable=no")
+    else:
+        details.append("xinetd(after/current)=xinetd_dir_not_found")
+    found += xinetd_bad
+
+    summary, systemd_found = "systemd_units_not_found", []
+    if facts.has_command('systemctl'):
+        units = [f"{unit} {state}" for unit, state in facts.unit_files()
+                 if re.match(r'^(echo|discard|daytime|chargen)(-dgram|-stream)?\.(service|socket)$', unit, re.IGNORECASE)]
+        summary = "\n".join(units) or summary
+        for base in DOS_SERVICES:
+            for suffix in ("", "-dgram", "-stream"):
+                for kind in ("socket", "service"):
+                    unit = f"{base}{suffix}.{kind}"
+                    if not facts.has_unit(unit):
+                        continue
+                    enabled, active = _unit_state(facts, unit)
+                    details.append(f"systemd_{unit}(after/current)=enabled:{enabled},active:{active}")
+                    if active.lower() == "active":
+                        systemd_found.append(f"{unit}(active)")
+                    elif enabled.lower().startswith("enabled"):
+                        systemd_found.append(f"{unit}({enabled})")
+    else:
+        details.append("systemd(after/current)=systemctl_not_found")
+    details.append(f"systemd_units(after/current)=\n{summary}")
+    if systemd_found:
+        found.append("systemd:" + " ".join(systemd_found))
+
+    if found:
+        status, reason = "FAIL", f"{', '.join(found)} 설정이 확인되어 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = ("inetd에서 echo/discard/daytime/chargen 활성 라인이 없고 xinetd에서 disable=no가 없으며 "
+                  "systemd에서 관련 unit이 active/enabled가 아니라 이 항목에 대해 양호합니다.")
+    guide = (
+        "자동 조치:\n"
+        "inetd는 /etc/inetd.conf에서 echo/discard/daytime/chargen 활성 라인을 주석 처리하고, xinetd는 /etc/xinetd.d/* 파일의 "
+        "disable=no를 disable=yes로 변경하며, systemd는 관련 socket/service를 stop 후 disable 및 mask 처리합니다.\n"
+        "주의사항: \n"
+        "미사용 서비스만 대상으로 해야 하며, 시간대별/운영 중 서비스 의존성이 있는 환경에서는 xinetd/inetd 재시작 또는 systemd unit "
+        "비활성화로 예상치 못한 서비스 영향이 발생할 수 있으므로 적용 전 점검 및 적용 후 즉시 검증이 필요합니다."
+    )
+    command = ("grep -E '^(echo|discard|daytime|chargen)' /etc/inetd.conf; grep disable /etc/xinetd.d/{echo,discard,daytime,chargen}; "
+               "systemctl list-unit-files/list-units | grep -Ei '^(echo|discard|daytime|chargen)(-dgram|-stream)?\\.(service|socket)'")
+    target_file = ("/etc/inetd.conf\n/etc/xinetd.d/(echo|discard|daytime|chargen)\n"
+                   "systemd(echo|discard|daytime|chargen 및 -dgram/-stream 변형 unit)")
+    return status, reason, "\n".join(details), guide, target_file, command
+
+
+NFS_UNITS = ("nfs-server.service", "rpcbind.service", "rpcbind.socket", "nfs-mountd.service",
+             "nfs-idmapd.service", "rpc-statd.service", "nfsdcld.service")
+
+
+@rule("U-39", "서비스 관리", "불필요한 NFS 서비스 비활성화", "상")
+def check_nfs_disabled(facts):
+    current, vuln, good = [], [], []
+    if not facts.has_command('systemctl'):
+        current.append("systemctl=not_found")
+        vuln.append("systemctl=not_found")
+    else:
+        for unit in NFS_UNITS:
+            enabled, active = _unit_state(facts, unit)
+            current.append(f"systemd:{unit} is-enabled={enabled} is-active={active}")
+            if active.lower() in ("active", "running", "listening"):
+                vuln.append(f"systemd:{unit} is-active={active}")
+            elif enabled.lower() in ("enabled", "enabled-runtime"):
+                vuln.append(f"systemd:{unit} is-enabled={enabled}")
+            else:
+                good.append(f"systemd:{unit} is-enabled={enabled} is-active={active}")
+
+    # /etc/exports 에 주석/공백이 아닌 라인이 있으면 공유 구성 흔적
+    exports = facts.file('/etc/exports')
+    if exports is None:
+        current.append("/etc/exports=exports_not_found")
+        good.append("/etc/exports=exports_not_found")
+    else:
+        lines = [f"{n}:{line}" for n, line in enumerate(exports.splitlines(), 1)
+                 if line.strip() and not line.lstrip().startswith('#')]
+        if lines:
+            # 스크립트의 tr '\n' '; ' 결과와 같이 ';' 로 연결 (마지막 ';' 포함)
+            value = f"/etc/exports(active_lines)={';'.join(lines[:5])};"
+            current.append(value)
+            vuln.append(value)
+        else:
+            current.append("/etc/exports=exports_empty")
+            good.append("/etc/exports=exports_empty")
+
+    if vuln:
+        status, reason = "FAIL", f"{', '.join(vuln)} 로 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = f"{', '.join(good) or 'relevant_settings_not_identified'} 로 이 항목에 대해 양호합니다."
+    guide = (
+        "자동 조치:\n"
+        "NFS 관련 유닛이 존재하면 systemctl stop <unit> 후 systemctl disable <unit> 및 systemctl mask <unit>를 적용합니다.\n"
+        "/etc/exports에 주석/공백이 아닌 라인이 있으면 해당 라인을 주석 처리하여 공유 구성을 비활성화합니다.\n"
+        "주의사항: \n"
+        "NFS를 실제로 사용 중인 서버에서 서비스를 중지하거나 exports 구성을 변경하면 업무 서비스(공유 디렉터리, 백업, 배치 등)가 중단될 수 있습니다.\n"
+        "rpcbind/socket 비활성화는 NFS 외 RPC 기반 기능에도 영향을 줄 수 있으므로 사전 영향도 확인이 필요합니다.\n"
+        "mask 적용은 향후 정상 재가동을 막을 수 있으므로 운영 정책에 따라 disable까지만 적용할지 검토가 필요합니다.\n"
+        "/etc/exports 변경 전 파일 백업 및 변경 후 점검(exportfs/서비스 상태 확인)을 수행하는 것이 안전합니다."
+    )
+    command = ("systemctl is-enabled/is-active " + " ".join(NFS_UNITS) + "; "
+               "grep -nEv '^[[:space:]]*#|^[[:space:]]*$' /etc/exports")
+    return status, reason, "\n".join(current) or "none", guide, "systemd(nfs-server, rpcbind 등), /etc/exports", command
+
+
+@rule("U-41", "서비스 관리", "불필요한 automountd 제거", "상")
+def check_automountd_disabled(facts):
+    svc_enabled, svc_active = _unit_state(facts, 'autofs.service')
+    sock_enabled, sock_active = _unit_state(facts, 'autofs.socket')
+    service = f"autofs.service(active={svc_active}, enabled={svc_enabled})"
+    socket = f"autofs.socket(active={sock_active}, enabled={sock_enabled})"
+    detail = (f"autofs.service: active={svc_active}, enabled={svc_enabled}\n"
+              f"autofs.socket: active={sock_active}, enabled={sock_enabled}")
+
+    # active 또는 enabled 면 취약 (재부팅/재기동 시 활성화 가능)
+    bad = [part for part, state in ((service, (svc_active, svc_enabled)), (socket, (sock_active, sock_enabled)))
+           if state[0] == "active" or state[1] == "enabled"]
+    if bad:
+        status, reason = "FAIL", f"{' 및 '.join(bad)}로 설정되어 있어 이 항목에 대해 취약합니다."
+    else:
+        status, reason = "PASS", f"{service} 및 {socket}로 설정되어 있어 이 항목에 대해 양호합니다."
+    guide = (
+        "자동 조치:\n"
+        "autofs.service 및 autofs.socket에 대해 stop 후 disable을 적용하고, 필요 시 mask로 재활성화를 방지합니다.\n"
+        "주의사항: \n"
+        "/etc/auto.* 또는 /etc/autofs* 구성에 의해 필요한 자동 마운트(NFS/Samba/특정 경로 자동 연결)가 중단될 수 있으므로 서비스 사용 여부를 먼저 확인해야 합니다.\n"
+        "기존 사용자 세션에서 자동 마운트에 의존하던 작업이 실패할 수 있으며, 적용 직후 관련 프로세스/업무 영향이 발생할 수 있으므로 운영 환경에서는 점검 창구 확보 후 적용하는 것이 안전합니다."
+    )
+    command = "systemctl list-units --all | grep autofs; systemctl is-active/is-enabled autofs.service autofs.socket"
+    return status, reason, detail, guide, "N/A", command
+
+
+UNNEEDED_RPC_SERVICES = ("rpc.cmsd", "rpc.ttdbserverd", "sadmind", "rusersd", "walld", "sprayd", "rstatd",
+                         "rpc.nisd", "rexd", "rpc.pcnfsd", "rpc.statd", "rpc.ypupdated", "rpc.rquotad",
+                         "kcms_server", "cachefsd")
+
+
+@rule("U-42", "서비스 관리", "불필요한 RPC 서비스 비활성화", "상")
+def check_rpc_services_disabled(facts):
+    inetd_findings, xinetd_findings, systemd_findings, vuln = [], [], [], []
+
+    inetd = facts.file('/etc/inetd.conf')
+    if inetd is None:
+        inetd_findings.append("inetd_conf_not_found")
+    else:
+        for svc in UNNEEDED_RPC_SERVICES:
+            hits = _grep_active(inetd, rf'^\s*{re.escape(svc)}(\s|$)')[:20]
+            if hits:
+                inetd_findings.append(f"{svc}:\n" + "\n".join(hits))
+                vuln.append(f"inetd(/etc/inetd.conf)에서 {svc} 라인이 주석 제외로 존재")
+
+    # xinetd: service <이름> 블록이 있는 파일의 disable=no
+    if facts.is_dir('/etc/xinetd.d'):
+        for conf in facts.files_in('/etc/xinetd.d'):
+            text = facts.file(conf)
+            for svc in UNNEEDED_RPC_SERVICES:
+                if not _grep_active(text, rf'^\s*service\s+{re.escape(svc)}(\s|$)', re.IGNORECASE):
+                    continue
+                disable = _grep_active(text, r'^\s*disable\s*=', re.IGNORECASE)
+                xinetd_findings.append(f"file={conf} service={svc} {disable[0] if disable else 'disable_setting_not_found'}")
+                if _grep_active(text, r'^\s*disable\s*=\s*no(\s|$)', re.IGNORECASE):
+                    vuln.append(f"xinetd({conf})에서 {svc} disable=no")
+        xinetd_findings = xinetd_findings or ["no_unneeded_rpc_xinetd_service_blocks"]
+    else:
+        xinetd_findings.append("xinetd_dir_not_found")
+
+    if facts.has_command('systemctl'):
+        for svc in UNNEEDED_RPC_SERVICES:
+            unit = f"{svc}.service"
+            if not facts.has_unit(unit):
+                continue
+            enabled, active = _unit_state(facts, unit)
+            systemd_findings.append(f"{unit}: enabled={enabled}, active={active}")
+            if enabled == "enabled" or active == "active":
+                vuln.append(f"systemd에서 {unit} enabled={enabled} 또는 active={active}")
+        systemd_findings = systemd_findings or ["no_unneeded_rpc_systemd_units_found"]
+    else:
+        systemd_findings.append("systemctl_not_found")
+
+    detail = ("inetd_current_settings:\n" + "".join(f"{line}\n\n" for line in inetd_findings)
+              + "xinetd_current_settings:\n" + "".join(f"{line}\n\n" for line in xinetd_findings)
+              + "systemd_current_settings:\n" + "\n".join(systemd_findings))
+    if vuln:
+        # 스크립트 문구 그대로 (결과 모드를 바꿔도 점검 결과 변경으로 잡히지 않도록)
+        status = "FAIL"
+        reason = "inetd·xinetd·systemd에서 불필요 RPC 서비스가 활성 상태가 확인되어 이 항목에 대해 취약합니다.로 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = ("inetd·xinetd·systemd에서 불필요 RPC 서비스가 활성 상태(주석 제외 라인, disable=no, enabled/active)로 "
+                  "확인되지 않아 이 항목에 대해 양호합니다.")
+    guide = (
+        "자동 조치: \n"
+        "1) inetd 사용 시 /etc/inetd.conf에서 불필요 RPC 서비스 라인을 주석 처리하고(서비스명 기준) inetd를 재시작합니다.\n"
+        "2) xinetd 사용 시 /etc/xinetd.d/*에서 해당 service 블록의 disable 값을 yes로 변경하거나, disable 항목이 없다면 disable=yes를 삽입한 뒤 xinetd를 재시작합니다.\n"
+        "3) systemd 사용 시 해당 유닛이 존재하면 stop 후 disable 및 필요 시 mask 처리합니다.\n"
+        "주의사항: \n"
+        "NFS 등에서 rpcbind/rpc.statd 계열이 의존될 수 있어, 자동으로 중지/비활성화하면 파일 공유/마운트/상태 동기화 기능에 영향이 생길 수 있습니다.\n"
+        "또한 /etc/xinetd.d 내 백업 파일을 같은 디렉터리에 남기면 점검 로직이 백업 파일까지 포함해 오탐(Fail)을 유발할 수 있으므로 백업은 별도 경로에 보관하는 방식이 안전합니다."
+    )
+    command = ("grep -nEv '^[[:space:]]*#' /etc/inetd.conf /etc/xinetd.d/*; "
+               "systemctl list-unit-files --type=service; systemctl list-units --type=service --all")
+    return status, reason, detail, guide, "N/A", command
+
+
+NIS_UNITS = ("ypserv.service", "ypbind.service", "ypxfrd.service", "rpc.yppasswdd.service", "rpc.ypupdated.service")
+
+
+@rule("U-43", "서비스 관리", "NIS, NIS+ 점검", "상")
+def check_nis_disabled(facts):
+    if not facts.has_command('systemctl'):
+        # 점검 자체 불가
+        status, active_found, enabled_found = "ERROR", "systemctl_not_found", "systemctl_not_found"
+    else:
+        # list-units(--all 없음)와 같이 inactive 가 아닌 서비스 유닛만 현재 실행으로 본다
+        active_found = " ".join(
+            unit for unit, active in facts.units()
+            if unit.endswith('.service') and active != 'inactive'
+            and re.search(r'ypserv|ypbind|ypxfrd|rpc\.yppasswdd|rpc\.ypupdated', unit)
+        ) or "none"
+        enabled_found = " ".join(unit for unit in NIS_UNITS if facts.unit_enabled(unit) == "enabled") or "none"
+        status = "FAIL" if active_found != "none" or enabled_found != "none" else "PASS"
+
+    detail = f"active: {active_found}\nenabled: {enabled_found}"
+    if status == "PASS":
+        reason = "active: none, enabled: none 로 설정되어 있어 이 항목에 대해 양호합니다."
+    elif status == "FAIL":
+        parts = ([f"active: {active_found}"] if active_found != "none" else []) + \
+                ([f"enabled: {enabled_found}"] if enabled_found != "none" else [])
+        reason = f"{', '.join(parts)} 로 설정되어 있어 이 항목에 대해 취약합니다."
+    else:
+        reason = "systemctl 사용 불가로 현재 설정 값을 확인하지 못해 이 항목에 대해 판단할 수 없습니다."
+    guide = (
+        "자동 조치: \n"
+        "탐지된 NIS 관련 서비스 유닛에 대해 systemctl stop <unit> 으로 중지하고 systemctl disable <unit> 으로 부팅 자동 시작을 해제합니다.\n"
+        "조치 후 systemctl is-active/is-enabled 재점검으로 active/enabled 잔존 여부를 확인합니다.\n"
+        "주의사항: \n"
+        "NIS를 실제로 사용하는 환경에서는 중지/비활성화 시 계정/인증 및 이름서비스(디렉터리/맵) 연동이 끊길 수 있어 로그인/권한 확인 등에 영향이 발생할 수 있으므로 사전에 사용 여부와 대체 서비스 적용 여부를 확인해야 합니다."
+    )
+    command = ("systemctl list-units --type=service | grep -E 'ypserv|ypbind|ypxfrd|rpc.yppasswdd|rpc.ypupdated'; "
+               "systemctl is-active/is-enabled <unit>")
+    return status, reason, detail, guide, "N/A", command
+
+
+TFTP_TALK_UNITS = ("tftp.service", "tftp.socket", "talk.service", "ntalk.service", "talkd.service", "ntalkd.service")
+
+
+@rule("U-44", "서비스 관리", "tftp, talk 서비스 비활성화", "상")
+def check_tftp_talk_disabled(facts):
+    check_paths = "/etc/inetd.conf, /etc/xinetd.d/{tftp,talk,ntalk}, systemd(service/socket)"
+    bad = []
+
+    def first_three(lines):
+        return " ".join(" ".join(lines[:3]).split())
+
+    inetd = facts.file('/etc/inetd.conf')
+    if inetd is None:
+        inetd_lines = "파일 없음"
+    else:
+        lines = [f"{n}:{line}" for n, line in enumerate(inetd.splitlines(), 1)
+                 if line.strip() and not line.lstrip().startswith('#') and re.search(r'^\s*(tftp|talk|ntalk)\b', line)]
+        inetd_lines = "\n".join(lines)
+        if lines:
+            bad.append(f"/etc/inetd.conf 활성 라인: {first_three(lines)}")
+
+    xinetd_summary = []
+    if facts.is_dir('/etc/xinetd.d'):
+        for svc in ("tftp", "talk", "ntalk"):
+            conf = f"/etc/xinetd.d/{svc}"
+            text = facts.file(conf)
+            if text is None:
+                xinetd_summary.append(f"{conf}: 파일 없음")
+                continue
+            numbered = list(enumerate(text.splitlines(), 1))
+            disable = [f"{n}:{line}" for n, line in numbered if re.search(r'^\s*disable\s*=', line, re.IGNORECASE)]
+            xinetd_summary.append(f"{conf} disable 설정:\n" + "\n".join(disable) if disable
+                                  else f"{conf} disable 설정: (설정 없음)")
+            disable_no = [f"{n}:{line}" for n, line in numbered
+                          if re.search(r'^\s*disable\s*=\s*no\b', line, re.IGNORECASE)]
+            if disable_no:
+                bad.append(f"{conf} disable=no: {first_three(disable_no)}")
+    else:
+        xinetd_summary.append("/etc/xinetd.d 디렉터리 없음")
+
+    units_found, bad_units = [], []
+    if facts.has_command('systemctl'):
+        for unit in TFTP_TALK_UNITS:
+            if not facts.has_unit(unit):
+                continue
+            units_found.append(unit)
+            enabled, active = _unit_state(facts, unit)
+            if enabled == "enabled" or active == "active":
+                bad_units.append(f"{unit}: enabled={enabled}, active={active}")
+                bad.append(f"systemd {unit}: enabled={enabled}, active={active}")
+    else:
+        units_found.append("systemctl 없음")
+
+    detail = (
+        f"(점검 경로)\n{check_paths}\n\n"
+        f"/etc/inetd.conf 활성 라인\n{inetd_lines or '없음'}\n\n"
+        f"/etc/xinetd.d 설정 요약\n{chr(10).join(xinetd_summary) or '없음'}\n\n"
+        f"systemd 유닛 존재 여부(후보)\n{chr(10).join(units_found) or '없음'}\n\n"
+        f"systemd enabled/active(취약 판단 대상)\n{chr(10).join(bad_units) or '없음'}"
+    )
+    if bad:
+        status, reason = "FAIL", f"{' '.join(' '.join(bad).split())} 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = ("/etc/inetd.conf에 tftp/talk/ntalk 활성 라인이 없고 /etc/xinetd.d에서 disable=no 설정이 없으며 "
+                  "systemd 관련 유닛이 enabled 또는 active가 아니어서 이 항목에 대해 양호합니다.")
+    guide = (
+        "자동 조치: \n"
+        "/etc/inetd.conf에서 tftp/talk/ntalk 활성 라인을 주석 처리합니다.\n"
+        "/etc/xinetd.d/{tftp,talk,ntalk}에서 disable=no를 disable=yes로 변경하고 disable 설정이 없으면 disable=yes를 추가합니다.\n"
+        "systemd에서 관련 service/socket 유닛이 enabled 또는 active이면 stop 후 disable 처리합니다.\n"
+        "주의사항: \n"
+        "tftp는 PXE 부팅, 초기 배포, 장비 펌웨어/설정 전송 등에 사용될 수 있어 비활성화 시 관련 절차가 중단될 수 있습니다.\n"
+        "talk/ntalk는 레거시 통신 환경에서 사용될 수 있어 비활성화 시 해당 기능이 필요했던 사용자/프로세스에 영향이 있을 수 있습니다."
+    )
+    command = ("grep -E '^(tftp|talk|ntalk)' /etc/inetd.conf; grep -i disable /etc/xinetd.d/{tftp,talk,ntalk}; "
+               "systemctl is-enabled/is-active " + " ".join(TFTP_TALK_UNITS))
+    return status, reason, detail, guide, check_paths, command
+
+
+@rule("U-52", "서비스 관리", "Telnet 서비스 비활성화", "중")
+def check_telnet_disabled(facts):
+    details, bad, targets = [], [], []
+
+    inetd = facts.file('/etc/inetd.conf')
+    if inetd is not None:
+        targets.append('/etc/inetd.conf')
+        matches = [f"{n}:{line}" for n, line in enumerate(_active_lines(inetd), 1) if re.match(r'^\s*telnet(\s|$)', line)]
+        if matches:
+            bad.append(f"/etc/inetd.conf: {matches[0]}")
+            details.append(f"inetd:/etc/inetd.conf telnet_line={matches[0]}")
+        else:
+            details.append("inetd:/etc/inetd.conf telnet_line=not_found_or_commented")
+    else:
+        details.append("inetd:/etc/inetd.conf file=not_found")
+
+    xinetd = facts.file('/etc/xinetd.d/telnet')
+    if xinetd is not None:
+        targets.append('/etc/xinetd.d/telnet')
+        lines = [line for line in _active_lines(xinetd) if re.match(r'^\s*disable\s*=', line, re.IGNORECASE)]
+        value = re.sub(r'[;#].*$', '', re.sub(r'\s', '', lines[0].split('=', 1)[1].lower())) if lines else ""
+        value = value or "unknown"
+        details.append(f"xinetd:/etc/xinetd.d/telnet disable={value}" + (f" ({lines[0].strip()})" if lines else ""))
+        if value in ("no", "unknown"):
+            bad.append(f"/etc/xinetd.d/telnet: disable={value}")
+    else:
+        details.append("xinetd:/etc/xinetd.d/telnet file=not_found")
+
+    found = False
+    for unit in ('telnet.socket', 'telnet.service'):
+        enabled, active = "unknown", "unknown"
+        if facts.has_command('systemctl'):
+            enabled, active = facts.unit_enabled(unit), facts.unit_active(unit)
+        details.append(f"systemd:{unit} enabled={enabled} active={active}")
+        if enabled == "enabled" or active == "active":
+            found = True
+            bad.append(f"systemd:{unit} enabled={enabled} active={active}")
+    if not found:
+        details.append("systemd:telnet.socket/telnet.service enabled_or_active=none_detected")
+    sshd = facts.unit_active('sshd') if facts.has_command('systemctl') else "unknown"
+    details.append(f"ssh:sshd active={sshd}")
+
+    if bad:
+        status, reason = "FAIL", f"{', '.join(bad)} 로 설정되어 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = ("inetd_telnet=not_found_or_commented, xinetd_disable=yes, systemd_telnet=disabled_or_inactive "
+                  "로 설정되어 이 항목에 대해 양호합니다.")
+    guide = (
+        "자동 조치: \n"
+        "/etc/inetd.conf에서 telnet 라인을 주석 처리하거나 제거합니다.\n"
+        "/etc/xinetd.d/telnet에서 disable 값을 yes로 설정하고 disable 라인이 없으면 추가합니다.\n"
+        "systemd의 telnet.socket 및 telnet.service(또는 telnetd.*)를 stop 후 disable 및 mask 처리합니다.\n"
+        "주의사항: \n"
+        "원격 접속을 Telnet에 의존하던 환경에서는 즉시 접속이 끊길 수 있으므로 SSH 접속 가능 여부를 먼저 확인해야 합니다.\n"
+        "inetd/xinetd 재시작 또는 systemd unit 변경은 관련 서비스에 순간적인 영향이 있을 수 있으므로 운영 시간대를 고려해야 합니다.\n"
+        "배포판/패키지 구성에 따라 telnet 관련 unit 이름이 다를 수 있어 적용 전 현재 상태를 확인해야 합니다."
+    )
+    command = ("grep telnet /etc/inetd.conf; grep disable /etc/xinetd.d/telnet; "
+               "systemctl is-enabled/is-active telnet.socket telnet.service; systemctl is-active sshd")
+    target_file = ", ".join(targets) or "/etc/inetd.conf, /etc/xinetd.d/telnet, systemd(telnet.socket/service)"
+    return status, reason, "\n".join(details), guide, target_file, command
+
+
+@rule("U-54", "서비스 관리", "암호화되지 않는 FTP 서비스 비활성화", "중")
+def check_plain_ftp_disabled(facts):
+    details, reasons, targets = [], [], []
+
+    inetd = facts.file('/etc/inetd.conf')
+    if inetd is None:
+        details.append("[inetd] file: not_found (/etc/inetd.conf)")
+    else:
+        targets.append("/etc/inetd.conf")
+        lines = _grep_active(inetd, r'^\s*ftp(\s|$)')
+        if lines:
+            reasons.append("/etc/inetd.conf 에 ftp 활성 라인이 존재함")
+            details.append("[inetd] active_ftp_lines:\n" + "\n".join(lines))
+        else:
+            details.append("[inetd] active_ftp_lines: none")
+
+    if facts.is_dir('/etc/xinetd.d'):
+        for path in ("/etc/xinetd.d/ftp", "/etc/xinetd.d/proftp", "/etc/xinetd.d/vsftp"):
+            text = facts.file(path)
+            if text is None:
+                details.append(f"[xinetd] file: not_found ({path})")
+                continue
+            targets.append(path)
+            disable = _grep_active(text, r'^\s*disable\s*=', re.IGNORECASE)
+            if _grep_active(text, r'^\s*disable\s*=\s*no(\s|$)', re.IGNORECASE):
+                reasons.append(f"{os.path.basename(path)} 에 disable=no 설정이 존재함")
+            details.append(f"[xinetd] file={path} disable_line: {disable[0] if disable else 'disable_line_not_found'}")
+    else:
+        details.append("[xinetd] dir: not_found (/etc/xinetd.d)")
+
+    if facts.has_command('systemctl'):
+        for name in ("vsftpd", "proftpd", "pure-ftpd"):
+            unit = f"{name}.service"
+            if not facts.has_unit(unit):
+                details.append(f"[systemd] {unit} unit: not_found")
+                continue
+            targets.append(f"systemd:{unit}")
+            enabled, active = _unit_state(facts, unit)
+            details.append(f"[systemd] {unit} active={active} enabled={enabled}")
+            if active == "active":
+                reasons.append(f"{unit} 가 active 임")
+            if enabled == "enabled":
+                reasons.append(f"{unit} 가 enabled 임")
+    else:
+        details.append("[systemd] systemctl: not_available")
+
+    if reasons:
+        status, reason = "FAIL", f"{'; '.join(reasons)}로 이 항목에 대해 취약합니다."
+    else:
+        status = "PASS"
+        reason = ("/etc/inetd.conf 에 ftp 활성 라인이 없고 /etc/xinetd.d 에서 disable=no 설정이 없으며 "
+                  "systemd 의 FTP 데몬이 active/enabled 가 아니어서 이 항목에 대해 양호합니다.")
+    guide = (
+        "자동 조치:\n"
+        "inetd 환경이면 /etc/inetd.conf 의 ftp 관련 라인을 주석 처리합니다.\n"
+        "xinetd 환경이면 /etc/xinetd.d 의 ftp 계열 설정에서 disable 값을 yes 로 표준화하고 필요 시 xinetd 를 재시작합니다.\n"
+        "systemd 환경이면 vsftpd/proftpd/pure-ftpd 서비스를 stop 하고 disable 및 mask 처리합니다.\n"
+        "주의사항:\n"
+        "FTP 서비스를 업무적으로 사용 중인 시스템에서는 중지/비활성화로 파일 전송 업무가 중단될 수 있으니 영향도를 확인한 뒤 적용해야 합니다.\n"
+        "inetd/xinetd 재시작 또는 systemd 서비스 변경은 관련 서비스 구성이 있는 경우 연결이 끊길 수 있으므로 유지보수 시간대에 적용하는 것이 안전합니다."
+    )
+    command = ("grep -nE \"^[[:space:]]*ftp\\b\" /etc/inetd.conf\n"
+               "grep -niE \"^[[:space:]]*disable[[:space:]]*=[[:space:]]*no\\b\" /etc/xinetd.d/ftp /etc/xinetd.d/proftp /etc/xinetd.d/vsftp\n"
+               "systemctl list-unit-files | grep -Ei \"^(vsftpd|proftpd|pure-ftpd)\\.service\"\n"
+               "systemctl is-active vsftpd proftpd pure-ftpd\n"
+               "systemctl is-enabled vsftpd proftpd pure-ftpd")
+    target_file = ", ".join(targets) or "/etc/inetd.conf, /etc/xinetd.d/{ftp,proftp,vsftp}, systemd:{vsftpd,proftpd,pure-ftpd}.service"
+    return status, reason, "\n".join(details), guide, target_file, command
+
+
+# --- CLI ---
+def write_stream(records, host, path):
+    # run_check_bundle.py 와 같은 NDJSON 1줄 형식 -> result_store.py collect 로 적재
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            line = {"host": host, "key": rule_key(record['item_code']), "result": record}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="팩트 번들로 U- 점검 규칙 평가")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="규칙이 있는 점검 ID (run_check_bundle.py --skip-ids 용, 쉼표 구분)")
+
+    p_eval = sub.add_parser("evaluate", help="팩트 번들 -> NDJSON 결과 스트림")
+    p_eval.add_argument("bundles", nargs="+", help="facts/<host>.tar.gz")
+    p_eval.add_argument("--out", default="./streams", help="스트림 폴더 (<host>_rules.ndjson)")
+    p_eval.add_argument("--ids", default="", help="평가할 점검 ID (쉼표 구분, 기본 전체)")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        print(",".join(sorted(RULES)))
+        return 0
+
+    check_ids = {item.strip() for item in args.ids.split(",") if item.strip()}
+    os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    for bundle in args.bundles:
+        try:
+            facts = HostFacts.from_bundle(bundle)
+        except (OSError, EOFError, tarfile.TarError) as e:
+            print(f"{bundle}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        records = evaluate(facts, check_ids)
+        path = os.path.join(args.out, f"{facts.host}_rules.ndjson")
+        write_stream(records, facts.host, path)
+        print(f"{path}: {len(records)} rules")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
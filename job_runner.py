@@ -0,0 +1,161 @@
+import collections
+import hashlib
+import itertools
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fix_plan import build_plan, write_plan
+
+# --- 플레이북 백그라운드 실행기 ---
+# 대시보드 버튼이 ansible-playbook 을 동기 실행하며 세션을 멈추지 않도록 작업 큐로 넘긴다.
+# 동시 실행 수를 제한하고, 같은 요청(플레이북/대상 서버/target_id)이 진행 중이면 새로 띄우지 않는다.
+
+# ansible 기본 출력에서 호스트별 진행 상황 추출
+TASK_LINE = re.compile(r'^TASK \[(.+)\]')
+HOST_LINE = re.compile(r'^(ok|changed|failed|fatal|skipping|unreachable): \[([^\]]+)\]')
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# 일괄 조치 시 동시에 조치할 서버 수 상한 (ansible forks)
+MAX_FIX_FORKS = 20
+
+
+class Job:
+    def __init__(self, job_id, key, command):
+        self.id = job_id
+        self.key = key
+        self.command = command
+        self.status = "queued"
+        self.returncode = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.current_task = ""
+        self.hosts = {}          # host -> {'ok': n, 'changed': n, 'failed': n, 'skipped': n}
+        self.log = collections.deque(maxlen=200)
+
+    def _count(self, state, host):
+        counts = self.hosts.setdefault(host, {'ok': 0, 'changed': 0, 'failed': 0, 'skipped': 0})
+        if state in ("failed", "fatal", "unreachable"):
+            counts['failed'] += 1
+        elif state == "skipping":
+            counts['skipped'] += 1
+        else:
+            counts[state] += 1
+
+    def feed(self, line):
+        self.log.append(line)
+        m = TASK_LINE.match(line)
+        if m:
+            self.current_task = m.group(1)
+            return
+        m = HOST_LINE.match(line)
+        if m:
+            self._count(m.group(1), m.group(2))
+
+    def snapshot(self):
+        return {
+            'id': self.id,
+            'playbook': self.key[0],
+            'limit': self.key[1] or "전체",
+            'target_id': self.key[2] or "",
+            'status': self.status,
+            'returncode': self.returncode,
+            'current_task': self.current_task,
+            'hosts': {h: dict(c) for h, c in self.hosts.items()},
+            'elapsed': round((self.finished or time.time()) - (self.started or self.created), 1),
+        }
+
+
+class JobRunner:
+    """프로세스 전역 작업 큐. 대시보드에서는 st.cache_resource 로 1개만 만들어 공유한다."""
+
+    def __init__(self, max_workers=2, inventory="hosts", cwd=None):
+        self.inventory = inventory
+        self.cwd = cwd
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="playbook")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = collections.OrderedDict()
+        self.finished_count = 0     # 완료된 작업 수 (대시보드가 결과 재로딩 시점 판단에 사용)
+
+    def build_command(self, playbook, limit=None, target_id=None):
+        command = ["ansible-playbook", "-i", self.inventory, playbook]
+        if target_id:
+            command += ["-e", f"target_id={target_id}"]
+        if limit:
+            command += ["--limit", limit]
+        return command
+
+    def submit(self, playbook, limit=None, target_id=None):
+        """작업을 큐에 넣는다. 같은 요청이 대기/실행 중이면 기존 작업을 그대로 반환한다."""
+        return self._enqueue((playbook, limit, target_id), self.build_command(playbook, limit, target_id))
+
+    def submit_fix_batch(self, items, playbook="run_fix_batch.yml"):
+        """(서버, 항목) 목록을 플레이북 1회로 조치한다. (job, 조치 스크립트가 없는 항목) 반환.
+        서버 간에는 병렬, 서버 안에서는 fix_plan 의 의존 순서대로 실행하고 조치 항목만 재점검한다."""
+        base = self.cwd or "."
+        plan, missing = build_plan(items, [os.path.join(base, "scripts", "unix")])
+        if not plan:
+            return None, missing
+        digest = hashlib.sha1(json.dumps(plan, sort_keys=True).encode()).hexdigest()[:10]
+        plan_path = os.path.join(base, "fix_plans", f"fix_plan_{digest}.json")
+        os.makedirs(os.path.dirname(plan_path), exist_ok=True)
+        write_plan(plan, plan_path)
+
+        hosts = sorted(plan)
+        total = sum(len(entries) for entries in plan.values())
+        command = self.build_command(playbook, limit=",".join(hosts))
+        command += ["-e", f"@{os.path.abspath(plan_path)}", "--forks", str(min(len(hosts), MAX_FIX_FORKS))]
+        key = (playbook, ",".join(hosts), f"일괄 {total}건 ({digest})")
+        return self._enqueue(key, command), missing
+
+    def _enqueue(self, key, command):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.key == key and job.status in ACTIVE_STATUSES:
+                    return job
+            job = Job(next(self._ids), key, command)
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        job.status = "running"
+        job.started = time.time()
+        try:
+            proc = subprocess.Popen(
+                job.command, cwd=self.cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, bufsize=1,
+            )
+            for line in proc.stdout:
+                job.feed(line.rstrip())
+            job.returncode = proc.wait()
+            job.status = "done" if job.returncode == 0 else "failed"
+        except OSError as e:
+            job.log.append(str(e))
+            job.status = "failed"
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self.finished_count += 1
+
+    def jobs(self, active_only=False, limit=20):
+        """최근 작업 상태 목록(최신순)."""
+        with self._lock:
+            jobs = [j for j in self._jobs.values() if not active_only or j.status in ACTIVE_STATUSES]
+        return [j.snapshot() for j in reversed(jobs[-limit:])]
+
+    def has_active(self):
+        with self._lock:
+            return any(j.status in ACTIVE_STATUSES for j in self._jobs.values())
+
+    def is_active(self, playbook, limit=None, target_id=None):
+        key = (playbook, limit, target_id)
+        with self._lock:
+            return any(j.key == key and j.status in ACTIVE_STATUSES for j in self._jobs.values())
@@ -0,0 +1,108 @@
+import pandas as pd
+
+# --- 보안 지표 계산 ---
+# 대시보드 상단 지표와 보고서(요약 시트)가 같은 기준을 쓰도록 한 곳에 모아 둔다.
+
+CATEGORY_ORDER = [
+    "계정 관리",           # 1_account
+    "파일 및 디렉터리 관리", # 2_directory
+    "서비스 관리",         # 3_service
+    "패치 관리",           # 4_patch
+    "로그 관리"            # 5_log
+]
+
+# 카테고리 표기를 정규화해 동일한 그룹으로 처리
+CATEGORY_ALIASES = {
+    "계정관리": "계정 관리",
+    "파일및디렉토리관리": "파일 및 디렉터리 관리",
+    "파일및디렉터리관리": "파일 및 디렉터리 관리",
+    "서비스관리": "서비스 관리",
+    "패치관리": "패치 관리",
+    "로그관리": "로그 관리"
+}
+
+
+def normalize_category(category_value):
+    raw = str(category_value).strip()
+    compact = raw.replace(" ", "")
+    return CATEGORY_ALIASES.get(compact, raw)
+
+
+def order_categories(categories):
+    # 기준 리스트 순서 우선, 그 외 카테고리는 이름순
+    unique_cats = set(categories)
+    existing_cats = [cat for cat in CATEGORY_ORDER if cat in unique_cats]
+    other_cats = sorted([cat for cat in unique_cats if cat not in CATEGORY_ORDER])
+    return existing_cats + other_cats
+
+
+def check_number_key(check_ids):
+    # U-숫자 형식에서 숫자만 추출 (U-1, U-10, U-2 처럼 문자열 순서가 되는 문제 방지)
+    return pd.to_numeric(check_ids.astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(9999)
+
+
+def group_by_category(data):
+    """점검 카드 화면용 [(카테고리, 항목 DataFrame, 취약 건수)] — 카테고리는 기준 순서, 항목은 번호 순."""
+    categories = data['category'].map(normalize_category)
+    groups = []
+    for cat in order_categories(categories.unique()):
+        cat_items = data[categories == cat].sort_values(by='check_id', key=check_number_key).reset_index(drop=True)
+        groups.append((cat, cat_items, int((cat_items['status'] == 'FAIL').sum())))
+    return groups
+
+
+# 가중치 설정 (상:5, 중:3, 하:1)
+IMPORTANCE_WEIGHTS = {'상': 5, '중': 3, '하': 1}
+
+# 보안 양호도 등급 기준 (점수 하한, 등급)
+GRADE_THRESHOLDS = [(90, "우수"), (80, "양호"), (70, "보통"), (60, "미흡")]
+
+
+def grade_for(score):
+    for threshold, grade in GRADE_THRESHOLDS:
+        if score >= threshold:
+            return grade
+    return "취약"
+
+
+def compute_host_metrics(data):
+    """서버 1대의 지표(가중 점수, 등급, 취약 건수, 무결성 지수, 카테고리별 현황)를 계산한다.
+    입력 DataFrame 은 수정하지 않는다. 결과 수집 시 1회 계산해 저장해 두는 용도."""
+    weight = data['importance'].map(IMPORTANCE_WEIGHTS).fillna(1) if 'importance' in data else None
+    is_pass = data['status'] == 'PASS' if 'status' in data else None
+
+    if weight is None or is_pass is None or data.empty:
+        score = 0
+        vuln_count = len(data)
+    else:
+        total_w = weight.sum()
+        score = float(weight[is_pass].sum() / total_w * 100) if total_w > 0 else 0
+        vuln_count = int((~is_pass).sum())
+
+    # file_hash가 "N/A"가 아닌 항목들로 무결성 체크 (데이터가 없으면 전체 점수와 동기화)
+    integrity = score
+    if 'file_hash' in data and is_pass is not None:
+        hashed = data['file_hash'] != "N/A"
+        if hashed.any():
+            integrity = float(is_pass[hashed].sum() / hashed.sum() * 100)
+
+    categories = {}
+    if 'category' in data and is_pass is not None and not data.empty:
+        cats = data['category'].map(normalize_category)
+        fails = cats[~is_pass].value_counts()
+        for cat, total in cats.value_counts().items():
+            categories[cat] = {'total': int(total), 'fail': int(fails.get(cat, 0))}
+
+    return {
+        'score': score,
+        'grade': grade_for(score),
+        'vuln_count': vuln_count,
+        'integrity': integrity,
+        'total': len(data),
+        'categories': categories,
+    }
+
+
+def get_metrics(data):
+    m = compute_host_metrics(data)
+    return m['score'], m['grade'], m['vuln_count'], m['integrity']
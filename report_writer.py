@@ -0,0 +1,158 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+import xlsxwriter
+
+from metrics import get_metrics, normalize_category, order_categories
+
+# --- 엑셀 보고서 작성 ---
+# 셀 단위 iloc/write 반복 대신 열 단위(write_column) 또는 행 단위(write_row)로 기록하고,
+# 양호/취약 색상은 셀마다 서식을 고르지 않고 '상태' 열 조건부 서식 1건으로 처리한다.
+
+REPORT_COLUMNS = ['category', 'check_id', 'title', 'importance', 'status', 'evidence', 'guide']
+REPORT_HEADERS = ['분류', '항목ID', '점검항목', '중요도', '상태', '점검결과', '조치 가이드']
+STATUS_COL = REPORT_HEADERS.index('상태')
+HEADER_ROW = 7
+SUMMARY_HEADERS = ['서버', '점검 건수', '취약 건수', '보안 점수', '등급', '무결성 지수']
+
+# 시트 이름에 쓸 수 없는 문자 (최대 31자)
+INVALID_SHEET_CHARS = str.maketrans({c: '_' for c in '[]:*?/\\'})
+
+
+def build_report_frame(df):
+    """보고서용 컬럼 추출 및 정리 (필요한 컬럼이 없을 경우를 대비해 reindex 사용)."""
+    report_df = df.reindex(columns=REPORT_COLUMNS).fillna("N/A").copy()
+    report_df.loc[report_df['status'] == 'PASS', 'guide'] = "조치가 필요 없습니다."
+    report_df['status'] = report_df['status'].map({'FAIL': '취약', 'PASS': '양호'}).fillna('미점검')
+    report_df.columns = REPORT_HEADERS
+    return report_df.astype(str)
+
+
+def report_fingerprint(df):
+    """보고서 내용이 바뀌었는지 판단하는 키: 최신 check_date + 행 수 + 보고서 컬럼 해시."""
+    if df.empty:
+        return "empty"
+    cols = [c for c in REPORT_COLUMNS + ['check_date'] if c in df.columns]
+    row_hash = int(pd.util.hash_pandas_object(df[cols], index=False).sum())
+    latest = df['check_date'].max() if 'check_date' in df.columns else ""
+    return f"{latest}|{len(df)}|{row_hash:x}"
+
+
+def open_workbook(output, constant_memory=False):
+    # nan_inf_to_errors 옵션은 에러 대신 빈 값을 넣어줌
+    options = {'nan_inf_to_errors': True, 'strings_to_numbers': False}
+    if constant_memory:
+        options['constant_memory'] = True
+    else:
+        options['in_memory'] = True
+    return xlsxwriter.Workbook(output, options)
+
+
+def add_formats(workbook):
+    return {
+        'header': workbook.add_format({'bold': True, 'bg_color': '#4472C4', 'font_color': 'white', 'border': 1, 'align': 'center'}),
+        'pass': workbook.add_format({'bg_color': '#C6EFCE', 'font_color': '#006100'}),
+        'fail': workbook.add_format({'bg_color': '#FFC7CE', 'font_color': '#9C0006'}),
+        'status': workbook.add_format({'border': 1, 'align': 'center'}),
+        'default': workbook.add_format({'border': 1}),
+        'title': workbook.add_format({'bold': True, 'font_size': 18}),
+    }
+
+
+def write_report_sheet(workbook, sheet_name, df, formats, constant_memory=False):
+    """단일 서버 점검 결과 시트를 작성한다."""
+    report_df = build_report_frame(df)
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    # 요약 지표 계산 (분모 0 체크)
+    total_val = len(report_df)
+    fail_val = int((report_df['상태'] == '취약').sum())
+    if total_val > 0:
+        pass_rate = f"{round(((total_val - fail_val) / total_val) * 100, 1)} %"
+    else:
+        pass_rate = "0.0 %"
+
+    # 상단 요약 정보 작성
+    worksheet.write(0, 0, "◐ 서버 보안 취약점 점검 요약 보고서", formats['title'])
+    worksheet.write_row(2, 0, ["전체 점검 건수", f"{total_val} 건", "점검 이행률", pass_rate])
+    worksheet.write_row(3, 0, ["취약 항목(FAIL)", f"{fail_val} 건", "점검 일시", datetime.now().strftime('%Y-%m-%d %H:%M')])
+    worksheet.write_row(HEADER_ROW, 0, REPORT_HEADERS, formats['header'])
+
+    first_row = HEADER_ROW + 1
+    if constant_memory:
+        # constant_memory 모드는 행 순서대로만 기록 가능하므로 행 단위로 스트리밍
+        for offset, values in enumerate(report_df.itertuples(index=False, name=None)):
+            row = first_row + offset
+            worksheet.write_row(row, 0, values[:STATUS_COL], formats['default'])
+            worksheet.write_string(row, STATUS_COL, values[STATUS_COL], formats['status'])
+            worksheet.write_row(row, STATUS_COL + 1, values[STATUS_COL + 1:], formats['default'])
+    else:
+        for col_num, header in enumerate(REPORT_HEADERS):
+            fmt = formats['status'] if col_num == STATUS_COL else formats['default']
+            worksheet.write_column(first_row, col_num, report_df[header].tolist(), fmt)
+
+    # '상태' 열 색상: 양호는 초록, 그 외(취약/미점검)는 빨강
+    if total_val > 0:
+        last_row = first_row + total_val - 1
+        worksheet.conditional_format(first_row, STATUS_COL, last_row, STATUS_COL,
+                                     {'type': 'cell', 'criteria': '==', 'value': '"양호"', 'format': formats['pass']})
+        worksheet.conditional_format(first_row, STATUS_COL, last_row, STATUS_COL,
+                                     {'type': 'cell', 'criteria': '!=', 'value': '"양호"', 'format': formats['fail']})
+
+    worksheet.set_column(0, len(REPORT_HEADERS) - 1, 22)
+    return worksheet
+
+
+def to_excel(df, constant_memory=False):
+    """단일 서버 보고서 xlsx 바이트. constant_memory=True 면 행 단위 스트리밍으로 메모리 사용을 제한한다."""
+    output = io.BytesIO()
+    workbook = open_workbook(output, constant_memory)
+    write_report_sheet(workbook, '보안점검_리포트', df, add_formats(workbook), constant_memory)
+    workbook.close()
+    return output.getvalue()
+
+
+def _sheet_name(name, used):
+    base = str(name).translate(INVALID_SHEET_CHARS)[:31] or "host"
+    candidate, n = base, 2
+    while candidate.lower() in used:
+        suffix = f"_{n}"
+        candidate, n = base[:31 - len(suffix)] + suffix, n + 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def build_fleet_summary(df):
+    """서버별 점수/등급(get_metrics)과 카테고리별 취약 건수 요약 표."""
+    categories = order_categories(df['category'].map(normalize_category).unique()) if 'category' in df else []
+    rows = []
+    for target, host_df in df.groupby('target', sort=True):
+        score, grade, vuln_count, integrity = get_metrics(host_df)
+        fails = host_df[host_df['status'] == 'FAIL']['category'].map(normalize_category).value_counts()
+        rows.append([target, len(host_df), vuln_count, round(score, 1), grade, round(integrity, 1)]
+                    + [int(fails.get(cat, 0)) for cat in categories])
+    return SUMMARY_HEADERS + [f"취약({cat})" for cat in categories], rows
+
+
+def to_fleet_excel(df, constant_memory=False):
+    """전 서버 통합 보고서: 요약 시트 1장 + 서버별 시트."""
+    output = io.BytesIO()
+    workbook = open_workbook(output, constant_memory)
+    formats = add_formats(workbook)
+
+    headers, rows = build_fleet_summary(df)
+    summary = workbook.add_worksheet('전체_요약')
+    summary.write(0, 0, "◐ 전 서버 보안 취약점 점검 요약", formats['title'])
+    summary.write_row(1, 0, ["서버 수", f"{len(rows)} 대", "생성 일시", datetime.now().strftime('%Y-%m-%d %H:%M')])
+    summary.write_row(3, 0, headers, formats['header'])
+    for offset, values in enumerate(rows):
+        summary.write_row(4 + offset, 0, values, formats['default'])
+    summary.set_column(0, len(headers) - 1, 16)
+
+    used = {'전체_요약'}
+    for target, host_df in df.groupby('target', sort=True):
+        write_report_sheet(workbook, _sheet_name(target, used), host_df, formats, constant_memory)
+
+    workbook.close()
+    return output.getvalue()
@@ -0,0 +1,185 @@
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from fleet_matrix import StatusMatrix, host_cells
+from metrics import compute_host_metrics
+from result_schema import ResultParseError, build_frame, loads_lenient, normalize_record
+
+# --- 결과 파일 증분 로더 ---
+# ./results 를 매 rerun 마다 전부 json.load 하지 않도록 (경로, mtime, size) 인덱스를 유지하고
+# 추가/변경된 파일만 다시 파싱한다. 변경이 없으면 os.scandir 1회로 끝난다.
+
+
+def read_result_file(path):
+    """결과 JSON 파일 1개를 공통 스키마 레코드로 변환한다. 실패 시 ResultParseError."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = loads_lenient(f.read())
+    except (OSError, ValueError) as e:
+        raise ResultParseError(str(e)) from e
+    # 파일명에서 타겟 정보 추출
+    return normalize_record(data, os.path.basename(path).split('_')[0])
+
+
+def _date_key(value):
+    # 최신 행 선정용 정렬 키 (파싱 불가 날짜는 가장 오래된 것으로 취급)
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        parsed = pd.to_datetime(value, errors='coerce')
+        return datetime.min if pd.isna(parsed) else parsed.to_pydatetime()
+
+
+def _row_key(record):
+    return record['target'], record['check_id']
+
+
+class ResultLoader:
+    """(target, check_id) 별 최신 결과만 담은 DataFrame 을 증분 갱신으로 유지한다."""
+
+    def __init__(self, results_path="./results"):
+        self.results_path = results_path
+        self.version = 0            # 결과 집합이 바뀔 때마다 증가 (캐시 키 용도)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._index = {}            # path -> (mtime_ns, size)
+        self._records = {}          # path -> 파싱된 행
+        self._by_key = {}           # (target, check_id) -> {path, ...}
+        self._latest = {}           # (target, check_id) -> 최신 행의 path
+        self._frame = pd.DataFrame()
+        self._metrics = {}          # host -> compute_host_metrics() 결과 (변경된 서버만 재계산)
+        self._matrix = StatusMatrix()   # 서버 x 항목 상태 행렬 (변경된 서버 행만 교체)
+        self._errors = {}           # path -> 파싱 실패 사유
+        self.version += 1
+
+    def _scan(self):
+        entries = {}
+        try:
+            with os.scandir(self.results_path) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    entries[entry.path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+        return entries
+
+    def _forget(self, path, dirty):
+        self._index.pop(path, None)
+        self._errors.pop(path, None)
+        record = self._records.pop(path, None)
+        if record is None:
+            return
+        key = _row_key(record)
+        paths = self._by_key.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self._by_key[key]
+        dirty.add(key)
+
+    def _pick_latest(self, key):
+        paths = self._by_key.get(key)
+        if not paths:
+            self._latest.pop(key, None)
+            return
+        # check_date 최신 우선, 동일 시각이면 경로명 순으로 고정
+        self._latest[key] = max(
+            paths, key=lambda p: (_date_key(self._records[p].get('check_date', '')), p)
+        )
+
+    def load(self):
+        """변경분만 반영한 최신 DataFrame 을 반환한다. 반환값은 공유 캐시이므로 수정하지 말 것."""
+        with self._lock:
+            entries = self._scan()
+            if entries is None:
+                if self._index:
+                    self._reset()
+                return pd.DataFrame()
+
+            changed = {p: sig for p, sig in entries.items() if self._index.get(p) != sig}
+            removed = [p for p in self._index if p not in entries]
+            return self._apply(changed, removed)
+
+    def refresh_paths(self, paths):
+        """폴더를 훑지 않고 지정한 파일만 다시 반영한다 (변경 일지 기반 갱신). 없는 파일은 삭제로 처리."""
+        with self._lock:
+            changed, removed = {}, []
+            for path in paths:
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    if path in self._index:
+                        removed.append(path)
+                    continue
+                sig = (st.st_mtime_ns, st.st_size)
+                if self._index.get(path) != sig:
+                    changed[path] = sig
+            return self._apply(changed, removed)
+
+    def refresh_all(self, results_path=None):
+        # 로더는 자신의 결과 폴더만 다룬다
+        return self.load()
+
+    def latest_frame(self):
+        """마지막으로 반영된 DataFrame (폴더를 다시 훑지 않음)."""
+        return self._frame
+
+    def _apply(self, changed, removed):
+        if not changed and not removed:
+            return self._frame
+
+        dirty = set()
+        for path in removed:
+            self._forget(path, dirty)
+        for path, sig in changed.items():
+            self._forget(path, dirty)
+            self._index[path] = sig
+            try:
+                record = read_result_file(path)
+            except ResultParseError as e:
+                self._errors[path] = str(e)
+                continue
+            key = _row_key(record)
+            self._records[path] = record
+            self._by_key.setdefault(key, set()).add(path)
+            dirty.add(key)
+
+        for key in dirty:
+            self._pick_latest(key)
+
+        self._frame = build_frame([self._records[p] for p in self._latest.values()])
+        self._refresh_metrics({key[0] for key in dirty})
+        self.version += 1
+        return self._frame
+
+    def _refresh_metrics(self, hosts):
+        for host in hosts:
+            host_df = self._frame[self._frame['target'] == host] if not self._frame.empty else self._frame
+            if host_df.empty:
+                self._metrics.pop(host, None)
+                self._matrix.drop_host(host)
+            else:
+                self._metrics[host] = compute_host_metrics(host_df)
+                self._matrix.set_host(host, host_cells(host_df))
+
+    def host_metrics(self, host):
+        """수집 시점에 계산해 둔 서버 지표. 결과가 없으면 None."""
+        return self._metrics.get(host)
+
+    def status_matrix(self):
+        """전체 서버 현황 행렬 (fleet_matrix.StatusMatrix). 결과 반영 시 바뀐 서버만 갱신되어 있다."""
+        return self._matrix
+
+    def parse_errors(self):
+        """해석하지 못한 결과 파일 목록 [(path, 사유), ...]."""
+        with self._lock:
+            return sorted(self._errors.items())
@@ -0,0 +1,157 @@
+import json
+import re
+
+import pandas as pd
+
+# --- 점검 결과 스키마 정규화 ---
+# 점검 스크립트의 출력 형식은 두 가지가 섞여 있다.
+#   구 형식: check_id / evidence / guide / check_date ...
+#   신 형식: item_code / raw_evidence(JSON 문자열: command, detail, guide, target_file) / scan_date
+# 수집 시 1회만 공통 컬럼으로 풀어 두고, 대시보드/보고서/저장소는 공통 컬럼만 사용한다.
+
+# 공통 컬럼 (없으면 빈 문자열로 채움). check_date 는 DataFrame 생성 시 datetime 으로 변환
+RESULT_COLUMNS = [
+    'target', 'db_type', 'check_id', 'category', 'title', 'importance', 'status',
+    'evidence', 'guide', 'target_file', 'file_hash', 'command', 'check_date',
+    'action_type', 'action_result', 'action_log', 'action_date',
+]
+
+# 신 형식 -> 공통 컬럼 이름
+FIELD_ALIASES = {
+    'item_code': 'check_id',
+    'item_id': 'check_id',
+    'scan_date': 'check_date',
+}
+
+# raw_evidence 안의 키 -> 공통 컬럼 이름
+RAW_EVIDENCE_FIELDS = {
+    'detail': 'evidence',
+    'guide': 'guide',
+    'target_file': 'target_file',
+    'command': 'command',
+}
+
+
+# 스크립트 출력에서 결과 JSON 이 시작될 수 있는 위치 (heredoc 으로 줄 맨 앞에 '{' 를 출력)
+OBJECT_START = re.compile(r'^[ \t]*\{', re.MULTILINE)
+ANY_OBJECT_START = re.compile(r'\{')
+
+# 셸 스크립트가 역슬래시를 이스케이프하지 않아 생기는 잘못된 이스케이프 (예: "find / \( -nouser ...")
+JSON_ESCAPE = re.compile(r'\\(["\\/bfnrtu]?)')
+
+
+class ResultParseError(ValueError):
+    """결과 파일을 점검 결과 레코드로 해석할 수 없을 때."""
+
+
+def _fix_escapes(text):
+    # 올바른 이스케이프는 그대로 두고, 짝이 없는 역슬래시만 이중화한다 (유효한 JSON 은 변하지 않음)
+    return JSON_ESCAPE.sub(lambda m: m.group(0) if m.group(1) else '\\\\', text)
+
+
+def loads_lenient(text):
+    """스크립트 출력 JSON 해석. 제어문자와 잘못된 역슬래시 이스케이프는 허용한다."""
+    try:
+        return json.loads(text, strict=False)
+    except ValueError:
+        fixed = _fix_escapes(text)
+        if fixed == text:
+            raise
+        return json.loads(fixed, strict=False)
+
+
+def extract_result_json(text):
+    """스크립트 stdout 에서 마지막 최상위 JSON 객체를 꺼낸다.
+    '{' 부터 마지막 '}' 까지 통째로 잡는 정규식과 달리 진단 메시지의 중괄호에 영향받지 않는다."""
+    text = _fix_escapes(text)
+    # 줄 맨 앞의 '{' 만 먼저 시도하고, 없으면 모든 '{' 위치를 시도
+    found = _last_object(text, OBJECT_START) or _last_object(text, ANY_OBJECT_START)
+    if found is None:
+        raise ResultParseError("no JSON object in output")
+    return found
+
+
+def _last_object(text, pattern):
+    decoder = json.JSONDecoder(strict=False)
+    found, end = None, 0
+    for m in pattern.finditer(text):
+        pos = m.end() - 1
+        if pos < end:
+            continue
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            found = obj
+    return found
+
+
+def classify_db_type(target, check_id):
+    # check_id 시작 문자로 시스템/DB 분류
+    if 'D' in str(check_id).upper():
+        if "Rocky9" in target:
+            return "MySQL"
+        return "PostgreSQL"
+    return "OS"
+
+
+def decode_raw_evidence(value):
+    """raw_evidence(이스케이프된 JSON 문자열 또는 dict)를 dict 로 푼다. JSON 이 아니면 detail 로 취급."""
+    if isinstance(value, dict):
+        return value
+    if value is None or value == "":
+        return {}
+    try:
+        decoded = loads_lenient(str(value))
+    except ValueError:
+        return {'detail': str(value)}
+    return decoded if isinstance(decoded, dict) else {'detail': str(value)}
+
+
+def normalize_record(data, target):
+    """스크립트 출력 dict 1건을 공통 컬럼 레코드로 변환한다. 알 수 없는 키는 그대로 보존."""
+    if not isinstance(data, dict):
+        raise ResultParseError(f"JSON object expected, got {type(data).__name__}")
+
+    record = {}
+    for key, value in data.items():
+        if key == 'raw_evidence':
+            continue
+        name = FIELD_ALIASES.get(key, key)
+        # 같은 의미의 키가 둘 다 있으면 공통 이름 쪽을 우선
+        if name != key and data.get(name) not in (None, ""):
+            continue
+        record[name] = value
+
+    if 'raw_evidence' in data:
+        for key, value in decode_raw_evidence(data['raw_evidence']).items():
+            name = RAW_EVIDENCE_FIELDS.get(key, key)
+            if record.get(name) in (None, ""):
+                record[name] = value
+
+    check_id = str(record.get('check_id') or "").strip()
+    if not check_id:
+        raise ResultParseError("check_id/item_code missing")
+    record['check_id'] = check_id
+    record['target'] = target
+    record['db_type'] = classify_db_type(target, check_id)
+    record['status'] = str(record.get('status') or "").strip().upper()
+
+    for column in RESULT_COLUMNS:
+        value = record.get(column)
+        record[column] = "" if value is None else value
+    return record
+
+
+def build_frame(rows):
+    # 수집 시 1회 정리: 공통 컬럼 보장, 결측/무한값 치환, 날짜 변환, check_id 순 정렬
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df = df.reindex(columns=RESULT_COLUMNS + [c for c in df.columns if c not in RESULT_COLUMNS])
+    df = df.fillna("")
+    df = df.replace([float('inf'), float('-inf')], 0)
+    df['check_date'] = pd.to_datetime(df['check_date'], errors='coerce')
+    df = df.sort_values(by=['check_id', 'target'], kind='stable')
+    return df.reset_index(drop=True)
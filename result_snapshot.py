@@ -0,0 +1,105 @@
+import threading
+
+import pandas as pd
+
+from report_writer import report_fingerprint
+
+# --- 세션 공유 결과 스냅샷 ---
+# Streamlit 은 브라우저 세션마다 스크립트를 처음부터 다시 실행하므로, 세션마다 서버별 필터/보고서 지문/
+# 취약 목록을 따로 만들면 작업과 메모리가 세션 수만큼 늘어난다.
+# 결과가 바뀔 때 1회만 읽기 전용 스냅샷을 만들어 참조를 통째로 교체하고, 세션은 스냅샷이 한 번 만들어 둔
+# 서버별 뷰를 함께 쓴다. 실행 중에 교체되어도 세션은 처음 받은 스냅샷을 끝까지 사용한다.
+
+
+class ResultSnapshot:
+    """한 시점의 최신 결과 (읽기 전용). frame 과 뷰들은 모든 세션이 공유하므로 수정하지 말 것."""
+
+    def __init__(self, frame, version):
+        self.frame = frame
+        self.version = version
+        # 서버별 행 위치는 스냅샷 생성 시 1회만 계산
+        self._positions = frame.groupby('target', sort=True).indices if not frame.empty else {}
+        self._memo = {}
+        # 뷰를 만들다가 다른 뷰를 참조할 수 있어 재진입 가능한 잠금
+        self._lock = threading.RLock()
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def hosts(self):
+        return list(self._positions)
+
+    def _cached(self, key, build):
+        # 세션이 동시에 같은 뷰를 요청해도 1회만 생성
+        value = self._memo.get(key)
+        if value is None:
+            with self._lock:
+                value = self._memo.get(key)
+                if value is None:
+                    value = self._memo[key] = build()
+        return value
+
+    def host_view(self, host, db_types=None):
+        """서버(및 db_type) 결과. 스냅샷당 1회만 만들어 공유한다."""
+        key = ('host', host, tuple(db_types) if db_types else None)
+
+        def build():
+            if db_types:
+                view = self.host_view(host)
+                return view[view['db_type'].isin(db_types)].reset_index(drop=True)
+            positions = self._positions.get(host)
+            if positions is None:
+                return self.frame.iloc[0:0]
+            return self.frame.take(positions).reset_index(drop=True)
+
+        return self._cached(key, build)
+
+    def check_view(self, check_id):
+        """항목 1개의 서버별 최신 결과 (서버 이름 순)."""
+        def build():
+            positions = self._cached(('check_positions',), lambda: (
+                self.frame.groupby('check_id', sort=False).indices if not self.frame.empty else {}
+            )).get(check_id)
+            if positions is None:
+                return self.frame.iloc[0:0]
+            return self.frame.take(positions).sort_values('target', kind='stable').reset_index(drop=True)
+
+        return self._cached(('check', check_id), build)
+
+    def fingerprint(self, host):
+        """서버 보고서 캐시 키 (report_writer.report_fingerprint). 세션마다 다시 해시하지 않는다."""
+        return self._cached(('fingerprint', host), lambda: report_fingerprint(self.host_view(host)))
+
+    def fail_items(self):
+        """[(서버, 항목)] — 취약(FAIL) 항목 목록 (일괄 조치 선택지)."""
+        def build():
+            if self.frame.empty:
+                return []
+            fails = self.frame[self.frame['status'] == 'FAIL']
+            return sorted(zip(fails['target'], fails['check_id']))
+
+        return self._cached(('fail_items',), build)
+
+
+class SharedResults:
+    """프로세스당 1개: 변경 반영(WatchedSource) 후 결과 버전이 바뀐 경우에만 스냅샷을 새로 만든다."""
+
+    def __init__(self, watched):
+        self._watched = watched
+        self._lock = threading.Lock()
+        self._snapshot = ResultSnapshot(pd.DataFrame(), None)
+
+    @property
+    def source(self):
+        # 지표/이력 조회용 원본 (ResultLoader 또는 ResultStore)
+        return self._watched.source
+
+    def snapshot(self):
+        with self._lock:
+            frame = self._watched.load()
+            version = self._watched.source.version
+            if version != self._snapshot.version:
+                # 참조 교체는 원자적: 이전 스냅샷을 쓰는 세션은 영향받지 않음
+                self._snapshot = ResultSnapshot(frame, version)
+            return self._snapshot
@@ -0,0 +1,450 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+import pandas as pd
+
+import fleet_matrix
+import scan_delta
+import score_history
+from metrics import compute_host_metrics
+from result_loader import read_result_file
+from result_schema import ResultParseError, build_frame, extract_result_json, loads_lenient, normalize_record
+
+# --- SQLite 결과 저장소 ---
+# 점검 결과를 (host, check_id, check_date) 단위로 누적 보관한다.
+# 파일을 덮어쓰던 방식과 달리 이력이 남고, 대시보드는 "호스트/항목별 최신" 을 인덱스 조회 1회로 읽는다.
+
+DEFAULT_DB_PATH = "./results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    host        TEXT NOT NULL,
+    check_id    TEXT NOT NULL,
+    check_date  TEXT NOT NULL,
+    status      TEXT,
+    source      TEXT,
+    payload     TEXT NOT NULL,
+    PRIMARY KEY (host, check_id, check_date)
+);
+CREATE TABLE IF NOT EXISTS host_metrics (
+    host        TEXT PRIMARY KEY,
+    score       REAL NOT NULL,
+    grade       TEXT NOT NULL,
+    vuln_count  INTEGER NOT NULL,
+    integrity   REAL NOT NULL,
+    total       INTEGER NOT NULL,
+    categories  TEXT NOT NULL,
+    updated     TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path        TEXT PRIMARY KEY,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parse_errors (
+    path        TEXT PRIMARY KEY,
+    reason      TEXT NOT NULL,
+    updated     TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+"""
+
+INSERT_RESULT_SQL = (
+    "INSERT OR REPLACE INTO results (host, check_id, check_date, status, source, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+LATEST_SQL = """
+SELECT r.payload
+FROM results r
+JOIN (
+    SELECT host, check_id, MAX(check_date) AS check_date
+    FROM results
+    GROUP BY host, check_id
+) m ON m.host = r.host AND m.check_id = r.check_id AND m.check_date = r.check_date
+"""
+
+LATEST_FOR_HOST_SQL = """
+SELECT r.payload
+FROM results r
+JOIN (
+    SELECT check_id, MAX(check_date) AS check_date
+    FROM results
+    WHERE host = ?
+    GROUP BY check_id
+) m ON r.host = ? AND m.check_id = r.check_id AND m.check_date = r.check_date
+"""
+
+
+def _source_name(path):
+    # Rocky9_check_U01.json -> check_U01 (스크립트 이름 부분)
+    name = os.path.basename(path)[:-len(".json")]
+    return name.split('_', 1)[1] if '_' in name else name
+
+
+def record_to_row(record, source=""):
+    check_date = record.get('check_date', '')
+    return (
+        record['target'],
+        record['check_id'],
+        "" if check_date is None else str(check_date),
+        record.get('status', ''),
+        source,
+        json.dumps(record, ensure_ascii=False, default=str),
+    )
+
+
+class ResultStore:
+    """WAL 모드 SQLite 결과 저장소. 읽기 연결은 여러 스레드에서 공유한다."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.executescript(score_history.SCHEMA)
+        self._conn.executescript(fleet_matrix.SCHEMA)
+        self._conn.executescript(scan_delta.SCHEMA)
+        self._cached_version = None
+        self._cached_frame = pd.DataFrame()
+        self.version = 0            # 최신 결과 DataFrame 이 새로 만들어질 때마다 증가 (캐시 키 용도)
+        self._matrix = fleet_matrix.StatusMatrix()
+        self._matrix_seen = {}      # host -> 행렬에 반영한 host_status.revision
+
+    def close(self):
+        self._conn.close()
+
+    def insert_records(self, rows):
+        """record_to_row() 형식의 행들을 트랜잭션 1회로 일괄 저장한다."""
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT_RESULT_SQL, rows)
+            scan_delta.record(self._conn, rows)
+        self.refresh_host_metrics({row[0] for row in rows})
+        self._cached_version = None
+
+    def ingest_dir(self, results_path):
+        """결과 폴더에서 새로 생기거나 바뀐 JSON 파일만 읽어 저장한다. 저장한 행 수를 반환."""
+        if not os.path.isdir(results_path):
+            return 0
+        with self._lock:
+            known = {p: (m, s) for p, m, s in self._conn.execute("SELECT path, mtime_ns, size FROM ingested_files")}
+        candidates = []
+        with os.scandir(results_path) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                st = entry.stat()
+                sig = (st.st_mtime_ns, st.st_size)
+                if known.get(entry.path) != sig:
+                    candidates.append((entry.path, sig))
+        return self._ingest_files(candidates)
+
+    def refresh_paths(self, paths):
+        """폴더를 훑지 않고 지정한 결과 파일만 (바뀐 경우) 저장한다 (변경 일지 기반 갱신)."""
+        candidates = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                # 결과 파일이 지워져도 DB 이력은 남긴다
+                continue
+            with self._lock:
+                known = self._conn.execute(
+                    "SELECT mtime_ns, size FROM ingested_files WHERE path = ?", (path,)
+                ).fetchone()
+            sig = (st.st_mtime_ns, st.st_size)
+            if known != sig:
+                candidates.append((path, sig))
+        return self._ingest_files(candidates)
+
+    def refresh_all(self, results_path):
+        return self.ingest_dir(results_path)
+
+    def _ingest_files(self, candidates):
+        rows, seen, errors = [], [], []
+        for path, sig in candidates:
+            seen.append((path, sig[0], sig[1]))
+            try:
+                record = read_result_file(path)
+            except ResultParseError as e:
+                errors.append((path, str(e)))
+                continue
+            rows.append(record_to_row(record, _source_name(path)))
+        if not seen:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT_RESULT_SQL, rows)
+            scan_delta.record(self._conn, rows)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ingested_files (path, mtime_ns, size) VALUES (?, ?, ?)", seen
+            )
+            # 다시 읽은 파일은 이전 실패 기록을 지우고, 이번에 실패한 파일만 남김
+            self._conn.executemany("DELETE FROM parse_errors WHERE path = ?", [(p,) for p, _, _ in seen])
+            self._conn.executemany("INSERT INTO parse_errors (path, reason) VALUES (?, ?)", errors)
+        self.refresh_host_metrics({row[0] for row in rows})
+        self._cached_version = None
+        return len(rows)
+
+    def ingest_ndjson(self, path, results_path=None, batch_size=500):
+        """결과 스트림(NDJSON, 1줄 = {"host", "key", "result"|"stdout"|"error"})을 줄 단위로 읽어 저장한다.
+        results_path 를 주면 기존 규칙(<host>_<key>.json)의 결과 파일도 함께 남긴다. 저장한 행 수를 반환."""
+        rows, written, errors, total = [], [], [], 0
+        touched = set()
+
+        def flush():
+            with self._lock, self._conn:
+                self._conn.executemany(INSERT_RESULT_SQL, rows)
+                scan_delta.record(self._conn, rows)
+                # 직접 저장한 결과 파일은 ingest_dir() 가 다시 읽지 않도록 표시
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ingested_files (path, mtime_ns, size) VALUES (?, ?, ?)", written
+                )
+            touched.update(row[0] for row in rows)
+            del rows[:], written[:]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = loads_lenient(line)
+                    host, key = entry['host'], entry['key']
+                except (ValueError, KeyError, TypeError) as e:
+                    errors.append((f"{path}:{lineno}", f"invalid stream line: {e}"))
+                    continue
+                try:
+                    if 'error' in entry:
+                        raise ResultParseError(entry['error'])
+                    data = entry['result'] if 'result' in entry else extract_result_json(entry.get('stdout', ""))
+                    record = normalize_record(data, host)
+                except ResultParseError as e:
+                    errors.append((f"{path}#{host}/{key}", str(e)))
+                    continue
+
+                if results_path:
+                    dest = os.path.join(results_path, f"{host}_{key}.json")
+                    with open(dest, 'w', encoding='utf-8') as out:
+                        json.dump(data, out, ensure_ascii=False, indent=4)
+                    st = os.stat(dest)
+                    written.append((dest, st.st_mtime_ns, st.st_size))
+                rows.append(record_to_row(record, key))
+                total += 1
+                if len(rows) >= batch_size:
+                    flush()
+
+        flush()
+        # 지표/점수 이력은 스트림을 다 적재한 뒤 1회만 (배치 경계에서 반쯤 적재된 점검이 이력 점으로 남지 않도록)
+        self.refresh_host_metrics(touched)
+        with self._lock, self._conn:
+            # 이 스트림에서 나온 이전 실패 기록(<path>:<줄> / <path>#<host>/<key>)은 새 결과로 교체
+            self._conn.execute(
+                "DELETE FROM parse_errors WHERE substr(path, 1, ?) = ? AND substr(path, ?, 1) IN (':', '#')",
+                (len(path), path, len(path) + 1),
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO parse_errors (path, reason) VALUES (?, ?)", errors)
+        self._cached_version = None
+        return total
+
+    def refresh_host_metrics(self, hosts):
+        """결과가 바뀐 서버의 지표를 최신 결과 기준으로 다시 계산해 host_metrics 에 저장한다.
+        같은 지표를 그 서버의 최신 점검 시각으로 점수 이력(score_history)에도 남기고,
+        전체 서버 현황 셀(host_status)도 함께 갱신한다."""
+        updates, history, frames = [], [], []
+        for host in hosts:
+            frame = self._latest_for_host(host)
+            frames.append((host, frame))
+            m = compute_host_metrics(frame)
+            updates.append((host, m['score'], m['grade'], m['vuln_count'], m['integrity'], m['total'],
+                            json.dumps(m['categories'], ensure_ascii=False)))
+            scan_date = score_history.scan_date_of(frame)
+            if scan_date:
+                history.append((host, scan_date, m))
+        if not updates:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO host_metrics "
+                "(host, score, grade, vuln_count, integrity, total, categories) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                updates,
+            )
+            for host, scan_date, m in history:
+                score_history.record(self._conn, host, scan_date, m)
+            for host, frame in frames:
+                fleet_matrix.record(self._conn, host, frame)
+
+    def _latest_for_host(self, host):
+        with self._lock:
+            payloads = [row[0] for row in self._conn.execute(LATEST_FOR_HOST_SQL, (host, host))]
+        return build_frame([json.loads(p) for p in payloads])
+
+    def status_matrix(self):
+        """전체 서버 현황 행렬 (fleet_matrix.StatusMatrix). host_status 의 revision 이 바뀐 서버만 다시 읽는다."""
+        with self._lock:
+            # 이 기능 이전에 수집된 DB: 셀이 없는 서버는 최신 결과로 1회 채움
+            missing = [row[0] for row in self._conn.execute(
+                "SELECT host FROM host_metrics WHERE host NOT IN (SELECT host FROM host_status)"
+            )]
+        if missing:
+            frames = [(host, self._latest_for_host(host)) for host in missing]
+            with self._lock, self._conn:
+                for host, frame in frames:
+                    fleet_matrix.record(self._conn, host, frame)
+        with self._lock:
+            fleet_matrix.sync(self._conn, self._matrix, self._matrix_seen)
+        return self._matrix
+
+    def host_metrics(self, host):
+        """수집 시점에 저장해 둔 서버 지표 (host_metrics 테이블 1행 조회). 없으면 None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, grade, vuln_count, integrity, total, categories FROM host_metrics WHERE host = ?",
+                (host,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'score': row[0], 'grade': row[1], 'vuln_count': row[2], 'integrity': row[3],
+            'total': row[4], 'categories': json.loads(row[5]),
+        }
+
+    def parse_errors(self):
+        """해석하지 못한 결과 파일 목록 [(path, 사유), ...]."""
+        with self._lock:
+            return self._conn.execute("SELECT path, reason FROM parse_errors ORDER BY path").fetchall()
+
+    def data_version(self):
+        # 다른 연결(수집 명령 등)이 커밋할 때마다 값이 바뀐다
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def latest_frame(self):
+        """호스트/항목별 최신 결과 DataFrame. DB 가 바뀌지 않았으면 캐시를 그대로 반환한다."""
+        version = self.data_version()
+        if version == self._cached_version:
+            return self._cached_frame
+        with self._lock:
+            payloads = [row[0] for row in self._conn.execute(LATEST_SQL)]
+        self._cached_frame = build_frame([json.loads(p) for p in payloads])
+        self._cached_version = version
+        self.version += 1
+        return self._cached_frame
+
+    # ResultLoader 와 같은 인터페이스
+    load = latest_frame
+
+    def score_trend(self, host, days=None):
+        """서버 보안 점수 추이 (score_history.TREND_COLUMNS)."""
+        with self._lock:
+            return score_history.score_trend(self._conn, host, days)
+
+    def category_trend(self, host, category=None, days=None):
+        """카테고리별 취약 건수 추이 (score_history.CATEGORY_TREND_COLUMNS)."""
+        with self._lock:
+            return score_history.category_trend(self._conn, host, category, days)
+
+    def compact_history(self, force=False):
+        """보존 기간이 지난 점수 이력을 일 단위 요약으로 압축한다. 압축 주기 전이면 None."""
+        with self._lock, self._conn:
+            if not force and not score_history.compact_due(self._conn):
+                return None
+            return score_history.compact(self._conn)
+
+    def changes(self, host=None, since=None, kinds=None):
+        """지난 점검 대비 변경 (scan_delta.CHANGE_COLUMNS). 수집 시 만들어 둔 변경 기록만 읽는다."""
+        with self._lock:
+            return scan_delta.changes(self._conn, host, since, kinds)
+
+    def history(self, host, check_id=None):
+        """호스트(및 항목)의 전체 점검 이력을 최신순으로 반환한다."""
+        sql = "SELECT host, check_id, check_date, status, source FROM results WHERE host = ?"
+        params = [host]
+        if check_id:
+            sql += " AND check_id = ?"
+            params.append(check_id)
+        sql += " ORDER BY check_id, check_date DESC"
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+
+def split_bundle(bundle_path, results_path):
+    """run_check_bundle.py 의 호스트별 문서를 기존 규칙(<host>_<script>.json)의 결과 파일로 풀어쓴다."""
+    with open(bundle_path, 'r', encoding='utf-8') as f:
+        bundle = json.load(f)
+    host = bundle.get('host') or os.path.basename(bundle_path)[:-len(".json")]
+    os.makedirs(results_path, exist_ok=True)
+    for key, data in bundle.get('results', {}).items():
+        with open(os.path.join(results_path, f"{host}_{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+    return len(bundle.get('results', {}))
+
+
+def _expand_paths(paths, suffix):
+    # 폴더는 그 안의 <suffix> 파일들로 펼침
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, n) for n in os.listdir(path) if n.endswith(suffix)))
+        else:
+            files.append(path)
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="점검 결과 JSON 을 SQLite 저장소로 수집")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="결과 폴더의 신규/변경 JSON 파일 일괄 저장")
+    ingest.add_argument("paths", nargs="*", default=["./results"])
+    ingest.add_argument("--db", default=DEFAULT_DB_PATH)
+    bundle = sub.add_parser("ingest-bundle", help="번들 실행 결과 문서를 결과 파일로 풀고 저장")
+    bundle.add_argument("bundles", nargs="*", default=["./bundles"])
+    bundle.add_argument("--results", default="./results")
+    bundle.add_argument("--db", default=DEFAULT_DB_PATH)
+    collect = sub.add_parser("collect", help="결과 스트림(NDJSON)을 줄 단위로 읽어 저장")
+    # 기본 폴더를 두지 않는다 (빈 목록이 ./streams 의 이전 실행 스트림 전체 재적재로 바뀌지 않도록)
+    collect.add_argument("streams", nargs="+", help="<host>.ndjson 파일 또는 폴더")
+    collect.add_argument("--results", default=None, help="결과 파일(<host>_<key>.json)도 남길 폴더")
+    collect.add_argument("--db", default=DEFAULT_DB_PATH)
+    compact = sub.add_parser("compact", help="오래된 점수 이력을 일 단위 요약으로 압축 (cron 용)")
+    compact.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        store = ResultStore(args.db)
+        try:
+            days, category_days = store.compact_history(force=True)
+        finally:
+            store.close()
+        print(f"compacted {days} host-days, {category_days} category-days in {args.db}")
+        return 0
+
+    if args.command == "ingest-bundle":
+        for path in _expand_paths(args.bundles, ".json"):
+            split_bundle(path, args.results)
+        args.paths = [args.results]
+    elif args.command == "collect" and args.results:
+        os.makedirs(args.results, exist_ok=True)
+
+    store = ResultStore(args.db)
+    try:
+        if args.command == "collect":
+            total = sum(store.ingest_ndjson(path, args.results) for path in _expand_paths(args.streams, ".ndjson"))
+        else:
+            total = sum(store.ingest_dir(path) for path in args.paths)
+        failed = store.parse_errors()
+        # 수집이 끝날 때 하루 1회 점수 이력 압축 (별도 스케줄러가 없어도 정기적으로 수행)
+        store.compact_history()
+    finally:
+        store.close()
+    print(f"ingested {total} rows into {args.db}")
+    for path, reason in failed:
+        print(f"parse error: {path}: {reason}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+import collections
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+# --- 결과 폴더 감시 ---
+# ./results, ./fix_logs 에 파일이 써질 때마다 변경 일지(journal)에 (순번, 경로) 를 남긴다.
+# 리눅스는 inotify(ctypes, 추가 패키지 없음), 그 외/실패 시에는 주기적 scandir 비교로 대체한다.
+# 대시보드는 순번이 바뀌었을 때만 화면을 갱신하고, 일지에 적힌 파일만 다시 읽는다.
+
+DEFAULT_PATHS = ("./results", "./fix_logs")
+POLL_INTERVAL = 1.0
+# 일지 보관 건수. 이보다 많이 밀리면 소비자는 전체 재검사로 전환
+JOURNAL_SIZE = 10000
+
+# <linux/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+# 쓰기가 끝난 파일(close_write)과 원자적 교체(ansible copy 의 rename)만 본다. 생성 직후는 내용이 불완전
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class ChangeJournal:
+    """(순번, 경로) 일지. changes_since() 로 소비자별 커서 이후 변경 경로만 꺼낸다."""
+
+    def __init__(self, size=JOURNAL_SIZE):
+        self._entries = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.seq = 0
+        self._reset_seq = 0     # 이 순번 이하 커서는 전체 재검사 필요 (큐 넘침 등)
+
+    def append(self, path):
+        with self._lock:
+            self.seq += 1
+            self._entries.append((self.seq, path))
+
+    def reset(self):
+        # 일부 이벤트를 놓쳤을 때: 모든 소비자가 전체 재검사하도록 표시
+        with self._lock:
+            self.seq += 1
+            self._reset_seq = self.seq
+
+    def changes_since(self, cursor):
+        """(새 커서, 변경 경로 집합). 경로 집합이 None 이면 일지가 끊겼으므로 전체 재검사."""
+        with self._lock:
+            if cursor is None or cursor < self._reset_seq:
+                return self.seq, None
+            if self._entries and cursor < self._entries[0][0] - 1:
+                return self.seq, None
+            return self.seq, {path for seq, path in self._entries if seq > cursor}
+
+
+def _load_libc():
+    name = ctypes.util.find_library("c")
+    if not name:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _InotifyBackend:
+    name = "inotify"
+
+    def __init__(self, paths, journal):
+        self.journal = journal
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify not available")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {os.path.abspath(p): None for p in paths}    # 폴더 -> watch descriptor
+        self._by_wd = {}
+
+    def _add_missing_watches(self):
+        # 아직 없는 폴더(첫 점검 전 등)는 주기적으로 다시 시도, 생기면 전체 재검사 신호
+        for path, wd in self._dirs.items():
+            if wd is not None:
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[path] = wd
+                self._by_wd[wd] = path
+                self.journal.reset()
+
+    def run(self, stop):
+        try:
+            while not stop.is_set():
+                self._add_missing_watches()
+                ready, _, _ = select.select([self._fd], [], [], POLL_INTERVAL)
+                if ready:
+                    self._read_events()
+        finally:
+            os.close(self._fd)
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size: offset + EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                self.journal.reset()
+                continue
+            directory = self._by_wd.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                # 폴더가 지워지거나 옮겨짐: 다시 생기면 감시 재등록
+                self._by_wd.pop(wd, None)
+                self._dirs[directory] = None
+                self.journal.reset()
+                continue
+            if name:
+                self.journal.append(os.path.join(directory, os.fsdecode(name)))
+
+
+class _PollingBackend:
+    name = "polling"
+
+    def __init__(self, paths, journal):
+        self.journal = journal
+        self._dirs = [os.path.abspath(p) for p in paths]
+        self._index = {d: self._scan(d) for d in self._dirs}
+
+    @staticmethod
+    def _scan(directory):
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        entries[entry.path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def run(self, stop):
+        while not stop.wait(POLL_INTERVAL):
+            for directory in self._dirs:
+                current = self._scan(directory)
+                previous = self._index[directory]
+                for path, sig in current.items():
+                    if previous.get(path) != sig:
+                        self.journal.append(path)
+                for path in previous.keys() - current.keys():
+                    self.journal.append(path)
+                self._index[directory] = current
+
+
+class ResultWatcher:
+    """결과 폴더 감시 스레드. 여러 세션이 공유하도록 프로세스당 1개만 만든다."""
+
+    def __init__(self, paths=DEFAULT_PATHS, use_inotify=True):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.journal = ChangeJournal()
+        self._stop = threading.Event()
+        self._thread = None
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = _InotifyBackend(self.paths, self.journal)
+            except OSError:
+                self.backend = None
+        if self.backend is None:
+            self.backend = _PollingBackend(self.paths, self.journal)
+
+    @property
+    def mode(self):
+        return self.backend.name
+
+    @property
+    def seq(self):
+        return self.journal.seq
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.backend.run, args=(self._stop,),
+                                            name="result-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=POLL_INTERVAL * 2)
+            self._thread = None
+
+    def changes_since(self, cursor):
+        return self.journal.changes_since(cursor)
+
+
+class WatchedSource:
+    """ResultLoader/ResultStore 앞에 두는 갱신기: 일지에 변경이 없으면 폴더를 다시 훑지 않고,
+    변경이 있으면 일지에 적힌 결과 파일만 다시 읽는다. 일지가 끊기면 전체 재검사."""
+
+    def __init__(self, source, watcher, results_path="./results"):
+        self.source = source
+        self.watcher = watcher
+        self.results_path = results_path
+        self._results_dir = os.path.abspath(results_path)
+        self._cursor = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """변경분을 원본 저장소에 반영한다. 반영한 경로 수 (전체 재검사면 -1)."""
+        with self._lock:
+            cursor, paths = self.watcher.changes_since(self._cursor)
+            if paths is None:
+                self.source.refresh_all(self.results_path)
+                count = -1
+            else:
+                # fix_logs 는 results 의 사본이므로 화면 갱신 신호로만 쓰고 다시 읽지 않는다.
+                # 경로는 저장소가 쓰는 형식(<results_path>/<파일명>)으로 맞춘다 (ingested_files 키와 동일)
+                results = [
+                    os.path.join(self.results_path, os.path.basename(p))
+                    for p in sorted(paths) if os.path.dirname(p) == self._results_dir and p.endswith(".json")
+                ]
+                if results:
+                    self.source.refresh_paths(results)
+                count = len(results)
+            self._cursor = cursor
+            return count
+
+    def load(self):
+        self.refresh()
+        return self.source.latest_frame()
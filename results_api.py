@@ -0,0 +1,306 @@
+import argparse
+import collections
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from metrics import compute_host_metrics, grade_for
+from result_loader import ResultLoader
+from result_snapshot import SharedResults
+from result_store import DEFAULT_DB_PATH, ResultStore
+from result_watcher import ResultWatcher, WatchedSource
+from scan_delta import CHANGE_KINDS
+
+# --- 결과 조회 API (읽기 전용, 로컬) ---
+# 티켓 연동/SIEM 수집기가 ./results/*.json 을 직접 긁거나 대시보드를 조작하지 않도록
+# 대시보드와 같은 결과 스냅샷(SharedResults)과 지표(host_metrics)를 HTTP/JSON 으로 내보낸다.
+#   GET /api/hosts                         서버 목록 + 지표
+#   GET /api/hosts/<host>                  서버의 항목별 최신 결과 (?status=FAIL&db_type=OS)
+#   GET /api/hosts/<host>/metrics          서버 지표 (카테고리별 현황 포함)
+#   GET /api/hosts/<host>/history          점검 이력 (?check_id=U-01, 결과 DB 사용 시)
+#   GET /api/hosts/<host>/trend            보안 점수 추이 (?days=30, 결과 DB 사용 시)
+#   GET /api/hosts/<host>/changes          서버의 지난 점검 대비 변경 (결과 DB 사용 시)
+#   GET /api/checks/<check_id>             항목 1개의 서버별 최신 결과 (?status=FAIL)
+#   GET /api/changes                       지난 점검 대비 변경 (?change=new_fail, ?since=<seq> 는 그 이후 기록 전체)
+#   GET /api/metrics                       전체 서버 요약 지표
+# 목록은 ?limit=&offset= 으로 나눠 받고, ETag/If-None-Match 로 바뀌지 않았으면 304 를 돌려준다.
+# 대시보드처럼 Rocky9/ 에서 실행한다:  python3 ../results_api.py --port 8502
+
+DEFAULT_BIND = "127.0.0.1"
+DEFAULT_PORT = 8502
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+# 이보다 작은 응답은 압축 이득이 없어 그대로 보낸다
+GZIP_MIN_BYTES = 1024
+# 같은 결과 버전에서 반복되는 조회는 직렬화한 응답을 그대로 재사용
+RESPONSE_CACHE_SIZE = 64
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+HOST_METRIC_FIELDS = ('score', 'grade', 'vuln_count', 'integrity', 'total')
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def open_shared_results(results_path="./results", db_path=DEFAULT_DB_PATH, watch_paths=("./results", "./fix_logs")):
+    """대시보드와 같은 규칙으로 원본을 고른다: 결과 DB 가 있으면 ResultStore, 없으면 ResultLoader."""
+    source = ResultStore(db_path) if os.path.exists(db_path) else ResultLoader(results_path)
+    watcher = ResultWatcher(watch_paths).start()
+    return SharedResults(WatchedSource(source, watcher, results_path))
+
+
+def records(frame):
+    """DataFrame -> JSON 으로 보낼 dict 목록 (날짜는 문자열, 결측은 null)."""
+    if frame.empty:
+        return []
+    out = frame.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime(DATE_FORMAT)
+    return out.astype(object).where(out.notna(), None).to_dict('records')
+
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def _int_param(query, name, default, minimum=0, maximum=None):
+    raw = _param(query, name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer") from None
+    if value < minimum:
+        raise ApiError(400, f"{name} must be >= {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def paginate(items, query):
+    """[{...}] 또는 DataFrame 을 limit/offset 으로 자른 응답 본문."""
+    limit = _int_param(query, 'limit', DEFAULT_LIMIT, minimum=1, maximum=MAX_LIMIT)
+    offset = _int_param(query, 'offset', 0)
+    page = items.iloc[offset:offset + limit] if isinstance(items, pd.DataFrame) else items[offset:offset + limit]
+    total = len(items)
+    return {
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'next_offset': offset + limit if offset + limit < total else None,
+        'items': records(page) if isinstance(page, pd.DataFrame) else page,
+    }
+
+
+def _filter(frame, query, *columns):
+    # ?status=FAIL&status=PASS 처럼 같은 이름을 여러 번 주면 OR
+    for col in columns:
+        values = query.get(col)
+        if values and not frame.empty:
+            frame = frame[frame[col].isin([v.upper() if col == 'status' else v for v in values])]
+    return frame
+
+
+class ResultsApi:
+    """경로 -> 응답 본문. 같은 결과 버전의 같은 요청은 직렬화 결과를 재사용한다."""
+
+    def __init__(self, shared):
+        self.shared = shared
+        # 프로세스마다 버전이 0 부터 다시 시작하므로 재시작 전 ETag 와 겹치지 않도록 구분자를 붙인다
+        self._instance = f"{os.getpid():x}{int(time.time()):x}"
+        self._responses = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def source(self):
+        return self.shared.source
+
+    def etag(self, snapshot, target):
+        digest = hashlib.sha1(target.encode('utf-8')).hexdigest()[:12]
+        return f'W/"{self._instance}-{snapshot.version}-{digest}"'
+
+    def respond(self, target):
+        """(ETag, JSON bytes). target 은 경로+쿼리 문자열."""
+        snapshot = self.shared.snapshot()
+        etag = self.etag(snapshot, target)
+        with self._lock:
+            cached = self._responses.get(etag)
+            if cached is not None:
+                self._responses.move_to_end(etag)
+                return etag, cached
+        url = urlsplit(target)
+        body = json.dumps(self.route(snapshot, url.path, parse_qs(url.query)),
+                          ensure_ascii=False, default=str).encode('utf-8')
+        with self._lock:
+            self._responses[etag] = body
+            while len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return etag, body
+
+    def route(self, snapshot, path, query):
+        parts = [unquote(p) for p in path.strip('/').split('/')]
+        if parts[:1] != ['api']:
+            raise ApiError(404, "not found")
+        parts = parts[1:]
+        if parts == ['hosts']:
+            return paginate([self.host_summary(snapshot, host) for host in snapshot.hosts()], query)
+        if parts == ['metrics']:
+            return self.fleet_metrics(snapshot)
+        if parts == ['changes']:
+            return self.changes(None, query)
+        if len(parts) == 2 and parts[0] == 'checks':
+            view = _filter(snapshot.check_view(parts[1]), query, 'status', 'db_type')
+            return paginate(view, query)
+        if len(parts) in (2, 3) and parts[0] == 'hosts':
+            host = parts[1]
+            if host not in snapshot.hosts():
+                raise ApiError(404, f"unknown host: {host}")
+            action = parts[2] if len(parts) == 3 else None
+            if action is None:
+                view = _filter(snapshot.host_view(host), query, 'status', 'db_type', 'category')
+                return paginate(view, query)
+            if action == 'metrics':
+                return dict(self.host_metrics(snapshot, host), host=host)
+            if action == 'history':
+                return paginate(self._store_only().history(host, _param(query, 'check_id')), query)
+            if action == 'changes':
+                return self.changes(host, query)
+            if action == 'trend':
+                days = _int_param(query, 'days', None, minimum=1)
+                return paginate(self._store_only().score_trend(host, days), query)
+        raise ApiError(404, "not found")
+
+    def changes(self, host, query):
+        since = _int_param(query, 'since', None)
+        kinds = query.get('change')
+        for kind in kinds or ():
+            if kind not in CHANGE_KINDS:
+                raise ApiError(400, f"change must be one of {', '.join(CHANGE_KINDS)}")
+        return paginate(self._store_only().changes(host, since, kinds), query)
+
+    def _store_only(self):
+        if not isinstance(self.source, ResultStore):
+            raise ApiError(404, "history/changes require the result DB (result_store.py ingest)")
+        return self.source
+
+    def host_metrics(self, snapshot, host):
+        # 수집 시점에 계산해 둔 지표 (대시보드와 동일), 없으면 스냅샷에서 계산
+        metrics = self.source.host_metrics(host)
+        return metrics if metrics is not None else compute_host_metrics(snapshot.host_view(host))
+
+    def host_summary(self, snapshot, host):
+        metrics = self.host_metrics(snapshot, host)
+        return dict({field: metrics[field] for field in HOST_METRIC_FIELDS}, host=host)
+
+    def fleet_metrics(self, snapshot):
+        hosts = [self.host_summary(snapshot, host) for host in snapshot.hosts()]
+        grades = collections.Counter(h['grade'] for h in hosts)
+        average = sum(h['score'] for h in hosts) / len(hosts) if hosts else 0
+        return {
+            'hosts': len(hosts),
+            'checks': sum(h['total'] for h in hosts),
+            'vuln_count': sum(h['vuln_count'] for h in hosts),
+            'score': average,
+            'grade': grade_for(average),
+            'grades': dict(grades),
+        }
+
+
+class ResultsApiHandler(BaseHTTPRequestHandler):
+    server_version = "ResultsApi/1"
+    api = None      # serve() 에서 지정
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        try:
+            etag, body = self.api.respond(self.path)
+        except ApiError as e:
+            self._send_json(e.status, {'error': str(e)}, send_body)
+            return
+        except Exception as e:      # 요청 1건의 실패로 서버가 멈추지 않도록
+            self.log_error("%s: %r", self.path, e)
+            self._send_json(500, {'error': "internal error"}, send_body)
+            return
+
+        if etag in self._if_none_match():
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        encoding = None
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get("Accept-Encoding", ""):
+            body, encoding = gzip.compress(body, compresslevel=5), "gzip"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _if_none_match(self):
+        header = self.headers.get("If-None-Match", "")
+        return {tag.strip() for tag in header.split(',') if tag.strip()}
+
+    def _send_json(self, status, payload, send_body):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def do_POST(self):
+        self._send_json(405, {'error': "read-only API"}, True)
+
+    do_PUT = do_DELETE = do_PATCH = do_POST
+
+
+def serve(shared, bind=DEFAULT_BIND, port=DEFAULT_PORT):
+    handler = type("Handler", (ResultsApiHandler,), {'api': ResultsApi(shared)})
+    return ThreadingHTTPServer((bind, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="점검 결과 조회 API (읽기 전용)")
+    parser.add_argument("--bind", default=DEFAULT_BIND, help="수신 주소 (기본 127.0.0.1, 로컬 전용)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--results", default="./results")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    args = parser.parse_args(argv)
+
+    server = serve(open_shared_results(args.results, args.db), args.bind, args.port)
+    print(f"results API: http://{args.bind}:{server.server_address[1]}/api/hosts")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
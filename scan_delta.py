@@ -0,0 +1,155 @@
+import json
+
+import pandas as pd
+
+# --- 점검 간 변경(드리프트) 색인 ---
+# 결과를 저장할 때 (host, check_id) 마다 직전 점검 결과와 비교해 바뀐 것만 result_changes 에 남긴다.
+#   new_fail : 양호/미점검 -> 취약        fixed : 취약 -> 양호
+#   status   : 그 밖의 상태 변화           file_hash / evidence : 상태는 같고 대상 파일 해시/점검 결과가 바뀜
+# "지난 점검 대비 변경" 화면과 API 는 이 표만 읽으므로, 전체의 2% 가 바뀌었다면 2% 만 읽는다.
+# current = 1 은 그 행이 (host, check_id) 의 최신 결과에 대한 변경이라는 뜻 (다음 점검이 들어오면 0).
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_changes (
+    seq              INTEGER PRIMARY KEY AUTOINCREMENT,
+    host             TEXT NOT NULL,
+    check_id         TEXT NOT NULL,
+    check_date       TEXT NOT NULL,
+    prev_date        TEXT NOT NULL,
+    change           TEXT NOT NULL,
+    status           TEXT,
+    prev_status      TEXT,
+    evidence_changed INTEGER NOT NULL,
+    hash_changed     INTEGER NOT NULL,
+    evidence         TEXT,
+    prev_evidence    TEXT,
+    file_hash        TEXT,
+    prev_hash        TEXT,
+    category         TEXT,
+    title            TEXT,
+    importance       TEXT,
+    current          INTEGER NOT NULL,
+    UNIQUE (host, check_id, check_date)
+);
+CREATE INDEX IF NOT EXISTS result_changes_current ON result_changes (current, host);
+"""
+
+# 화면/보고서 표시 순서 (중요한 변화 먼저)
+CHANGE_KINDS = ['new_fail', 'fixed', 'status', 'file_hash', 'evidence']
+CHANGE_LABELS = {
+    'new_fail': '신규 취약',
+    'fixed': '조치 완료',
+    'status': '상태 변경',
+    'file_hash': '파일 변경',
+    'evidence': '점검 결과 변경',
+}
+
+CHANGE_COLUMNS = [
+    'seq', 'host', 'check_id', 'check_date', 'prev_date', 'change', 'status', 'prev_status',
+    'evidence_changed', 'hash_changed', 'evidence', 'prev_evidence', 'file_hash', 'prev_hash',
+    'category', 'title', 'importance', 'current',
+]
+
+
+def _text(value):
+    # 점검 결과는 문자열/목록/객체가 섞여 있어 비교와 저장은 같은 문자열 표현으로
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.strip()
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def diff(prev, record):
+    """직전 결과(prev) 대비 변경 (change, evidence_changed, hash_changed). 바뀐 것이 없으면 None."""
+    status, prev_status = record.get('status', ''), prev.get('status', '')
+    evidence_changed = _text(record.get('evidence')) != _text(prev.get('evidence'))
+    hash_changed = _text(record.get('file_hash')) != _text(prev.get('file_hash'))
+    if status != prev_status:
+        if status == 'FAIL':
+            change = 'new_fail'
+        elif prev_status == 'FAIL' and status == 'PASS':
+            change = 'fixed'
+        else:
+            change = 'status'
+    elif hash_changed:
+        change = 'file_hash'
+    elif evidence_changed:
+        change = 'evidence'
+    else:
+        return None
+    return change, evidence_changed, hash_changed
+
+
+def _update(conn, host, check_id, check_date, record, latest):
+    prev_row = conn.execute(
+        "SELECT check_date, payload FROM results WHERE host = ? AND check_id = ? AND check_date < ? "
+        "ORDER BY check_date DESC LIMIT 1", (host, check_id, check_date)
+    ).fetchone()
+    prev = None if prev_row is None else json.loads(prev_row[1])
+    found = None if prev is None else diff(prev, record)
+    if found is None:
+        # 첫 점검이거나 바뀐 것이 없음 (다시 수집된 경우 이전 변경 기록도 지움)
+        conn.execute("DELETE FROM result_changes WHERE host = ? AND check_id = ? AND check_date = ?",
+                     (host, check_id, check_date))
+        return
+    change, evidence_changed, hash_changed = found
+    conn.execute(
+        "INSERT OR REPLACE INTO result_changes (host, check_id, check_date, prev_date, change, status, prev_status, "
+        "evidence_changed, hash_changed, evidence, prev_evidence, file_hash, prev_hash, category, title, importance, "
+        "current) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (host, check_id, check_date, prev_row[0], change, record.get('status', ''), prev.get('status', ''),
+         int(evidence_changed), int(hash_changed),
+         # 점검 결과 본문은 바뀐 경우에만 남긴다 (변경 색인이 결과 표만큼 커지지 않도록)
+         _text(record.get('evidence')) if evidence_changed else None,
+         _text(prev.get('evidence')) if evidence_changed else None,
+         _text(record.get('file_hash')), _text(prev.get('file_hash')),
+         record.get('category', ''), record.get('title', ''), record.get('importance', ''),
+         int(check_date == latest)),
+    )
+
+
+def record(conn, rows):
+    """저장한 결과 행(result_store.record_to_row 형식)의 직전 점검 대비 변경을 기록한다.
+    늦게 들어온 과거 결과가 끼어들면 바로 다음 점검의 변경도 다시 계산한다. 호출자가 트랜잭션 관리."""
+    by_pair = {}
+    for host, check_id, check_date, _, _, payload in rows:
+        by_pair.setdefault((host, check_id), {})[check_date] = payload
+    for (host, check_id), payloads in by_pair.items():
+        latest = conn.execute(
+            "SELECT MAX(check_date) FROM results WHERE host = ? AND check_id = ?", (host, check_id)
+        ).fetchone()[0]
+        for check_date in sorted(payloads):
+            _update(conn, host, check_id, check_date, json.loads(payloads[check_date]), latest)
+        after = conn.execute(
+            "SELECT check_date, payload FROM results WHERE host = ? AND check_id = ? AND check_date > ? "
+            "ORDER BY check_date LIMIT 1", (host, check_id, max(payloads))
+        ).fetchone()
+        if after is not None:
+            _update(conn, host, check_id, after[0], json.loads(after[1]), latest)
+        conn.execute(
+            "UPDATE result_changes SET current = 0 WHERE host = ? AND check_id = ? AND check_date < ? AND current = 1",
+            (host, check_id, latest),
+        )
+
+
+def changes(conn, host=None, since=None, kinds=None):
+    """변경 DataFrame (CHANGE_COLUMNS). since(seq) 를 주면 그 이후 기록 전체(폴링용, seq 순),
+    아니면 최신 점검 기준 변경(current = 1)만 서버/항목 순으로."""
+    where, params = [], []
+    if since is None:
+        where.append("current = 1")
+    else:
+        where.append("seq > ?")
+        params.append(since)
+    if host is not None:
+        where.append("host = ?")
+        params.append(host)
+    if kinds:
+        where.append(f"change IN ({','.join('?' * len(kinds))})")
+        params.extend(kinds)
+    order = "seq" if since is not None else "host, check_id"
+    return pd.read_sql_query(
+        f"SELECT {', '.join(CHANGE_COLUMNS)} FROM result_changes WHERE {' AND '.join(where)} ORDER BY {order}",
+        conn, params=params,
+    )
@@ -0,0 +1,252 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# --- 보안 점수 이력 ---
+# 결과 수집 때마다 서버별 가중 점수/등급/취약 건수(와 카테고리별 취약 건수)를 점검 시각 단위로 남긴다.
+# 최근 RAW_RETENTION_DAYS 일은 원본 그대로, 그 이전은 일 단위 요약(평균/최소/최대/마지막)으로 줄여
+# 1년 이상 매일 점검해도 추이 조회는 (host, day) 기본키 범위 조회 1회로 끝난다.
+# 테이블은 results.db 에 함께 두고 ResultStore 의 연결/잠금을 그대로 쓴다.
+
+RAW_RETENTION_DAYS = 30
+# 수집 명령(result_store.py collect/ingest)이 끝날 때 이 간격이 지났으면 자동 압축
+COMPACT_INTERVAL = timedelta(days=1)
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS score_history (
+    host        TEXT NOT NULL,
+    scan_date   TEXT NOT NULL,
+    score       REAL NOT NULL,
+    grade       TEXT NOT NULL,
+    vuln_count  INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    PRIMARY KEY (host, scan_date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS category_history (
+    host        TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    scan_date   TEXT NOT NULL,
+    total       INTEGER NOT NULL,
+    fail        INTEGER NOT NULL,
+    PRIMARY KEY (host, category, scan_date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS score_daily (
+    host        TEXT NOT NULL,
+    day         TEXT NOT NULL,
+    score_avg   REAL NOT NULL,
+    score_min   REAL NOT NULL,
+    score_max   REAL NOT NULL,
+    score       REAL NOT NULL,
+    grade       TEXT NOT NULL,
+    vuln_count  INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    samples     INTEGER NOT NULL,
+    last_scan   TEXT NOT NULL,
+    PRIMARY KEY (host, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS category_daily (
+    host        TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    day         TEXT NOT NULL,
+    total       INTEGER NOT NULL,
+    fail        INTEGER NOT NULL,
+    fail_max    INTEGER NOT NULL,
+    samples     INTEGER NOT NULL,
+    last_scan   TEXT NOT NULL,
+    PRIMARY KEY (host, category, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+);
+"""
+
+# 추이 화면 공통 컬럼 (원본 행은 min/max 가 점수 자체, samples 1 / 일 요약 행의 date 는 그날 0시)
+TREND_COLUMNS = ['date', 'score', 'score_min', 'score_max', 'vuln_count', 'grade', 'samples', 'resolution']
+CATEGORY_TREND_COLUMNS = ['date', 'category', 'fail', 'fail_max', 'total', 'samples', 'resolution']
+
+
+def scan_date_of(frame):
+    """서버 최신 결과 중 가장 늦은 점검 시각 (이력의 시점). 날짜가 없으면 None."""
+    if frame.empty or 'check_date' not in frame:
+        return None
+    latest = frame['check_date'].max()
+    return None if pd.isna(latest) else latest.strftime(DATE_FORMAT)
+
+
+def record(conn, host, scan_date, metrics):
+    """compute_host_metrics() 결과 1건을 이력에 남긴다. 같은 시각이면 덮어쓴다 (호출자가 트랜잭션 관리)."""
+    conn.execute(
+        "INSERT OR REPLACE INTO score_history (host, scan_date, score, grade, vuln_count, total) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (host, scan_date, metrics['score'], metrics['grade'], metrics['vuln_count'], metrics['total']),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO category_history (host, category, scan_date, total, fail) VALUES (?, ?, ?, ?, ?)",
+        [(host, cat, scan_date, c['total'], c['fail']) for cat, c in metrics['categories'].items()],
+    )
+
+
+def _cutoff(now, retention_days):
+    # 일 경계로 자른다 (하루치 원본이 일부만 요약되는 일이 없도록)
+    return (now - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+
+
+def _merge(old, new):
+    # 같은 날짜의 기존 요약(old)에 새 원본 요약(new)을 합침 — 평균은 표본 수 가중
+    if old is None:
+        return new
+    merged = dict(new)
+    samples = old['samples'] + new['samples']
+    if 'score_avg' in new:
+        merged['score_avg'] = (old['score_avg'] * old['samples'] + new['score_avg'] * new['samples']) / samples
+    merged['samples'] = samples
+    if 'score_min' in new:
+        merged['score_min'] = min(old['score_min'], new['score_min'])
+        merged['score_max'] = max(old['score_max'], new['score_max'])
+    if 'fail_max' in new:
+        merged['fail_max'] = max(old['fail_max'], new['fail_max'])
+    # 마지막 값은 더 늦은 점검 쪽
+    if old['last_scan'] > new['last_scan']:
+        for field in ('score', 'grade', 'vuln_count', 'total', 'fail', 'last_scan'):
+            if field in old:
+                merged[field] = old[field]
+    return merged
+
+
+def _rollup_scores(conn, cutoff):
+    days = {}
+    for host, scan_date, score, grade, vuln_count, total in conn.execute(
+        "SELECT host, scan_date, score, grade, vuln_count, total FROM score_history "
+        "WHERE scan_date < ? ORDER BY host, scan_date", (cutoff,)
+    ):
+        key = (host, scan_date[:10])
+        day = days.get(key)
+        if day is None:
+            days[key] = day = {'sum': 0.0, 'score_min': score, 'score_max': score, 'samples': 0}
+        day['sum'] += score
+        day['samples'] += 1
+        day['score_min'] = min(day['score_min'], score)
+        day['score_max'] = max(day['score_max'], score)
+        day.update(score=score, grade=grade, vuln_count=vuln_count, total=total, last_scan=scan_date)
+
+    rows = []
+    for (host, day), new in days.items():
+        new['score_avg'] = new.pop('sum') / new['samples']
+        old = conn.execute(
+            "SELECT score_avg, score_min, score_max, score, grade, vuln_count, total, samples, last_scan "
+            "FROM score_daily WHERE host = ? AND day = ?", (host, day)
+        ).fetchone()
+        if old is not None:
+            old = dict(zip(('score_avg', 'score_min', 'score_max', 'score', 'grade', 'vuln_count', 'total',
+                            'samples', 'last_scan'), old))
+        m = _merge(old, new)
+        rows.append((host, day, m['score_avg'], m['score_min'], m['score_max'], m['score'], m['grade'],
+                     m['vuln_count'], m['total'], m['samples'], m['last_scan']))
+    conn.executemany(
+        "INSERT OR REPLACE INTO score_daily (host, day, score_avg, score_min, score_max, score, grade, "
+        "vuln_count, total, samples, last_scan) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.execute("DELETE FROM score_history WHERE scan_date < ?", (cutoff,))
+    return len(rows)
+
+
+def _rollup_categories(conn, cutoff):
+    days = {}
+    for host, category, scan_date, total, fail in conn.execute(
+        "SELECT host, category, scan_date, total, fail FROM category_history "
+        "WHERE scan_date < ? ORDER BY host, category, scan_date", (cutoff,)
+    ):
+        key = (host, category, scan_date[:10])
+        day = days.get(key)
+        if day is None:
+            days[key] = day = {'fail_max': fail, 'samples': 0}
+        day['samples'] += 1
+        day['fail_max'] = max(day['fail_max'], fail)
+        day.update(total=total, fail=fail, last_scan=scan_date)
+
+    rows = []
+    for (host, category, day), new in days.items():
+        old = conn.execute(
+            "SELECT total, fail, fail_max, samples, last_scan FROM category_daily "
+            "WHERE host = ? AND category = ? AND day = ?", (host, category, day)
+        ).fetchone()
+        if old is not None:
+            old = dict(zip(('total', 'fail', 'fail_max', 'samples', 'last_scan'), old))
+        m = _merge(old, new)
+        rows.append((host, category, day, m['total'], m['fail'], m['fail_max'], m['samples'], m['last_scan']))
+    conn.executemany(
+        "INSERT OR REPLACE INTO category_daily (host, category, day, total, fail, fail_max, samples, last_scan) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.execute("DELETE FROM category_history WHERE scan_date < ?", (cutoff,))
+    return len(rows)
+
+
+def compact(conn, now=None, retention_days=RAW_RETENTION_DAYS):
+    """보존 기간이 지난 원본을 일 단위 요약으로 옮긴다. (요약한 서버-일 수, 카테고리-일 수) 반환.
+    호출자가 트랜잭션을 관리한다."""
+    now = now or datetime.now()
+    cutoff = _cutoff(now, retention_days)
+    counts = _rollup_scores(conn, cutoff), _rollup_categories(conn, cutoff)
+    conn.execute(
+        "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('history_compacted', ?)", (now.strftime(DATE_FORMAT),)
+    )
+    return counts
+
+
+def compact_due(conn, now=None):
+    row = conn.execute("SELECT value FROM store_meta WHERE key = 'history_compacted'").fetchone()
+    if row is None:
+        return True
+    now = now or datetime.now()
+    return now - datetime.strptime(row[0], DATE_FORMAT) >= COMPACT_INTERVAL
+
+
+def score_trend(conn, host, days=None, now=None):
+    """서버 점수 추이 DataFrame (TREND_COLUMNS). 오래된 구간은 일 요약, 최근은 점검 시각 단위."""
+    since = "" if days is None else ((now or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+    rows = [
+        (day, score_avg, score_min, score_max, vuln_count, grade, samples, 'daily')
+        for day, score_avg, score_min, score_max, vuln_count, grade, samples in conn.execute(
+            "SELECT day || ' 00:00:00', score_avg, score_min, score_max, vuln_count, grade, samples FROM score_daily "
+            "WHERE host = ? AND day >= ? ORDER BY day", (host, since)
+        )
+    ]
+    rows += [
+        (scan_date, score, score, score, vuln_count, grade, 1, 'raw')
+        for scan_date, score, vuln_count, grade in conn.execute(
+            "SELECT scan_date, score, vuln_count, grade FROM score_history "
+            "WHERE host = ? AND scan_date >= ? ORDER BY scan_date", (host, since)
+        )
+    ]
+    return _frame(rows, TREND_COLUMNS)
+
+
+def category_trend(conn, host, category=None, days=None, now=None):
+    """카테고리별 취약 건수 추이 DataFrame (CATEGORY_TREND_COLUMNS). category 를 주면 그 카테고리만."""
+    since = "" if days is None else ((now or datetime.now()) - timedelta(days=days)).strftime("%Y-%m-%d")
+    cat_sql, params = ("", ()) if category is None else (" AND category = ?", (category,))
+    rows = [
+        (day, cat, fail, fail_max, total, samples, 'daily')
+        for day, cat, fail, fail_max, total, samples in conn.execute(
+            "SELECT day || ' 00:00:00', category, fail, fail_max, total, samples FROM category_daily "
+            f"WHERE host = ? AND day >= ?{cat_sql} ORDER BY day", (host, since) + params
+        )
+    ]
+    rows += [
+        (scan_date, cat, fail, fail, total, 1, 'raw')
+        for scan_date, cat, fail, total in conn.execute(
+            "SELECT scan_date, category, fail, total FROM category_history "
+            f"WHERE host = ? AND scan_date >= ?{cat_sql} ORDER BY scan_date", (host, since) + params
+        )
+    ]
+    return _frame(rows, CATEGORY_TREND_COLUMNS)
+
+
+def _frame(rows, columns):
+    df = pd.DataFrame(rows, columns=columns)
+    df['date'] = pd.to_datetime(df['date'], format=DATE_FORMAT, errors='coerce')
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
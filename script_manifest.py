@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+# --- 점검/조치 스크립트 매니페스트 ---
+# 플레이북이 실행마다 ./scripts 를 find 로 훑고 호스트마다 경로 문자열로 거르던 것을
+# 스크립트 헤더(@Check_ID/@ID, @Platform ...)에서 1회 만든 목록으로 대체한다.
+#   {"check": {"<platform>": [entry, ...]}, "fix": {...}}
+#   entry = {"id": "U-01", "code": "U01", "key": "check_U01", "path": "./scripts/...", "platform": "rocky", ...}
+# 플레이북은 호스트의 플랫폼 목록으로 check/fix 목록을 바로 꺼내고, target_id 는 code 와 정확히 비교한다.
+
+DEFAULT_ROOTS = ("./scripts",)
+DEFAULT_OUTPUT = "./script_manifest.json"
+MANIFEST_VERSION = 1
+
+SCRIPT_NAME = re.compile(r'^(check|fix)_([A-Za-z]+)-?(\d+)\.sh$')
+# "# @Check_ID : U-01", "# # @Check_ID : U-01", "# @ID          : D-20"
+HEADER_FIELD = re.compile(r'^#[#\s]*@(\w+)\s*:\s*(.*?)\s*$')
+HEADER_LINES = 40
+
+# 헤더 필드 -> 매니페스트 필드 (작성자마다 다른 이름을 하나로)
+HEADER_ALIASES = {
+    'check_id': 'id',
+    'id': 'id',
+    'platform': 'platform_label',
+    'category': 'category',
+    'importance': 'importance',
+    'severity': 'importance',
+    'title': 'title',
+}
+
+# @Platform 문구 -> 플랫폼 키 (앞에서부터 첫 일치)
+PLATFORM_PATTERNS = (
+    ('postgresql', re.compile(r'postgres', re.IGNORECASE)),
+    ('mysql', re.compile(r'mysql|mariadb', re.IGNORECASE)),
+    ('ubuntu', re.compile(r'ubuntu|debian', re.IGNORECASE)),
+    ('rocky', re.compile(r'rocky|rhel|centos', re.IGNORECASE)),
+)
+# 헤더가 없는 스크립트는 위치로 판단
+PATH_PLATFORMS = (
+    ('6_db/postgresql', 'postgresql'),
+    ('6_db/mysql', 'mysql'),
+)
+DEFAULT_PLATFORM = 'rocky'
+
+
+def read_header(path):
+    fields = {}
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for _, line in zip(range(HEADER_LINES), f):
+            m = HEADER_FIELD.match(line)
+            if not m:
+                continue
+            name = HEADER_ALIASES.get(m.group(1).lower())
+            if name and m.group(2):
+                fields.setdefault(name, m.group(2))
+    return fields
+
+
+def platform_of(label, path):
+    for platform, pattern in PLATFORM_PATTERNS:
+        if label and pattern.search(label):
+            return platform
+    lowered = path.replace(os.sep, '/').lower()
+    for fragment, platform in PATH_PLATFORMS:
+        if fragment in lowered:
+            return platform
+    return DEFAULT_PLATFORM
+
+
+def scan(roots=DEFAULT_ROOTS):
+    """스크립트 트리를 1회 순회해 매니페스트 dict 를 만든다."""
+    manifest = {'version': MANIFEST_VERSION, 'check': {}, 'fix': {}}
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                m = SCRIPT_NAME.match(name)
+                if not m:
+                    continue
+                kind = m.group(1)
+                path = os.path.join(dirpath, name)
+                header = read_header(path)
+                # 파일명이 기준 (헤더 ID 가 빠졌거나 다른 항목에서 복사된 경우가 있음)
+                check_id = f"{m.group(2).upper()}-{int(m.group(3)):02d}"
+                if header.get('id') and header['id'].upper() != check_id:
+                    print(f"{path}: header id {header['id']} != {check_id}", file=sys.stderr)
+                entry = {
+                    'id': check_id,
+                    'code': check_id.replace('-', ''),
+                    'key': name[:-len('.sh')].replace('-', ''),
+                    'path': path,
+                    'platform': platform_of(header.get('platform_label', ''), path),
+                    'category': header.get('category', ''),
+                    'title': header.get('title', ''),
+                    'importance': header.get('importance', ''),
+                }
+                manifest[kind].setdefault(entry['platform'], []).append(entry)
+    # 조치 스크립트는 헤더가 없는 경우가 있어 같은 항목의 점검 스크립트 헤더로 채운다
+    checks = {(e['platform'], e['code']): e for entries in manifest['check'].values() for e in entries}
+    for entries in manifest['fix'].values():
+        for entry in entries:
+            source = checks.get((entry['platform'], entry['code']), {})
+            for field in ('category', 'title', 'importance'):
+                entry[field] = entry[field] or source.get(field, '')
+    for kind in ('check', 'fix'):
+        for entries in manifest[kind].values():
+            # 분류 폴더 -> 항목 번호 순 (플레이북 실행/결과 순서가 매번 같도록)
+            entries.sort(key=lambda e: (os.path.dirname(e['path']), e['code']))
+    return manifest
+
+
+def newest_mtime(roots):
+    # 스크립트 추가/삭제는 폴더 mtime, 헤더 수정은 파일 mtime 으로 드러난다 (내용은 읽지 않음)
+    newest = 0.0
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            newest = max(newest, os.stat(dirpath).st_mtime)
+            for name in filenames:
+                if SCRIPT_NAME.match(name):
+                    newest = max(newest, os.stat(os.path.join(dirpath, name)).st_mtime)
+    return newest
+
+
+def is_fresh(output, roots):
+    try:
+        with open(output, encoding='utf-8') as f:
+            manifest = json.load(f)
+        built = os.stat(output).st_mtime
+    except (OSError, ValueError):
+        return False
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('roots') != list(roots):
+        return False
+    return built >= newest_mtime(roots)
+
+
+def build(roots=DEFAULT_ROOTS, output=DEFAULT_OUTPUT, force=False):
+    """매니페스트를 (필요할 때만) 다시 만든다. 새로 만들었으면 True."""
+    roots = list(roots)
+    if not force and is_fresh(output, roots):
+        return False
+    manifest = scan(roots)
+    manifest['roots'] = roots
+    manifest['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    tmp = f"{output}.{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, output)
+    return True
+
+
+def load(path=DEFAULT_OUTPUT):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def select(manifest, kind, platforms, code=None):
+    """플랫폼 목록에 해당하는 항목 (code 를 주면 그 항목만, 'U01'/'U-01' 모두 허용)."""
+    code = code.replace('-', '').upper() if code else None
+    return [
+        entry
+        for platform in platforms
+        for entry in manifest.get(kind, {}).get(platform, [])
+        if code is None or entry['code'] == code
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="점검/조치 스크립트 매니페스트 생성")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build_cmd = sub.add_parser("build", help="스크립트 헤더로 매니페스트 생성 (변경이 없으면 건너뜀)")
+    build_cmd.add_argument("--root", action="append", dest="roots", help="스크립트 폴더 (기본 ./scripts)")
+    build_cmd.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    build_cmd.add_argument("--force", action="store_true")
+    show = sub.add_parser("list", help="플랫폼별 항목 출력")
+    show.add_argument("kind", choices=("check", "fix"))
+    show.add_argument("platforms", nargs="+")
+    show.add_argument("-m", "--manifest", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        rebuilt = build(args.roots or DEFAULT_ROOTS, args.output, args.force)
+        print(f"{'rebuilt' if rebuilt else 'up to date'}: {args.output}")
+    else:
+        for entry in select(load(args.manifest), args.kind, args.platforms):
+            print(f"{entry['id']}\t{entry['platform']}\t{entry['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
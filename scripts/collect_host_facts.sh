@@ -0,0 +1,121 @@
+#!/bin/bash
+# ============================================================================
+# @Project: 시스템 보안 자동화 프로젝트
+# @Version: 2.1.0
+# @Last Updated: 2026-10-18
+# ============================================================================
+# [공용 수집기] 호스트 팩트 번들 1회 수집 (대상 서버에서 실행)
+# @Description : U- 점검들이 각자 다시 읽던 /etc/passwd, /etc/shadow, /etc/login.defs,
+#                sshd_config, PAM 파일, inetd/xinetd 서비스 설정, systemctl 유닛 상태, 리슨 포트를 호스트당 1회만 수집해
+#                압축 번들 1개로 남긴다. 판정은 메인 서버의 host_rules.py 가 번들만 보고 수행하므로
+#                규칙이 바뀌어도 SSH 재접속 없이 다시 평가할 수 있다.
+# @Output      : $HOST_FACTS_FILE (tar.gz, 0600)
+#                files/<원본 경로>  설정 파일 사본 (shadow 는 해시 본문을 지우고 알고리즘 접두어만 보존)
+#                cmd/<이름>        명령 출력 (sshd -T, systemctl, ss, stat, getent ...)
+# ============================================================================
+
+# root 전용 디렉터리(/var/lib/kisa, 0700)에만 기록 (누구나 쓸 수 있는 /var/tmp 에 심어 둔 번들을 회수하지 않도록)
+HOST_FACTS_FILE="${HOST_FACTS_FILE:-/var/lib/kisa/host_facts.tar.gz}"
+
+# 그대로 보관할 설정 파일 (없는 파일은 건너뜀 -> 규칙에서 not_found 로 판정)
+FACT_FILES=(
+  /etc/passwd /etc/group /etc/login.defs /etc/securetty
+  /etc/ssh/sshd_config
+  /etc/pam.d/login /etc/pam.d/su /etc/pam.d/sshd /etc/pam.d/system-auth /etc/pam.d/password-auth
+  /etc/security/pwquality.conf /etc/security/faillock.conf
+  /etc/inetd.conf /etc/xinetd.conf
+  /etc/hosts.equiv /etc/profile /etc/bashrc /etc/exports
+)
+
+# 소유자/권한만 필요한 파일 (내용은 수집하지 않음)
+STAT_PATHS=(
+  /etc/passwd /etc/shadow /etc/group /etc/hosts /etc/services
+  /etc/inetd.conf /etc/xinetd.conf /etc/xinetd.d /etc/rsyslog.conf /etc/syslog.conf
+  /etc/hosts.equiv /etc/hosts.lpd /etc/securetty /etc/login.defs /etc/ssh/sshd_config
+)
+
+# 존재 여부에 따라 점검 분기가 달라지는 명령
+FACT_COMMANDS=(sshd systemctl ss netstat getent)
+
+umask 077
+FACTS_DIR="$(dirname "$HOST_FACTS_FILE")"
+mkdir -p -m 0700 "$FACTS_DIR" 2>/dev/null
+FACTS_DIR_MODE=$(stat -c %a "$FACTS_DIR" 2>/dev/null)
+if [ ! -O "$FACTS_DIR" ] || [ -z "$FACTS_DIR_MODE" ] || [ $(( 0$FACTS_DIR_MODE & 022 )) -ne 0 ]; then
+  echo "[ERROR] 팩트 번들 디렉터리를 신뢰할 수 없음: $FACTS_DIR" >&2
+  exit 1
+fi
+# 이전 번들은 먼저 지운다 (이번 수집이 실패하면 회수할 번들이 없어야 함)
+rm -f "$HOST_FACTS_FILE"
+
+STAGE=$(mktemp -d /tmp/kisa_host_facts.XXXXXX) || exit 1
+TMP_FILE=$(mktemp "$FACTS_DIR/.host_facts.XXXXXX") || exit 1
+trap 'rm -rf "$STAGE" "$TMP_FILE"' EXIT
+mkdir -p "$STAGE/files" "$STAGE/cmd"
+
+for path in "${FACT_FILES[@]}"; do
+  [ -f "$path" ] && cp --parents "$path" "$STAGE/files/" 2>/dev/null
+done
+# xinetd 서비스 파일은 서비스 점검(U-34/U-38/U-42/U-44/U-52/U-54)이 디렉터리 전체를 훑는다
+for path in /etc/ssh/sshd_config.d/*.conf /etc/xinetd.d/*; do
+  [ -f "$path" ] && cp --parents "$path" "$STAGE/files/" 2>/dev/null
+done
+
+# shadow: 비밀번호 해시는 메인 서버로 보내지 않는다 (잠금 표시 !/* 와 $id$ 접두어만 유지)
+if [ -f /etc/shadow ]; then
+  mkdir -p "$STAGE/files/etc"
+  awk -F: 'BEGIN { OFS = ":" } {
+    h = $2; lock = ""
+    while (h ~ /^[!*]/) { lock = lock substr(h, 1, 1); h = substr(h, 2) }
+    if (h ~ /^\$[^$]+\$/) { split(h, p, "$"); h = "$" p[2] "$" } else if (h != "") { h = "x" }
+    $2 = lock h
+    print
+  }' /etc/shadow > "$STAGE/files/etc/shadow" 2>/dev/null
+fi
+
+for path in "${STAT_PATHS[@]}"; do
+  [ -e "$path" ] && stat -c '%n	%F	%U	%G	%a' "$path" 2>/dev/null
+done > "$STAGE/cmd/stat.tsv"
+
+for name in "${FACT_COMMANDS[@]}"; do
+  command -v "$name" >/dev/null 2>&1 && echo "$name"
+done > "$STAGE/cmd/commands"
+
+command -v sshd >/dev/null 2>&1 && sshd -T > "$STAGE/cmd/sshd_T" 2>/dev/null
+command -v getent >/dev/null 2>&1 && getent passwd > "$STAGE/cmd/getent_passwd" 2>/dev/null
+
+# 유닛 상태: 점검마다 systemctl is-enabled/is-active 를 반복하던 것을 목록 2개로 대체
+if command -v systemctl >/dev/null 2>&1; then
+  systemctl list-unit-files --no-legend --no-pager --type=service,socket 2>/dev/null \
+    | awk '{print $1 "\t" $2}' > "$STAGE/cmd/unit_files"
+  systemctl list-units --all --no-legend --no-pager --plain --type=service,socket 2>/dev/null \
+    | awk '{print $1 "\t" $3 "\t" $4}' > "$STAGE/cmd/units"
+fi
+
+# 리슨 소켓: 프로토콜/로컬 주소만 (ss 우선, 없으면 netstat)
+if command -v ss >/dev/null 2>&1; then
+  ss -H -lntu 2>/dev/null | awk '{print $1 "\t" $5}' > "$STAGE/cmd/listen"
+elif command -v netstat >/dev/null 2>&1; then
+  netstat -lntu 2>/dev/null | awk '$1 ~ /^(tcp|udp)/ {print $1 "\t" $4}' > "$STAGE/cmd/listen"
+fi
+
+{
+  echo "hostname=$(hostname 2>/dev/null)"
+  echo "collect_date=$(date '+%Y-%m-%d %H:%M:%S')"
+  [ -f /etc/os-release ] && grep -E '^(ID|VERSION_ID)=' /etc/os-release
+} > "$STAGE/cmd/meta"
+
+if ! tar czf "$TMP_FILE" -C "$STAGE" . || ! mv -f "$TMP_FILE" "$HOST_FACTS_FILE"; then
+  echo "[ERROR] 팩트 번들 생성 실패: $HOST_FACTS_FILE" >&2
+  exit 1
+fi
+
+echo ""
+cat << JSON
+{
+    "host_facts": "$HOST_FACTS_FILE",
+    "files": $(find "$STAGE" -type f | wc -l),
+    "bytes": $(stat -c %s "$HOST_FACTS_FILE" 2>/dev/null || echo 0),
+    "collect_date": "$(date '+%Y-%m-%d %H:%M:%S')"
+}
+JSON
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# ============================================================================
+# 점검 번들 실행기 (대상 서버에서 실행)
+# run_audit_bundle.yml 이 scripts/unix 전체를 압축해 1회 전송한 뒤 이 스크립트를 실행한다.
+# check_*.sh 를 호스트 내에서 제한된 병렬도로 돌리고, 결과를 stdout 에 출력한다.
+#   --format ndjson (기본): 점검 1건이 끝날 때마다 1줄 {"host", "key", "result"|"stdout"|"error"}
+#   --format json        : 전체를 JSON 문서 1개로 (result_store.py ingest-bundle 용)
+# 결과는 각 스크립트 stdout 의 마지막 JSON 객체 (heredoc 출력)를 사용한다.
+# --incremental: 스크립트 해시와 결과의 target_file 에 적힌 입력 파일(내용/권한/소유자)이
+#   지난 실행과 같으면 실행하지 않고 이전 결과를 점검 일시만 갱신해 다시 보낸다 ("carried": true).
+# 대상 서버의 python3(3.6+) 만으로 동작하도록 표준 라이브러리만 사용한다.
+# ============================================================================
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 결과 JSON 후보 위치: heredoc 으로 출력되는 줄 맨 앞의 '{'
+OBJECT_START = re.compile(r'^[ \t]*\{', re.MULTILINE)
+
+# 증분 점검 상태 (점검별 스크립트 해시 / 입력 파일 지문 / 마지막 실제 실행 결과)
+# 상태 파일이 결과를 그대로 재사용하게 하므로 root 전용 디렉터리에 두고 실행 사용자 소유 0600 일 때만 읽는다
+STATE_PATH = "/var/lib/kisa/check_state.json"
+# target_file 구분자: 스크립트마다 줄바꿈/쉼표/공백을 섞어 쓴다
+TARGET_SPLIT = re.compile(r'[\s,]+')
+# raw_evidence 가 JSON 으로 해석되지 않을 때(이스케이프 누락) target_file 값만 추출
+RAW_TARGET_FILE = re.compile(r'"target_file"\s*:\s*"([^"]*)"')
+# 증분 재사용 대상: 설정 파일 내용/권한만으로 판정하는 분류
+# (서비스/패치/로그/DB 점검은 유닛·프로세스·패키지·카탈로그 상태로 판정하므로 항상 실행)
+INCREMENTAL_DIRS = ("1_account", "2_directory")
+# 위 분류 중 target_file 밖의 상태로 판정하는 점검
+#   U-01 리슨 포트/유닛, U-06 su 바이너리 권한, U-07 lastlog, U-14/U-31/U-32 홈·PATH 디렉터리
+ALWAYS_RUN = {"U01", "U06", "U07", "U14", "U31", "U32"}
+
+
+def discover_scripts(root, db_type, target_id=None, skip_ids=()):
+    """플레이북 when: 조건과 동일하게 DB 종류/target_id 로 check 스크립트를 고른다.
+    skip_ids 는 메인 서버 규칙 엔진(host_rules.py)이 팩트 번들로 평가하는 항목."""
+    skip = {item.replace("-", "") for item in skip_ids}
+    selected = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if not (name.startswith("check_") and name.endswith(".sh")):
+                continue
+            path = os.path.join(dirpath, name)
+            lowered = path.lower()
+            if "6_db/mysql" in lowered and db_type != "mysql":
+                continue
+            if "6_db/postgresql" in lowered and db_type != "postgresql":
+                continue
+            if target_id and target_id not in name:
+                continue
+            if name[len("check_"):-len(".sh")].replace("-", "") in skip:
+                continue
+            selected.append(path)
+    return selected
+
+
+def result_key(path):
+    # 결과 파일명 규칙(<host>_check_U01.json)과 같은 키
+    return os.path.basename(path).replace(".sh", "").replace("-", "")
+
+
+def discover_collectors(root, db_type):
+    # scripts/unix 최상위의 collect_*.sh (공용 인벤토리/스냅샷 수집기)는 점검 전에 1회 실행
+    # DB 전용 수집기(collect_mysql_*, collect_postgresql_*)는 해당 DB 서버에서만 실행
+    selected = []
+    for name in sorted(os.listdir(root)):
+        if not (name.startswith("collect_") and name.endswith(".sh")):
+            continue
+        if any(name.startswith("collect_" + db + "_") for db in ("mysql", "postgresql") if db != db_type):
+            continue
+        selected.append(os.path.join(root, name))
+    return selected
+
+
+def extract_json(text):
+    """stdout 의 마지막 최상위 JSON 객체. 해석할 수 없으면 None (원문은 수집 서버에서 다시 해석)."""
+    decoder = json.JSONDecoder(strict=False)
+    found, end = None, 0
+    for m in OBJECT_START.finditer(text):
+        pos = m.end() - 1
+        if pos < end:
+            continue
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            found = obj
+    return found
+
+
+def run_check(path, timeout):
+    """스크립트 1개 실행. (record, error, elapsed) — record 는 {"result": dict} 또는 {"stdout": 원문}."""
+    started = time.time()
+    try:
+        proc = subprocess.run(
+            ["bash", path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            timeout=timeout,
+            cwd=os.path.dirname(path),
+        )
+    except subprocess.TimeoutExpired:
+        return None, "timeout after {}s".format(timeout), time.time() - started
+
+    data = extract_json(proc.stdout or "")
+    if data is not None:
+        return {"result": data}, None, time.time() - started
+    if "{" in (proc.stdout or ""):
+        # 잘못된 이스케이프 등은 수집 서버(result_schema.extract_result_json)가 보정해 해석
+        return {"stdout": proc.stdout}, None, time.time() - started
+    return None, "no JSON in output (rc={})".format(proc.returncode), time.time() - started
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def declared_inputs(result):
+    """결과의 target_file 에 적힌 입력 파일 목록. 파일 경로로만 이루어지지 않았으면 None (증분 대상 아님)."""
+    value = result.get("target_file")
+    if not value and "raw_evidence" in result:
+        raw = result["raw_evidence"]
+        if isinstance(raw, dict):
+            value = raw.get("target_file")
+        else:
+            try:
+                value = json.loads(str(raw), strict=False).get("target_file")
+            except (ValueError, AttributeError):
+                m = RAW_TARGET_FILE.search(str(raw))
+                value = m.group(1).replace("\\n", "\n") if m else None
+    tokens = [t for t in TARGET_SPLIT.split(str(value or "")) if t]
+    if not tokens or any(not t.startswith("/") or "*" in t for t in tokens):
+        return None
+    return sorted(set(tokens))
+
+
+def input_fingerprint(path):
+    """일반 파일: 권한/소유자/내용 해시, 없는 파일: "absent". 디렉터리 등은 None (판정 근거를 알 수 없음)."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return "absent"
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    try:
+        return "{:o}:{}:{}:{}".format(st.st_mode, st.st_uid, st.st_gid, file_sha256(path))
+    except OSError:
+        return None
+
+
+def load_state(path):
+    """증분 상태. 다른 사용자가 만들었거나 0600 이 아닌 파일은 무시한다 (심어 둔 결과로 PASS 방지)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
+            if st.st_uid != os.geteuid() or stat.S_IMODE(st.st_mode) != 0o600:
+                return {}
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    tmp_path = "{}.{}".format(path, os.getpid())
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def incremental_eligible(path):
+    category = os.path.basename(os.path.dirname(path))
+    return category in INCREMENTAL_DIRS and result_key(path)[len("check_"):] not in ALWAYS_RUN
+
+
+def valid_entry(entry):
+    # remember() 가 저장하는 형식이 아닌 항목은 재사용하지 않음 (손상/구버전 상태 파일)
+    if not isinstance(entry, dict) or not isinstance(entry.get("script"), str):
+        return False
+    if not isinstance(entry.get("result"), dict) or not isinstance(entry.get("checked"), (int, float)):
+        return False
+    inputs = entry.get("inputs")
+    return isinstance(inputs, dict) and bool(inputs) and all(
+        isinstance(p, str) and p.startswith("/") and isinstance(fp, str) for p, fp in inputs.items()
+    )
+
+
+def carry_forward(scripts, state, max_age, fingerprints):
+    """입력/스크립트가 그대로인 점검의 이전 결과 {key: result}. 입력 지문은 한 번에 모아 계산한다."""
+    now = time.time()
+    candidates = {}
+    for path in scripts:
+        key = result_key(path)
+        entry = state.get(key)
+        if not valid_entry(entry) or not incremental_eligible(path) or now - entry["checked"] > max_age:
+            continue
+        if entry.get("script") != file_sha256(path):
+            continue
+        candidates[key] = entry
+    for entry in candidates.values():
+        for input_path in entry["inputs"]:
+            if input_path not in fingerprints:
+                fingerprints[input_path] = input_fingerprint(input_path)
+    return {
+        key: entry["result"] for key, entry in candidates.items()
+        if all(fingerprints[p] is not None and fingerprints[p] == fp for p, fp in entry["inputs"].items())
+    }
+
+
+def remember(state, path, key, record, fingerprints):
+    # 실제로 실행한 결과만 저장 (입력 파일을 알 수 없는 점검은 다음에도 실행)
+    state.pop(key, None)
+    if not record or "result" not in record or not incremental_eligible(path):
+        return
+    inputs = declared_inputs(record["result"])
+    if inputs is None:
+        return
+    for input_path in inputs:
+        # 점검 실행 뒤의 상태로 다시 계산 (조치 스크립트가 아니므로 점검 전후 동일해야 정상)
+        fingerprints[input_path] = input_fingerprint(input_path)
+    if any(fingerprints[p] is None for p in inputs):
+        return
+    state[key] = {
+        "script": file_sha256(path),
+        "inputs": {p: fingerprints[p] for p in inputs},
+        "result": record["result"],
+        "checked": time.time(),
+    }
+
+
+def refresh_date(result, now):
+    # 이전 결과를 그대로 보내되 점검 일시만 이번 실행 시각으로
+    result = dict(result)
+    date_key = "check_date" if "check_date" in result else "scan_date"
+    result[date_key] = now
+    return result
+
+
+def emit(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check 번들 병렬 실행")
+    parser.add_argument("--root", required=True, help="scripts/unix 번들을 압축 해제한 경로")
+    parser.add_argument("--host", default=os.uname()[1])
+    parser.add_argument("--db", default="none", choices=["mysql", "postgresql", "none"])
+    parser.add_argument("--target-id", default=None)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--timeout", type=int, default=300)
+    parser.add_argument("--cleanup", action="store_true", help="실행 후 번들 디렉터리 삭제")
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "json"])
+    parser.add_argument("--skip-ids", default="", help="실행하지 않을 점검 ID (쉼표 구분, 예: U-01,U-05)")
+    parser.add_argument("--incremental", action="store_true", help="입력 파일이 바뀐 점검만 실행")
+    parser.add_argument("--state", default=STATE_PATH, help="증분 점검 상태 파일")
+    parser.add_argument("--max-age", type=int, default=7 * 24 * 3600,
+                        help="이전 결과를 재사용할 최대 기간(초), 지나면 입력이 같아도 다시 실행")
+    args = parser.parse_args()
+
+    skip_ids = [item.strip() for item in args.skip_ids.split(",") if item.strip()]
+    scripts = discover_scripts(args.root, args.db, args.target_id, skip_ids)
+    started = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    results, errors, durations = {}, {}, {}
+    state, fingerprints = {}, {}
+    if args.incremental:
+        state = load_state(args.state)
+        # target_id 지정(단건 재점검)은 항상 실제로 실행
+        carried = {} if args.target_id else carry_forward(scripts, state, args.max_age, fingerprints)
+        scripts = [path for path in scripts if result_key(path) not in carried]
+        for key, result in sorted(carried.items()):
+            durations[key] = 0
+            if args.format == "ndjson":
+                emit({"host": args.host, "key": key, "elapsed": 0, "carried": True,
+                      "result": refresh_date(result, started)})
+            else:
+                results[key] = refresh_date(result, started)
+
+    # 공용 수집기는 실제로 실행할 점검이 있을 때만 (전부 재사용이면 전체 find 등 생략)
+    if not args.target_id and scripts:
+        for path in discover_collectors(args.root, args.db):
+            run_check(path, args.timeout)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(run_check, path, args.timeout): path for path in scripts}
+        for future in as_completed(futures):
+            path = futures[future]
+            key = result_key(path)
+            record, error, elapsed = future.result()
+            durations[key] = round(elapsed, 3)
+            if args.incremental:
+                remember(state, path, key, record, fingerprints)
+            if args.format == "ndjson":
+                line = {"host": args.host, "key": key, "elapsed": durations[key]}
+                line.update(record or {"error": error})
+                emit(line)
+            elif error:
+                errors[key] = error
+            elif "result" in record:
+                results[key] = record["result"]
+            else:
+                errors[key] = "invalid JSON in output"
+
+    if args.incremental:
+        save_state(args.state, state)
+
+    if args.cleanup:
+        shutil.rmtree(args.root, ignore_errors=True)
+
+    if args.format == "json":
+        json.dump({
+            "host": args.host,
+            "started": started,
+            "finished": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "results": results,
+            "errors": errors,
+            "durations": durations,
+        }, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import json
+import os
+
+from result_loader import ResultLoader
+
+
+def _write(path, check_id, status, check_date="2026-01-01 00:00:00", mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'check_id': check_id, 'status': status, 'check_date': check_date,
+                   'category': '계정관리', 'importance': '상'}, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _status(frame, check_id):
+    return frame.loc[frame['check_id'] == check_id, 'status'].tolist()
+
+
+def test_added_modified_deleted(tmp_path):
+    u01 = tmp_path / "web01_U01.json"
+    u02 = tmp_path / "web01_U02.json"
+    _write(u01, "U-01", "PASS", mtime_ns=1_000_000_000)
+    _write(u02, "U-02", "FAIL", mtime_ns=1_000_000_000)
+    loader = ResultLoader(str(tmp_path))
+
+    frame = loader.load()
+    assert sorted(frame['check_id']) == ["U-01", "U-02"]
+    assert loader.host_metrics("web01")['vuln_count'] == 1
+    version = loader.version
+
+    # 변경 없음: 같은 DataFrame, 버전 그대로
+    assert loader.load() is frame
+    assert loader.version == version
+
+    # 추가
+    _write(tmp_path / "web01_U03.json", "U-03", "FAIL")
+    frame = loader.load()
+    assert sorted(frame['check_id']) == ["U-01", "U-02", "U-03"]
+    assert loader.host_metrics("web01")['vuln_count'] == 2
+
+    # 변경 (mtime 만 바뀌어도 다시 읽음)
+    _write(u02, "U-02", "PASS", mtime_ns=2_000_000_000)
+    frame = loader.load()
+    assert _status(frame, "U-02") == ["PASS"]
+    assert loader.host_metrics("web01")['vuln_count'] == 1
+
+    # 삭제
+    os.remove(u01)
+    frame = loader.load()
+    assert sorted(frame['check_id']) == ["U-02", "U-03"]
+    assert loader.version > version
+
+
+def test_refresh_paths_only_reads_listed_files(tmp_path):
+    u01 = tmp_path / "web01_U01.json"
+    _write(u01, "U-01", "PASS")
+    loader = ResultLoader(str(tmp_path))
+    loader.load()
+
+    _write(tmp_path / "web01_U02.json", "U-02", "FAIL")
+    os.remove(u01)
+    frame = loader.refresh_paths([str(u01)])
+    # 목록에 없는 새 파일은 반영하지 않고, 없어진 파일은 삭제로 처리
+    assert frame.empty
+    assert loader.host_metrics("web01") is None
+
+
+def test_latest_check_date_wins_and_parse_errors(tmp_path):
+    _write(tmp_path / "web01_U01.json", "U-01", "FAIL", check_date="2026-01-01 00:00:00")
+    _write(tmp_path / "web01_U01_rerun.json", "U-01", "PASS", check_date="2026-01-02 00:00:00")
+    (tmp_path / "web01_broken.json").write_text("not json", encoding='utf-8')
+    loader = ResultLoader(str(tmp_path))
+
+    frame = loader.load()
+    assert _status(frame, "U-01") == ["PASS"]
+    assert [os.path.basename(p) for p, _ in loader.parse_errors()] == ["web01_broken.json"]
+
+    # 최신 파일이 지워지면 이전 결과로 되돌아감
+    os.remove(tmp_path / "web01_U01_rerun.json")
+    assert _status(loader.load(), "U-01") == ["FAIL"]
@@ -0,0 +1,94 @@
+import json
+import os
+
+from result_store import ResultStore
+
+SCAN = "2026-03-01 09:00:00"
+
+
+def _line(host, key, check_id, status, check_date=SCAN, **extra):
+    result = {'check_id': check_id, 'status': status, 'check_date': check_date,
+              'category': '계정관리', 'importance': '상'}
+    return json.dumps({'host': host, 'key': key, 'result': result, **extra}, ensure_ascii=False)
+
+
+def _stream(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def _store(tmp_path):
+    return ResultStore(str(tmp_path / "results.db"))
+
+
+def test_ingest_ndjson_host_spanning_batches(tmp_path):
+    stream = _stream(tmp_path / "web01.ndjson", [
+        _line("web01", "check_U01", "U-01", "PASS"),
+        _line("web01", "check_U02", "U-02", "FAIL"),
+        # 한 번의 점검이라도 항목마다 점검 시각이 몇 초씩 다름
+        _line("web01", "check_U03", "U-03", "FAIL", check_date="2026-03-01 09:00:05"),
+        _line("db01", "check_U01", "U-01", "PASS"),
+        _line("web01", "check_U04", "U-04", "PASS", check_date="2026-03-01 09:00:07"),
+    ])
+    store = _store(tmp_path)
+    try:
+        assert store.ingest_ndjson(stream, batch_size=2) == 5
+
+        frame = store.latest_frame()
+        assert len(frame[frame['target'] == "web01"]) == 4
+        # 지표는 배치 경계가 아니라 스트림 전체 기준
+        m = store.host_metrics("web01")
+        assert (m['total'], m['vuln_count']) == (4, 2)
+        assert store.host_metrics("db01")['vuln_count'] == 0
+
+        # 배치마다 반쯤 적재된 점수가 이력 점으로 남지 않음 (점검 1회 = 1점)
+        trend = store.score_trend("web01")
+        assert trend['date'].dt.strftime("%Y-%m-%d %H:%M:%S").tolist() == ["2026-03-01 09:00:07"]
+        assert trend['score'].iloc[0] == m['score']
+    finally:
+        store.close()
+
+
+def test_ingest_ndjson_errors_and_result_files(tmp_path):
+    results = tmp_path / "results"
+    results.mkdir()
+    stream = _stream(tmp_path / "web01.ndjson", [
+        _line("web01", "check_U01", "U-01", "PASS"),
+        "{broken",
+        json.dumps({'host': "web01", 'key': "check_U02", 'error': "timeout"}),
+        json.dumps({'host': "web01", 'key': "check_U03",
+                    'stdout': "noise\n" + json.dumps({'item_code': "U-03", 'status': "fail", 'scan_date': SCAN})}),
+    ])
+    store = _store(tmp_path)
+    try:
+        assert store.ingest_ndjson(stream, results_path=str(results)) == 2
+        assert sorted(os.listdir(results)) == ["web01_check_U01.json", "web01_check_U03.json"]
+
+        frame = store.latest_frame()
+        assert frame.loc[frame['check_id'] == "U-03", 'status'].tolist() == ["FAIL"]
+        assert [path for path, _ in store.parse_errors()] == [f"{stream}#web01/check_U02", f"{stream}:2"]
+
+        # 이미 저장한 결과 파일은 폴더 수집에서 다시 읽지 않음
+        assert store.ingest_dir(str(results)) == 0
+
+        # 같은 스트림을 고쳐서 다시 넣으면 이전 실패 기록은 사라짐
+        _stream(tmp_path / "web01.ndjson", [_line("web01", "check_U02", "U-02", "PASS")])
+        store.ingest_ndjson(stream)
+        assert store.parse_errors() == []
+    finally:
+        store.close()
+
+
+def test_history_keeps_every_scan(tmp_path):
+    store = _store(tmp_path)
+    try:
+        store.ingest_ndjson(_stream(tmp_path / "a.ndjson", [_line("web01", "check_U01", "U-01", "FAIL")]))
+        store.ingest_ndjson(_stream(tmp_path / "b.ndjson", [
+            _line("web01", "check_U01", "U-01", "PASS", check_date="2026-03-02 09:00:00"),
+        ]))
+        history = store.history("web01", "U-01")
+        assert history['status'].tolist() == ["PASS", "FAIL"]
+        assert store.latest_frame()['status'].tolist() == ["PASS"]
+        assert len(store.score_trend("web01")) == 2
+    finally:
+        store.close()
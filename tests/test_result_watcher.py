@@ -0,0 +1,43 @@
+from result_watcher import ChangeJournal
+
+
+def test_changes_since_returns_paths_after_cursor():
+    journal = ChangeJournal(size=10)
+    cursor, paths = journal.changes_since(None)
+    # 첫 호출은 항상 전체 검사
+    assert (cursor, paths) == (0, None)
+
+    journal.append("results/a.json")
+    journal.append("results/b.json")
+    journal.append("results/a.json")
+    cursor, paths = journal.changes_since(cursor)
+    assert (cursor, paths) == (3, {"results/a.json", "results/b.json"})
+    assert journal.changes_since(cursor) == (3, set())
+
+
+def test_changes_since_after_overflow():
+    journal = ChangeJournal(size=3)
+    journal.append("results/a.json")
+    cursor, _ = journal.changes_since(0)
+    for name in ("b", "c", "d"):
+        journal.append(f"results/{name}.json")
+    # 커서 직후 항목까지는 남아 있으면 이어서 읽을 수 있음
+    assert journal.changes_since(cursor) == (4, {"results/b.json", "results/c.json", "results/d.json"})
+
+    journal.append("results/e.json")
+    # 커서 이후 항목(b)이 밀려남: 전체 재검사
+    assert journal.changes_since(cursor) == (5, None)
+    # 전체 재검사 후 새 커서부터는 다시 증분
+    journal.append("results/f.json")
+    assert journal.changes_since(5) == (6, {"results/f.json"})
+
+
+def test_changes_since_after_reset():
+    journal = ChangeJournal()
+    journal.append("results/a.json")
+    cursor, _ = journal.changes_since(0)
+    # inotify 큐 넘침 등으로 이벤트를 놓침
+    journal.reset()
+    journal.append("results/b.json")
+    assert journal.changes_since(cursor) == (3, None)
+    assert journal.changes_since(2) == (3, {"results/b.json"})
@@ -0,0 +1,62 @@
+import scan_delta
+from result_store import ResultStore, record_to_row
+
+
+def _row(check_date, status, evidence="", file_hash="N/A", check_id="U-01"):
+    return record_to_row({'target': "web01", 'check_id': check_id, 'check_date': check_date, 'status': status,
+                          'evidence': evidence, 'file_hash': file_hash, 'category': '계정관리', 'importance': '상'})
+
+
+def _changes(store, **kwargs):
+    frame = store.changes(**kwargs)
+    return list(zip(frame['check_date'], frame['prev_date'], frame['change'], frame['current']))
+
+
+def test_diff_kinds():
+    assert scan_delta.diff({'status': 'PASS'}, {'status': 'FAIL'})[0] == 'new_fail'
+    assert scan_delta.diff({'status': 'FAIL'}, {'status': 'PASS'})[0] == 'fixed'
+    assert scan_delta.diff({'status': 'FAIL'}, {'status': 'N/A'})[0] == 'status'
+    assert scan_delta.diff({'status': 'PASS', 'file_hash': 'a'}, {'status': 'PASS', 'file_hash': 'b'}) == \
+        ('file_hash', False, True)
+    assert scan_delta.diff({'status': 'PASS', 'evidence': ['x']}, {'status': 'PASS', 'evidence': ['y']}) == \
+        ('evidence', True, False)
+    assert scan_delta.diff({'status': 'PASS', 'evidence': ' x '}, {'status': 'PASS', 'evidence': 'x'}) is None
+
+
+def test_out_of_order_result(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    try:
+        store.insert_records([_row("2026-03-01 09:00:00", "FAIL")])
+        assert _changes(store) == []    # 첫 점검은 변경 아님
+
+        store.insert_records([_row("2026-03-03 09:00:00", "PASS")])
+        assert _changes(store) == [("2026-03-03 09:00:00", "2026-03-01 09:00:00", 'fixed', 1)]
+
+        # 그 사이 점검 결과가 늦게 도착: 자기 변경을 남기고 다음 점검의 변경을 다시 계산
+        store.insert_records([_row("2026-03-02 09:00:00", "PASS", evidence="조치 확인")])
+        assert _changes(store, since=0) == [
+            ("2026-03-02 09:00:00", "2026-03-01 09:00:00", 'fixed', 0),
+            ("2026-03-03 09:00:00", "2026-03-02 09:00:00", 'evidence', 1),
+        ]
+        assert _changes(store) == [("2026-03-03 09:00:00", "2026-03-02 09:00:00", 'evidence', 1)]
+
+        # 최신 점검보다 새 결과가 오면 이전 변경은 current 에서 빠짐
+        store.insert_records([_row("2026-03-04 09:00:00", "FAIL", evidence="조치 확인")])
+        assert _changes(store) == [("2026-03-04 09:00:00", "2026-03-03 09:00:00", 'new_fail', 1)]
+        assert _changes(store, kinds=['fixed'], since=0) == [
+            ("2026-03-02 09:00:00", "2026-03-01 09:00:00", 'fixed', 0)
+        ]
+    finally:
+        store.close()
+
+
+def test_reingest_without_change_clears_record(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    try:
+        store.insert_records([_row("2026-03-01 09:00:00", "PASS"), _row("2026-03-02 09:00:00", "FAIL")])
+        assert [c[2] for c in _changes(store)] == ['new_fail']
+        # 같은 시각 결과를 고쳐서 다시 수집하면 변경 기록도 갱신
+        store.insert_records([_row("2026-03-02 09:00:00", "PASS")])
+        assert _changes(store, since=0) == []
+    finally:
+        store.close()
@@ -0,0 +1,68 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+import score_history
+
+NOW = datetime(2026, 3, 31, 12, 0, 0)
+
+
+def _metrics(score, vuln_count, fail):
+    return {'score': score, 'grade': 'A' if score >= 90 else 'C', 'vuln_count': vuln_count, 'total': 10,
+            'categories': {'계정관리': {'total': 4, 'fail': fail}}}
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(score_history.SCHEMA)
+    yield conn
+    conn.close()
+
+
+def test_compact_rolls_up_old_scans(conn):
+    score_history.record(conn, "web01", "2026-02-01 09:00:00", _metrics(60.0, 4, 3))
+    score_history.record(conn, "web01", "2026-02-01 18:00:00", _metrics(80.0, 2, 1))
+    score_history.record(conn, "web01", "2026-03-30 09:00:00", _metrics(95.0, 1, 0))
+
+    assert score_history.compact(conn, now=NOW) == (1, 1)
+
+    daily = conn.execute(
+        "SELECT day, score_avg, score_min, score_max, score, grade, vuln_count, samples, last_scan FROM score_daily"
+    ).fetchall()
+    assert daily == [("2026-02-01", 70.0, 60.0, 80.0, 80.0, 'C', 2, 2, "2026-02-01 18:00:00")]
+    assert conn.execute("SELECT day, fail, fail_max, samples FROM category_daily").fetchall() == [
+        ("2026-02-01", 1, 3, 2)
+    ]
+    # 보존 기간 안의 원본은 그대로
+    assert conn.execute("SELECT scan_date FROM score_history").fetchall() == [("2026-03-30 09:00:00",)]
+    assert conn.execute("SELECT scan_date FROM category_history").fetchall() == [("2026-03-30 09:00:00",)]
+
+    trend = score_history.score_trend(conn, "web01")
+    assert trend['resolution'].tolist() == ['daily', 'raw']
+    assert trend['score'].tolist() == [70.0, 95.0]
+
+
+def test_compact_merges_late_scan_into_existing_day(conn):
+    score_history.record(conn, "web01", "2026-02-01 18:00:00", _metrics(80.0, 2, 1))
+    score_history.compact(conn, now=NOW)
+    # 이미 요약된 날에 더 이른 시각의 점검이 늦게 들어옴
+    score_history.record(conn, "web01", "2026-02-01 09:00:00", _metrics(50.0, 5, 4))
+    assert score_history.compact(conn, now=NOW) == (1, 1)
+
+    score_avg, score_min, score, samples, last_scan = conn.execute(
+        "SELECT score_avg, score_min, score, samples, last_scan FROM score_daily"
+    ).fetchone()
+    assert (score_avg, score_min, samples) == (65.0, 50.0, 2)
+    # 마지막 값은 더 늦은 점검 쪽을 유지
+    assert (score, last_scan) == (80.0, "2026-02-01 18:00:00")
+    assert conn.execute("SELECT fail, fail_max, samples FROM category_daily").fetchone() == (1, 4, 2)
+    assert conn.execute("SELECT COUNT(*) FROM score_history").fetchone() == (0,)
+
+
+def test_compact_due(conn):
+    assert score_history.compact_due(conn, now=NOW)
+    score_history.compact(conn, now=NOW)
+    assert not score_history.compact_due(conn, now=datetime(2026, 4, 1, 11, 59, 59))
+    assert score_history.compact_due(conn, now=datetime(2026, 4, 1, 12, 0, 0))